@@ -1,23 +1,21 @@
 import asyncio
+import threading
+import uuid
 from datetime import datetime
 import math
 from dotenv import load_dotenv
-from langchain.tools import tool
 
-from langchain_core.messages import HumanMessage
-from langchain.agents import create_agent
-from langgraph.checkpoint.memory import MemorySaver
-from langchain.chat_models import init_chat_model
-from langchain_tavily.tavily_search import TavilySearch
-
-from langchain.agents.middleware import HumanInTheLoopMiddleware
-from langgraph.types import Command
+from shared.conversation_memory import ConversationMemory, build_summary_prompt
+from shared.llm_scheduler import BATCH, get_scheduler
+from shared.model_registry import get_chat_model
 
 
 load_dotenv()
 
+MODEL_NAME = "gemini-2.5-flash"
+MODEL_PROVIDER = "google_genai"
+
 
-@tool
 def calculate(expression: str) -> str:
     """
     수학 표현식을 계산합니다 ex) calculate("2 + 2"), calculate("10 * 3")
@@ -29,65 +27,118 @@ def calculate(expression: str) -> str:
         return f"에러 : {str(e)}"
 
 
-web_search = TavilySearch(max_result=5)
-TOOLS = [calculate, web_search]
+# 에이전트(모델, 검색 도구, 체크포인터)는 처음 사용할 때 한 번만 만듭니다.
+# langchain/langgraph/tavily import에 시간이 걸리므로 실행 시작을 늦추지 않도록 미룹니다.
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def get_agent():
+    global _agent
+    with _agent_lock:
+        if _agent is None:
+            _agent = create_agent_app()
+        return _agent
+
+
+def create_agent_app():
+    from langchain.agents import create_agent
+    from langchain.agents.middleware import HumanInTheLoopMiddleware
+    from langchain.tools import tool
+    from langchain_tavily.tavily_search import TavilySearch
+    from langgraph.checkpoint.memory import MemorySaver
+
+    web_search = TavilySearch(max_result=5)
+    tools = [tool(calculate), web_search]
+
+    model = get_chat_model(MODEL_NAME, model_provider=MODEL_PROVIDER)
 
-model = init_chat_model("gemini-2.5-flash", model_provider="google_genai")
+    checkpointer = MemorySaver()
+
+    return create_agent(
+        model,
+        tools=tools,
+        system_prompt=f"오늘 시각은 {datetime.now().strftime('%Y%m%d_%H%M%S')} 입니다."
+        "당신은 친절한 AI에이전트입니다. "
+        "유저의 요청을 면밀히 파악하고 필요할 때 도구를 사용하세요."
+        "답변은 항상 한국어로 하고, 단계별로 설명하세요.",
+        checkpointer=checkpointer,
+        middleware=[
+            HumanInTheLoopMiddleware(
+                interrupt_on={
+                    "calculate": {"allowed_decisions": ["approve", "reject"]},
+                    "tavily_search": True,  # TavilySearch 는 이름을  tavily_search로 해야함
+                },
+                description_prefix="도구 실행은 승인이 필요합니다.",
+            )
+        ],
+    )
 
 
 def call_agent(message):
-    response = agent.invoke({"messages": [HumanMessage(content=message)]})
+    from langchain_core.messages import HumanMessage
+
+    response = get_agent().invoke({"messages": [HumanMessage(content=message)]})
     print(response["messages"][-1].content)
 
 
-checkpointer = MemorySaver()
+async def summarize_history(summary, messages):
+    """
+    오래된 대화를 기존 요약문에 합칩니다.
+    대화 응답보다 뒤에 처리되도록 배치 우선순위로 스케줄러에 넣습니다.
+    """
+    prompt = build_summary_prompt(summary, messages)
+    model = get_chat_model(MODEL_NAME, model_provider=MODEL_PROVIDER)
+    response = await get_scheduler(MODEL_PROVIDER).run(
+        lambda: model.ainvoke(prompt), tokens=len(prompt) // 2, priority=BATCH
+    )
+    return response.content
 
-agent = create_agent(
-    model,
-    tools=TOOLS,
-    system_prompt=f"오늘 시각은 {datetime.now().strftime('%Y%m%d_%H%M%S')} 입니다."
-    "당신은 친절한 AI에이전트입니다. "
-    "유저의 요청을 면밀히 파악하고 필요할 때 도구를 사용하세요."
-    "답변은 항상 한국어로 하고, 단계별로 설명하세요.",
-    checkpointer=checkpointer,
-    middleware=[
-        HumanInTheLoopMiddleware(
-            interrupt_on={
-                "calculate": {"allowed_decisions": ["approve", "reject"]},
-                "tavily_search": True,  # TavilySearch 는 이름을  tavily_search로 해야함
-            },
-            description_prefix="도구 실행은 승인이 필요합니다.",
-        )
-    ],
-)
 
-# 메모리를 유지하기 위한 채팅 스레드 ID 설정
-config = {"configurable": {"thread_id": "andy-session-1"}}
+def new_turn_config():
+    # 대화 기록은 ConversationMemory가 관리하므로 체크포인터에는 한 턴의 상태만 둡니다.
+    # 턴마다 새 스레드를 쓰고 턴이 끝나면 지워서, 기록이 쌓여 응답이 느려지지 않게 합니다.
+    # (도구 승인 인터럽트를 이어서 실행할 때는 같은 스레드를 써야 합니다.)
+    return {"configurable": {"thread_id": f"andy-session-1-{uuid.uuid4().hex}"}}
 
 
 async def chat_loop():
+    from langgraph.types import Command
+
+    agent = get_agent()
+    memory = ConversationMemory(summarize_history)
     print("AI 비서가 준비 되었습니다. (종료: q)")
     while True:
-        user_input = input("\n질문 : ")
+        # 입력을 기다리는 동안에도 백그라운드 요약이 진행되도록 별도 스레드에서 읽습니다.
+        user_input = await asyncio.to_thread(input, "\n질문 : ")
         if user_input.lower() == "q":
             break
 
-        response = await agent.ainvoke({"messages": user_input}, config=config)
-        if "__interrupt__" in response:
-            print("인터럽트 발생!\n ")
-            yes_or_no = input("승인 y | 거절 n : ")
-            if yes_or_no == "y":
-                response = await agent.ainvoke(
-                    Command(resume={"decisions": [{"type": "approve"}]}), config=config
-                )
-                result = response["messages"][-1].content
-                print("\nAI:", result)
+        config = new_turn_config()
+        messages = memory.messages() + [{"role": "user", "content": user_input}]
+        try:
+            response = await agent.ainvoke({"messages": messages}, config=config)
+            if "__interrupt__" in response:
+                print("인터럽트 발생!\n ")
+                yes_or_no = await asyncio.to_thread(input, "승인 y | 거절 n : ")
+                if yes_or_no == "y":
+                    response = await agent.ainvoke(
+                        Command(resume={"decisions": [{"type": "approve"}]}),
+                        config=config,
+                    )
+                    result = response["messages"][-1].content
+                    print("\nAI:", result)
+                else:
+                    print("도구 실행이 취소되었습니다.")
+                    continue
             else:
-                print("도구 실행이 취소되었습니다.")
-                continue
-        else:
-            result = response["messages"][-1].content
-            print(result)
+                result = response["messages"][-1].content
+                print(result)
+        finally:
+            agent.checkpointer.delete_thread(config["configurable"]["thread_id"])
+
+        memory.add("user", user_input)
+        memory.add("assistant", result)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,21 @@
 from dotenv import load_dotenv
 
-from langchain.chat_models import BaseChatModel, init_chat_model
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from shared.model_registry import get_chat_model
+
 load_dotenv()
 
+MODEL_NAME = "gemini-2.5-flash-lite"
+
+
+def get_model():
+    # 예제 함수들이 같은 모델 객체(클라이언트)를 함께 사용합니다.
+    return get_chat_model(MODEL_NAME, model_provider="google_genai")
+
 
 def hello_langchain():
-    model: BaseChatModel = init_chat_model(
-        "gemini-2.5-flash-lite", model_provider="google_genai"
-    )
+    model = get_model()
 
     result: AIMessage = model.invoke("안녕하세요?")
 
@@ -17,18 +23,14 @@ def hello_langchain():
 
 
 def input_human_message():
-    model: BaseChatModel = init_chat_model(
-        "gemini-2.5-flash-lite", model_provider="google_genai"
-    )
+    model = get_model()
 
     result: AIMessage = model.invoke([HumanMessage("하루 수면시간은 몇시간이 좋아?")])
     print(result.content)
 
 
 def input_messages():
-    model: BaseChatModel = init_chat_model(
-        "gemini-2.5-flash-lite", model_provider="google_genai"
-    )
+    model = get_model()
 
     result: AIMessage = model.invoke(
         [
@@ -53,7 +55,7 @@ def prompt_template_test():
         title="구글이 Gemini3.0을 출시했다.", content="블라블라"
     )
 
-    model = init_chat_model("gemini-2.5-flash-lite", model_provider="google_genai")
+    model = get_model()
     result = model.invoke(messages)
 
     print(result)
@@ -72,7 +74,7 @@ def prompt_template_test():
 def templte_with_lcel():
     from langchain_core.prompts import ChatPromptTemplate
 
-    model = init_chat_model("gemini-2.5-flash-lite", model_provider="google_genai")
+    model = get_model()
     prompt = ChatPromptTemplate(
         [
             (
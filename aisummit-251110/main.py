@@ -1,11 +1,22 @@
+import argparse
 import os
 import json
-import httpx
-from bs4 import BeautifulSoup
+import hashlib
+from datetime import datetime
+from itertools import islice
 
-from langchain.chat_models import BaseChatModel, init_chat_model
-from langchain_core.messages import AIMessage
-from langchain_core.prompts import ChatPromptTemplate
+
+from shared.extractor import extract_article_body
+from shared.llm_cache import LLMCache, template_text
+from shared.llm_scheduler import get_scheduler
+from shared.model_registry import get_chat_model
+from shared.news_store import NewsStore
+from shared.tracing import tracer
+
+MODEL_NAME = "gemini-2.5-flash-lite"
+
+# 이미 요약한 기사는 다시 LLM을 호출하지 않도록 결과를 파일에 캐시합니다.
+llm_cache = LLMCache("./llm_cache.sqlite3")
 
 
 def read_meta_data():
@@ -14,38 +25,177 @@ def read_meta_data():
         return data
 
 
+NEWS_STORE_PATH = "./news_data.jsonl"
+
+
+def get_news_store():
+    """
+    기사 본문을 저장하는 JSON Lines 저장소를 반환합니다.
+    예전 형식의 news_data.json만 있으면 한 번 옮겨 담습니다.
+    """
+    store = NewsStore(NEWS_STORE_PATH)
+    if not os.path.exists(NEWS_STORE_PATH) and os.path.exists("./news_data.json"):
+        with open("./news_data.json") as f:
+            store.append(json.load(f))
+    return store
+
+
 def read_news_data():
-    with open("./news_data.json") as f:
-        data = json.load(f)
-        return data
+    """
+    저장된 기사를 한 건씩 읽는 제너레이터를 반환합니다.
+    """
+    return get_news_store().iter_records()
 
 
-def get_content_from_url(url):
-    response: httpx.Response = httpx.get(url)
-    html_content = response.text
-    soup = BeautifulSoup(html_content, "html.parser")
-    article_div = soup.find("div", attrs={"data-tiara-layer": "article_body"})
-    return article_div.get_text().replace("\n", "")
+def get_content_from_html(html_content):
+    # 본문 div까지만 잘라서 설치된 가장 빠른 파서로 추출합니다.
+    text = extract_article_body(html_content, clean=False)
+    return (text or "").replace("\n", "")
 
 
-def save_news_data():
-    data: dict = read_meta_data()
-    news_data = []
-    for d in data:
-        content = get_content_from_url(d.get("url"))
-        d["content"] = content
-        news_data.append(d)
+def get_content_from_url(url):
+    import httpx
 
-    # news_data를 json파일로 저장
-    with open("./news_data.json", "w") as f:
-        json.dump(news_data, f, ensure_ascii=False, indent=2)
+    response: httpx.Response = httpx.get(url)
+    return get_content_from_html(response.text)
+
+
+CRAWL_STATE_PATH = "./crawl_state.json"
+# 중간에 실패해도 진행 상황이 남도록 이 건수마다 크롤링 상태를 저장합니다.
+STATE_SAVE_INTERVAL = 20
+
+
+def read_crawl_state():
+    """
+    기사 id별 크롤링 상태(url, ETag, Last-Modified, 본문 해시)를 불러옵니다.
+    """
+    if not os.path.exists(CRAWL_STATE_PATH):
+        return {}
+    with open(CRAWL_STATE_PATH) as f:
+        return json.load(f)
+
+
+def save_crawl_state(state):
+    # 쓰는 도중에 종료되어도 이전 상태가 남도록 임시 파일에 쓴 뒤 바꿉니다.
+    temp_path = f"{CRAWL_STATE_PATH}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, CRAWL_STATE_PATH)
+
+
+def get_content_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def fetch_if_modified(client, url, entry):
+    """
+    이전에 받은 ETag/Last-Modified로 조건부 요청을 보냅니다.
+    변경이 없으면(304) None을 반환합니다.
+    """
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = client.get(url, headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    return response
+
+
+def save_news_data(revalidate=False):
+    """
+    news_metadata.json 중 아직 수집하지 않은 기사만 가져와 news_data.jsonl에 추가합니다.
+    revalidate=True이면 이미 수집한 기사도 조건부 요청으로 변경 여부를 확인합니다.
+    가져온 기사는 바로 저장하고, 요청이나 본문 추출에 실패한 URL은 기록만 하고 건너뜁니다.
+    """
+    import httpx
+
+    with tracer.span("read_meta_data"):
+        data: dict = read_meta_data()
+    state = read_crawl_state()
+    store = get_news_store()
+
+    added, updated, skipped, failed = 0, 0, 0, 0
+    fetched = 0
+    with httpx.Client(
+        follow_redirects=True,
+        event_hooks={"request": [lambda request: tracer.incr("http.requests")]},
+    ) as client:
+        try:
+            for d in data:
+                article_id = d.get("id")
+                entry = state.get(article_id, {})
+                is_known = article_id in store
+                if is_known and not revalidate:
+                    skipped += 1
+                    continue
+
+                try:
+                    with tracer.span("download_html"):
+                        response = fetch_if_modified(client, d.get("url"), entry)
+                except httpx.HTTPError as e:
+                    print(f"수집 실패 (URL: {d.get('url')}): {e}")
+                    tracer.incr("crawl.errors")
+                    failed += 1
+                    continue
+                if response is None:
+                    skipped += 1
+                    continue
+
+                with tracer.span("extract_article_text"):
+                    content = get_content_from_html(response.text)
+                if not content:
+                    # 빈 본문은 저장하지 않고 상태(ETag 등)도 남기지 않아서,
+                    # 다음 실행에서 304로 건너뛰지 않고 다시 받아 오게 합니다.
+                    print(f"본문 추출 실패 (URL: {d.get('url')})")
+                    tracer.incr("crawl.empty_content")
+                    failed += 1
+                    continue
+                content_hash = get_content_hash(content)
+                previous_hash = entry.get("content_hash")
+                if is_known and previous_hash is None:
+                    previous_hash = get_content_hash(
+                        store.get(article_id).get("content", "")
+                    )
+                changed = not is_known or previous_hash != content_hash
+                if changed:
+                    # 변경된 기사는 새 버전을 뒤에 추가하면 저장소가 최신 값으로 인식합니다.
+                    d["content"] = content
+                    store.append([d])
+                # 기사를 저장한 뒤에 상태를 갱신해야, 중간에 멈춰도 빠진 기사가 생기지 않습니다.
+                state[article_id] = {
+                    "url": d.get("url"),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_hash": content_hash,
+                }
+                if not changed:
+                    skipped += 1
+                elif is_known:
+                    updated += 1
+                else:
+                    added += 1
+                fetched += 1
+                if fetched % STATE_SAVE_INTERVAL == 0:
+                    save_crawl_state(state)
+        finally:
+            save_crawl_state(state)
+    print(f"추가: {added}건, 갱신: {updated}건, 변경 없음: {skipped}건, 실패: {failed}건")
 
 
 def get_model():
-    return init_chat_model("gemini-2.5-flash-lite", model_provider="google_genai")
+    # 호출할 때마다 새 클라이언트를 만들지 않고 프로세스에서 하나를 공유합니다.
+    return get_chat_model(
+        MODEL_NAME, model_provider="google_genai", callbacks=[tracer.callback]
+    )
 
 
 def get_prompt_template(system_prompt, human_prompt):
+    from langchain_core.prompts import ChatPromptTemplate
+
     return ChatPromptTemplate(
         [
             ("system", system_prompt),
@@ -60,20 +210,43 @@ def summarize_news(title, content):
         human_prompt="제목 : {title}\n내용: {content}\n 주어진 뉴스를 요약해주세요.",
     )
 
-    chain = prompt | get_model()
-    result: AIMessage = chain.invoke({"title": title, "content": content})
+    key = llm_cache.make_key(MODEL_NAME, template_text(prompt), title, content)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    chain = (prompt | get_model()).with_config(tags=["summarize_news"])
+    # 한도 초과(429/503) 시 공유 스케줄러가 기다렸다가 다시 시도합니다.
+    result = get_scheduler("google_genai").run_sync(
+        lambda: chain.invoke({"title": title, "content": content}),
+        tokens=(len(title or "") + len(content or "")) // 2,
+    )
+    llm_cache.set(key, result.content)
     return result.content
 
 
 if __name__ == "__main__":
-    # news_data.json 이 없을 때만 실행
-    if os.path.exists("./news_data.json"):
-        print("뉴스데이터가 있습니다.")
-    else:
-        save_news_data()
+    parser = argparse.ArgumentParser(description="뉴스 수집 및 요약")
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="이미 수집한 기사도 조건부 요청(ETag/Last-Modified)으로 변경 여부를 확인",
+    )
+    args = parser.parse_args()
+
+    # 새로 추가된 기사만 수집 (--revalidate가 없으면 이미 수집한 기사는 건너뜀)
+    with tracer.span("save_news_data"):
+        save_news_data(revalidate=args.revalidate)
 
     # 요약
-    data: dict = read_news_data()
-    for d in data[:1]:
-        summary_data = summarize_news(d.get("title"), d.get("content"))
+    data = read_news_data()
+    for d in islice(data, 1):
+        with tracer.span("summarize_news"):
+            summary_data = summarize_news(d.get("title"), d.get("content"))
         print(summary_data)
+
+    cache_stats = llm_cache.stats()
+    tracer.incr("llm_cache.hits", cache_stats["hits"])
+    tracer.incr("llm_cache.misses", cache_stats["misses"])
+    tracer.export_json(f"./trace_{datetime.now().strftime('%Y%m%d_%H%M')}.json")
+    tracer.print_summary()
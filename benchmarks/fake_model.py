@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import re
+import time
+import typing
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+FAKE_CATEGORIES = [
+    "정치",
+    "경제",
+    "사회",
+    "문화/연예",
+    "IT/과학",
+    "스포츠",
+    "국제",
+    "생활/건강",
+    "기타",
+]
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 2)
+
+
+def stable_hash(text):
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    네트워크 없이 벤치마크를 돌리기 위한 가짜 채팅 모델입니다.
+
+    - latency: 첫 토큰까지 걸리는 시간(초)
+    - tokens_per_second: 토큰 생성 속도
+    - output_tokens: 응답 길이(토큰 수)
+
+    같은 프롬프트에는 항상 같은 응답을 돌려줍니다.
+    """
+
+    latency: float = 0.05
+    tokens_per_second: float = 500.0
+    output_tokens: int = 40
+
+    @property
+    def _llm_type(self):
+        return "fake-benchmark"
+
+    def _prompt_text(self, messages):
+        return "\n".join(str(message.content) for message in messages)
+
+    def _delay(self):
+        return self.latency + self.output_tokens / self.tokens_per_second
+
+    def _make_text(self, prompt, schema=None):
+        seed = stable_hash(prompt)
+        if schema is not None:
+            return self._fake_object(schema, prompt, seed).model_dump_json()
+        if "분류" in prompt and "요약" not in prompt:
+            return FAKE_CATEGORIES[seed % len(FAKE_CATEGORIES)]
+        words = [f"문장{(seed + i) % 97}" for i in range(self.output_tokens)]
+        sentences = [" ".join(words[i : i + 10]) + "." for i in range(0, len(words), 10)]
+        return " ".join(sentences)
+
+    def _message(self, prompt, text):
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        return AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = self._prompt_text(messages)
+        time.sleep(self._delay())
+        message = self._message(
+            prompt, self._make_text(prompt, kwargs.get("fake_schema"))
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = self._prompt_text(messages)
+        await asyncio.sleep(self._delay())
+        message = self._message(
+            prompt, self._make_text(prompt, kwargs.get("fake_schema"))
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = self._prompt_text(messages)
+        await asyncio.sleep(self.latency)
+        text = self._make_text(prompt)
+        tokens = text.split(" ")
+        for i, token in enumerate(tokens):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=token if i == 0 else " " + token)
+            )
+
+    def _fake_value(self, annotation, prompt, seed):
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Literal:
+            return args[seed % len(args)]
+        if origin is list:
+            (item_type,) = args
+            if isinstance(item_type, type) and issubclass(item_type, BaseModel):
+                # [1] 제목: ... 형태로 번호가 붙은 기사마다 하나씩 만듭니다.
+                numbers = [int(n) for n in re.findall(r"\[(\d+)\]", prompt)] or [1]
+                return [self._fake_object(item_type, prompt, n) for n in numbers]
+            return [self._fake_value(item_type, prompt, seed + i) for i in range(2)]
+        if annotation is int:
+            return seed
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return self._fake_object(annotation, prompt, seed)
+        return self._make_text(f"{prompt}{seed}")
+
+    def _fake_object(self, schema, prompt, seed):
+        values = {}
+        for name, field in schema.model_fields.items():
+            values[name] = (
+                seed if name == "number" else self._fake_value(field.annotation, prompt, seed)
+            )
+        return schema(**values)
+
+    def with_structured_output(self, schema, **kwargs):
+        """
+        스키마 필드 타입(str, int, Literal, list, BaseModel)에 맞춰 가짜 값을 JSON으로 만듭니다.
+        모델을 거쳐 호출되므로 콜백(토큰/지연 기록)도 그대로 동작합니다.
+        """
+        return self.bind(fake_schema=schema) | RunnableLambda(
+            lambda message: schema.model_validate_json(message.content)
+        )
+
+
+def make_fake_init_chat_model(**fake_kwargs):
+    """
+    init_chat_model 대신 사용할 함수를 만듭니다. 모델 이름/프로바이더는 무시합니다.
+    """
+
+    def fake_init_chat_model(model=None, model_provider=None, **kwargs):
+        return FakeChatModel(callbacks=kwargs.get("callbacks"), **fake_kwargs)
+
+    return fake_init_chat_model
@@ -0,0 +1,124 @@
+import html
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 실제 다음 뉴스 페이지처럼 본문 앞뒤에 관련 없는 마크업을 붙입니다.
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title>
+<script>window.__DATA__ = {{"layer": "<div>"}};</script></head>
+<body>
+{navigation}
+<div class="article_view" data-tiara-layer="article_body" data-translation-body="">
+<section dmcf-sid="{id}">
+{paragraphs}
+</section>
+</div>
+{footer}
+</body></html>
+"""
+NAVIGATION = '<div class="nav"><a href="#">메뉴</a></div>\n' * 200
+FOOTER = '<div class="foot"><span>관련 기사</span></div>\n' * 400
+
+
+def load_base_articles():
+    """
+    저장소의 news_data.json들에서 제목과 본문을 모아 픽스처의 원본으로 씁니다.
+    """
+    articles = []
+    sys.path.insert(0, os.path.join(ROOT, "programmers-250930"))
+    try:
+        from datas import news_datas
+
+        contents = {news["id"]: news.get("content") for news in news_datas}
+    finally:
+        sys.path.pop(0)
+
+    with open(
+        os.path.join(ROOT, "programmers-250930", "news_data.json"), encoding="utf-8"
+    ) as f:
+        for news in json.load(f):
+            content = contents.get(news["id"]) or news.get("summary", "")
+            articles.append({**news, "content": content})
+
+    with open(
+        os.path.join(ROOT, "aisummit-251110", "news_data.json"), encoding="utf-8"
+    ) as f:
+        articles.extend(json.load(f))
+    return articles
+
+
+def render_page(article_id, article):
+    paragraphs = "\n".join(
+        f"<p>{html.escape(line)}</p>"
+        for line in article["content"].split("\n")
+        if line.strip()
+    )
+    return PAGE_TEMPLATE.format(
+        id=article_id,
+        title=html.escape(article["title"]),
+        navigation=NAVIGATION,
+        paragraphs=paragraphs,
+        footer=FOOTER,
+    )
+
+
+def make_articles(size, base_url, base_articles):
+    """
+    원본 기사를 반복해서 size개의 기사 메타데이터를 만듭니다.
+    id는 bench-000001 형식이며, /v/<id>에서 HTML을 받을 수 있습니다.
+    """
+    articles = []
+    for i in range(size):
+        base = base_articles[i % len(base_articles)]
+        article_id = f"bench-{i:06d}"
+        url = f"{base_url}/v/{article_id}"
+        articles.append(
+            {
+                "id": article_id,
+                "title": f"{base['title']} #{i}",
+                "summary": base.get("summary", ""),
+                "pcUrl": url,
+                "url": url,
+                "cpName": base.get("cpName"),
+                "createdAt": base.get("createdAt"),
+            }
+        )
+    return articles
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    base_articles = []
+
+    def do_GET(self):
+        if not self.path.startswith("/v/bench-"):
+            self.send_error(404)
+            return
+        article_id = self.path[len("/v/") :]
+        index = int(article_id.split("-")[1])
+        article = self.base_articles[index % len(self.base_articles)]
+        body = render_page(article_id, article).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", f'"{article_id}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host="127.0.0.1", port=0):
+    """
+    백그라운드 스레드에서 픽스처 서버를 시작하고 (서버, 기본 URL)을 반환합니다.
+    """
+    FixtureHandler.base_articles = load_base_articles()
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
@@ -0,0 +1,240 @@
+"""
+오프라인 벤치마크
+
+네트워크와 실제 LLM 없이 programmers-250930, aisummit-251110 파이프라인의
+처리량(articles/sec), LLM 호출 지연(p50/p95), 최대 메모리(peak RSS)를 측정합니다.
+
+- 기사 HTML은 로컬 픽스처 서버(fixture_server.py)가 news_data.json을 바탕으로 만들어 줍니다.
+- LLM은 지연 시간과 토큰 생성 속도를 조절할 수 있는 FakeChatModel로 바꿔 끼웁니다.
+- (파이프라인, 기사 수) 조합마다 별도 프로세스에서 실행해 메모리를 따로 측정합니다.
+
+사용 예)
+    python benchmarks/run_benchmark.py --sizes 10 100 --latency 0.05 --tokens-per-second 500
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from fake_model import make_fake_init_chat_model
+from fixture_server import ROOT, load_base_articles, make_articles, start_server
+
+PIPELINES = {
+    "programmers": os.path.join(ROOT, "programmers-250930"),
+    "aisummit": os.path.join(ROOT, "aisummit-251110"),
+}
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def peak_rss_mb():
+    """
+    현재 프로세스와 (종료된) 자식 프로세스의 최대 RSS를 MB로 반환합니다.
+    리눅스의 ru_maxrss는 KB 단위입니다.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+
+def install_fake_model(latency, tokens_per_second):
+    # 파이프라인 모듈이 import되기 전에 init_chat_model을 바꿔 둡니다.
+    import langchain.chat_models
+
+    langchain.chat_models.init_chat_model = make_fake_init_chat_model(
+        latency=latency, tokens_per_second=tokens_per_second
+    )
+
+
+def run_programmers(articles, workdir):
+    import main
+    from crawl_pipeline import crawl_articles
+    from shared.extractor import NOT_FOUND_MESSAGE
+    from shared.llm_cache import LLMCache
+    from llm_engine import LLMEngine
+    from shared.news_store import NewsStore
+    from report import build_report
+    from shared.tracing import tracer
+
+    # 가짜 모델에는 분당 한도가 없고, 캐시는 매번 비어 있는 상태에서 시작합니다.
+    main.LLM_PROVIDER = "fake"
+    main._llm_cache = LLMCache(os.path.join(workdir, "llm_cache.sqlite3"))
+
+    with tracer.span("crawl"):
+        texts, _ = asyncio.run(crawl_articles([news["pcUrl"] for news in articles]))
+    for news, text in zip(articles, texts):
+        if text and NOT_FOUND_MESSAGE not in text:
+            news["content"] = text
+        else:
+            news["content"] = news.get("summary", "내용 없음")
+
+    store = NewsStore(os.path.join(workdir, "news_data2.jsonl"))
+    with tracer.span("store"):
+        store.append(articles)
+    with tracer.span("summarize_and_categorize"):
+        datas = asyncio.run(
+            main.asummarize_and_categorize(len(store), store.iter_records())
+        )
+    with tracer.span("report"):
+        asyncio.run(
+            build_report(
+                datas, main.get_llm(), main.NEWS_CATEGORIES, engine=LLMEngine()
+            )
+        )
+    return tracer
+
+
+def run_aisummit(articles, workdir):
+    # news_metadata.json, news_data.jsonl 등을 현재 디렉터리 기준으로 읽고 씁니다.
+    with open(os.path.join(workdir, "news_metadata.json"), "w", encoding="utf-8") as f:
+        json.dump(articles, f, ensure_ascii=False)
+
+    import main
+    from shared.tracing import tracer
+
+    with tracer.span("save_news_data"):
+        main.save_news_data()
+    for d in main.read_news_data():
+        with tracer.span("summarize_news"):
+            main.summarize_news(d.get("title"), d.get("content"))
+    return tracer
+
+
+RUNNERS = {"programmers": run_programmers, "aisummit": run_aisummit}
+
+
+def run_worker(args):
+    """
+    하위 프로세스에서 파이프라인 하나를 실행하고 결과를 JSON 한 줄로 출력합니다.
+    """
+    project_dir = PIPELINES[args.worker]
+    articles = make_articles(args.size, args.base_url, load_base_articles())
+    install_fake_model(args.latency, args.tokens_per_second)
+    # 프로젝트 가상환경 밖에서 실행해도 공유 패키지(shared/)를 찾을 수 있게 합니다.
+    sys.path.insert(0, os.path.join(ROOT, "shared"))
+    sys.path.insert(0, project_dir)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        start = time.perf_counter()
+        # 파이프라인이 기사마다 출력하는 내용은 측정에서 제외합니다.
+        with contextlib.redirect_stdout(io.StringIO()):
+            tracer = RUNNERS[args.worker](articles, workdir)
+        elapsed = time.perf_counter() - start
+
+    latencies = [call["latency"] for call in tracer.llm_calls]
+    stages = {}
+    for span in tracer.spans:
+        stages[span["name"]] = stages.get(span["name"], 0.0) + span["duration"]
+    own_rss, children_rss = peak_rss_mb()
+    print(
+        json.dumps(
+            {
+                "pipeline": args.worker,
+                "size": args.size,
+                "elapsed": elapsed,
+                "articles_per_sec": args.size / elapsed if elapsed else 0.0,
+                "llm_calls": len(latencies),
+                "p50": statistics.median(latencies) if latencies else 0.0,
+                "p95": percentile(latencies, 0.95),
+                "peak_rss_mb": own_rss,
+                "children_peak_rss_mb": children_rss,
+                "stages": stages,
+            }
+        )
+    )
+
+
+def run_case(pipeline, size, base_url, args):
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--worker",
+        pipeline,
+        "--size",
+        str(size),
+        "--base-url",
+        base_url,
+        "--latency",
+        str(args.latency),
+        "--tokens-per-second",
+        str(args.tokens_per_second),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_results(results):
+    print(
+        f"\n{'파이프라인':<14}{'기사 수':>8}{'시간(s)':>10}{'기사/s':>10}"
+        f"{'LLM 호출':>10}{'p50(s)':>9}{'p95(s)':>9}{'RSS(MB)':>10}{'자식RSS(MB)':>12}"
+    )
+    for r in results:
+        print(
+            f"{r['pipeline']:<14}{r['size']:>8}{r['elapsed']:>10.2f}"
+            f"{r['articles_per_sec']:>10.1f}{r['llm_calls']:>10}"
+            f"{r['p50']:>9.3f}{r['p95']:>9.3f}"
+            f"{r['peak_rss_mb']:>10.1f}{r['children_peak_rss_mb']:>12.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 파이프라인 벤치마크")
+    parser.add_argument(
+        "--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES)
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="가짜 LLM의 첫 토큰 지연(초)"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=500.0, help="가짜 LLM의 토큰 생성 속도"
+    )
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--worker", choices=list(PIPELINES), help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    server, base_url = start_server()
+    results = []
+    try:
+        for pipeline in args.pipelines:
+            for size in args.sizes:
+                print(f"{pipeline} {size}건 실행 중...", flush=True)
+                result = run_case(pipeline, size, base_url, args)
+                if result:
+                    results.append(result)
+    finally:
+        server.shutdown()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import asyncio
 import os
 from agents import Agent, Runner
-from agents.extensions.models.litellm_model import LitellmModel
+from scheduled_model import ScheduledModel
 
 # ------------------------------------------------------------------------------
 # 1단계: Gemini를 이용한 기본 에이전트 (Basic Agent using Gemini)
@@ -26,7 +26,9 @@ async def main():
     # LiteLLMModel 래퍼를 사용하여 Gemini에 액세스합니다.
     # 모델 문자열은 보통 'provider/model-name' 형식을 따릅니다.
     # Gemini의 경우 LiteLLM은 'gemini/gemini-pro' 또는 'gemini/gemini-1.5-flash'를 사용합니다.
-    model = LitellmModel(
+    # 한도 초과(429/503) 응답을 받으면 모델 호출만 기다렸다가 다시 시도하도록
+    # 공유 스케줄러를 거치는 ScheduledModel(LitellmModel)을 사용합니다.
+    model = ScheduledModel(
         model="gemini/gemini-1.5-flash" 
     )
 
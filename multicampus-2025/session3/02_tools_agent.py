@@ -1,7 +1,7 @@
 import asyncio
 import os
 from agents import Agent, Runner, tool
-from agents.extensions.models.litellm_model import LitellmModel
+from scheduled_model import ScheduledModel
 
 # ------------------------------------------------------------------------------
 # 2단계: 도구를 사용하는 에이전트 (Agent with Tools) - 함수 호출 (Function Calling)
@@ -38,7 +38,9 @@ async def main():
         return
 
     # 2. 모델 구성
-    model = LitellmModel(
+    # 한도 초과로 다시 시도할 때 이미 실행한 도구까지 다시 실행하지 않도록,
+    # 모델 호출 단위로 스케줄러를 거치는 ScheduledModel을 사용합니다.
+    model = ScheduledModel(
         model="gemini/gemini-1.5-flash"
     )
 
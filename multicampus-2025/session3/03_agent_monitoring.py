@@ -2,7 +2,7 @@ import asyncio
 import os
 import pprint
 from agents import Agent, Runner, tool
-from agents.extensions.models.litellm_model import LitellmModel
+from scheduled_model import ScheduledModel
 
 # ------------------------------------------------------------------------------
 # 3단계: 모니터링 및 디버깅 (Monitoring and Debugging)
@@ -43,7 +43,8 @@ async def main():
         print("오류: GEMINI_API_KEY 환경 변수가 필요합니다.")
         return
 
-    model = LitellmModel(model="gemini/gemini-1.5-flash")
+    # 모델 호출은 ScheduledModel이 공유 스케줄러를 거쳐 보냅니다. (1단계 참고)
+    model = ScheduledModel(model="gemini/gemini-1.5-flash")
 
     agent = Agent(
         name="StockBroker",
@@ -2,18 +2,26 @@ import asyncio
 import os
 import sys
 from agents import Agent, Runner
-from agents.extensions.models.litellm_model import LitellmModel
+from shared.conversation_memory import ConversationMemory, build_summary_prompt
+from shared.llm_scheduler import BATCH, INTERACTIVE
+from scheduled_model import ScheduledModel
 
 # ------------------------------------------------------------------------------
 # 4단계: 대화형 에이전트 (Interactive Agent)
 #
 # 이 예제는 사용자와 지속적으로 대화할 수 있는 CLI 챗봇을 만드는 방법을 보여줍니다.
 # 대화 기록(History)을 관리하여 문맥을 유지하는 방법을 다룹니다.
+# 기록을 계속 쌓으면 턴마다 보내는 토큰이 늘어나 응답이 느려지므로,
+# 토큰 예산을 넘는 오래된 대화는 요약문으로 접어서 보냅니다.
 # ------------------------------------------------------------------------------
 
 # 1. 모델 구성
-model = LitellmModel(
-    model="gemini/gemini-1.5-flash"
+# 한도 초과(429/503) 응답을 받으면 모델 호출만 기다렸다가 다시 시도하도록
+# 공유 스케줄러를 거치는 ScheduledModel(LitellmModel)을 사용합니다.
+# 사용자가 기다리는 대화 응답은 대화형(INTERACTIVE) 우선순위로 보냅니다.
+model = ScheduledModel(
+    model="gemini/gemini-1.5-flash",
+    priority=INTERACTIVE,
 )
 
 # 2. 에이전트 정의
@@ -23,7 +31,23 @@ chat_agent = Agent(
     instructions="당신은 친절한 대화 친구입니다. 답변을 간결하고 매력적으로 해주세요. (한국어로 답변)"
 )
 
-# 3. 대화형 루프 (Interactive Loop)
+# 3. 대화 요약 에이전트
+# 오래된 대화를 기존 요약문에 합칩니다. 사용자를 기다리게 하지 않도록
+# 백그라운드에서 실행되며, 스케줄러에서도 대화 응답보다 뒤로 밀립니다(BATCH).
+summary_agent = Agent(
+    name="Summarizer",
+    model=ScheduledModel(model="gemini/gemini-1.5-flash", priority=BATCH),
+    instructions="당신은 대화 내용을 정리하는 요약가입니다. 요청받은 요약만 한국어로 출력하세요."
+)
+
+
+async def summarize_history(summary, messages):
+    prompt = build_summary_prompt(summary, messages)
+    result = await Runner.run(summary_agent, prompt)
+    return result.final_output
+
+
+# 4. 대화형 루프 (Interactive Loop)
 async def main():
     print("--- 대화형 챗 에이전트 ('exit'를 입력하여 종료) ---")
     
@@ -31,30 +55,32 @@ async def main():
         print("오류: GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
         return
 
-    # 대화 기록을 저장할 리스트입니다.
-    # 문맥을 유지하기 위해 이전 메시지들을 계속 누적해서 전달해야 합니다.
-    messages = []
+    # 대화 기록을 관리하는 메모리입니다.
+    # 최근 대화는 그대로, 예산을 넘은 오래된 대화는 요약문으로 전달합니다.
+    memory = ConversationMemory(summarize_history)
     
     while True:
         try:
-            user_input = input("\n나(User): ")
+            # 입력을 기다리는 동안에도 백그라운드 요약이 진행되도록 별도 스레드에서 읽습니다.
+            user_input = await asyncio.to_thread(input, "\n나(User): ")
             if user_input.lower() in ["exit", "quit", "종료"]:
                 print("안녕히 가세요!")
                 break
             
             # 사용자 메시지를 기록에 추가
             # SDK는 보통 메시지 형식을 따릅니다 (role, content).
-            messages.append({"role": "user", "content": user_input})
+            memory.add("user", user_input)
             
             # 에이전트 실행 (대화 기록 포함)
-            # messages 인자를 통해 지금까지의 대화 맥락을 에이전트에게 전달합니다.
+            # messages 인자를 통해 요약문과 최근 대화를 에이전트에게 전달합니다.
+            messages = memory.messages()
             result = await Runner.run(chat_agent, messages=messages)
             
             # 결과 출력
             print(f"에이전트(Agent): {result.final_output}")
             
             # 에이전트의 응답을 기록에 추가하여 다음 턴에 문맥으로 사용
-            messages.append({"role": "assistant", "content": result.final_output})
+            memory.add("assistant", result.final_output)
             
         except KeyboardInterrupt:
             print("\n종료합니다!")
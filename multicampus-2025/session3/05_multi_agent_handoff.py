@@ -2,7 +2,7 @@ import asyncio
 import os
 import sys
 from agents import Agent, Runner
-from agents.extensions.models.litellm_model import LitellmModel
+from scheduled_model import ScheduledModel
 
 # ------------------------------------------------------------------------------
 # 5단계: 멀티 에이전트 핸드오프 (Multi-Agent Handoff)
@@ -12,7 +12,9 @@ from agents.extensions.models.litellm_model import LitellmModel
 # ------------------------------------------------------------------------------
 
 # 1. 모델 구성
-model = LitellmModel(
+# 핸드오프로 이어지는 에이전트들도 이 모델을 함께 쓰므로
+# 모든 모델 호출이 같은 스케줄러(한도, 재시도)를 거칩니다.
+model = ScheduledModel(
     model="gemini/gemini-1.5-flash"
 )
 
@@ -0,0 +1,41 @@
+from agents.extensions.models.litellm_model import LitellmModel
+from shared.llm_scheduler import BATCH, get_scheduler
+
+
+def estimate_tokens(system_instructions, input):
+    """
+    토크나이저 없이 대략적인 입력 토큰 수를 계산합니다. (한국어 기준 2글자당 1토큰)
+    """
+    return (len(system_instructions or "") + len(str(input))) // 2 + 1
+
+
+class ScheduledModel(LitellmModel):
+    """
+    모델 호출 한 번 한 번을 공유 스케줄러를 거쳐 보내는 LitellmModel입니다.
+
+    에이전트 실행(Runner.run) 전체가 아니라 모델 호출만 다시 시도하므로,
+    429/503 응답을 받아도 이미 실행한 도구 호출을 다시 실행하지 않습니다.
+    스트리밍은 조각을 내보내기 전에 실패한 경우에만 다시 시도합니다.
+    """
+
+    def __init__(self, model, scheduler=None, priority=BATCH, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.scheduler = scheduler or get_scheduler("gemini")
+        self.priority = priority
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        get_response = super().get_response
+        return await self.scheduler.run(
+            lambda: get_response(system_instructions, input, *args, **kwargs),
+            tokens=estimate_tokens(system_instructions, input),
+            priority=self.priority,
+        )
+
+    async def stream_response(self, system_instructions, input, *args, **kwargs):
+        stream_response = super().stream_response
+        async for event in self.scheduler.stream(
+            lambda: stream_response(system_instructions, input, *args, **kwargs),
+            tokens=estimate_tokens(system_instructions, input),
+            priority=self.priority,
+        ):
+            yield event
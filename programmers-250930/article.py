@@ -0,0 +1,137 @@
+"""
+파이프라인에서 쓰는 기사 레코드입니다.
+
+저장소의 기사 dict에는 이미지 URL, clipLinkId 등 파이프라인이 쓰지 않는 키가 14개 정도
+들어 있습니다. Article은 필요한 필드만 슬롯에 담고, 매체/카테고리처럼 반복되는 문자열은
+intern해서 같은 객체를 공유합니다. 본문(content)은 저장소를 넘겨주면 처음 쓸 때 읽어 두고,
+release_content()로 다시 내려놓을 수 있습니다.
+
+기존 코드가 news.get("title"), news["id"], {**news}처럼 dict로 다루던 방식도 그대로 지원합니다.
+"""
+
+import dataclasses
+import sys
+from dataclasses import dataclass
+
+# 반복되는 값이라 intern해서 공유하는 필드
+INTERNED_FIELDS = ("cpName", "category", "type", "serviceName")
+# 예전 dict 키 -> Article 필드
+ALIASES = {"pcUrl": "url", "moUrl": "url"}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Article:
+    id: str
+    title: str | None = None
+    cpName: str | None = None
+    createdAt: str | None = None
+    url: str | None = None
+    type: str | None = None
+    serviceName: str | None = None
+    mediaPickDuplicateCount: int | None = None
+    summary: str | None = None
+    category: str | None = None
+    related: list | None = None
+    # 본문을 아직 저장소에서 읽지 않았으면 None, 읽었거나 직접 들고 있으면 문자열입니다.
+    _content: str | None = dataclasses.field(default=None, repr=False)
+    _store: object = dataclasses.field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name in INTERNED_FIELDS:
+            setattr(self, name, _intern(getattr(self, name)))
+
+    @classmethod
+    def from_dict(cls, news, store=None):
+        """
+        기존 dict 형식의 기사를 Article로 바꿉니다.
+        store(NewsStore)를 주면 본문은 들고 있지 않고 필요할 때 저장소에서 읽습니다.
+        """
+        return cls(
+            id=news.get("id"),
+            title=news.get("title"),
+            cpName=news.get("cpName"),
+            createdAt=news.get("createdAt"),
+            url=news.get("pcUrl") or news.get("url"),
+            type=news.get("type"),
+            serviceName=news.get("serviceName"),
+            mediaPickDuplicateCount=news.get("mediaPickDuplicateCount"),
+            summary=news.get("summary"),
+            category=news.get("category"),
+            related=news.get("related"),
+            _content=None if store is not None else news.get("content"),
+            _store=store,
+        )
+
+    @property
+    def content(self):
+        if self._content is None and self._store is not None:
+            # 중복 제거와 요약 단계에서 여러 번 쓰므로 처음 읽은 본문을 들고 있습니다.
+            record = self._store.get(self.id)
+            self._content = record.get("content") if record else None
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+
+    def release_content(self):
+        """
+        저장소에서 읽어 둔 본문을 버립니다. 다시 쓰면 저장소에서 새로 읽습니다.
+        저장소 없이 직접 들고 있는 본문은 버리지 않습니다.
+        """
+        if self._store is not None:
+            self._content = None
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    # 아래는 dict처럼 다루던 기존 코드와 호환하기 위한 메서드입니다.
+    def keys(self):
+        return [
+            name
+            for name in (*_FIELD_NAMES, "content")
+            if getattr(self, name) is not None
+        ]
+
+    def get(self, key, default=None):
+        key = ALIASES.get(key, key)
+        if key != "content" and key not in _FIELD_NAMES:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        key = ALIASES.get(key, key)
+        if key != "content" and key not in _FIELD_NAMES:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+
+_FIELD_NAMES = tuple(
+    field.name for field in dataclasses.fields(Article) if not field.name.startswith("_")
+)
+
+
+def with_fields(news, **fields):
+    """
+    기사에 필드를 더한 새 기사를 만듭니다. Article이면 Article을, dict면 dict를 반환합니다.
+    """
+    if isinstance(news, Article):
+        return dataclasses.replace(news, **fields)
+    return {**news, **fields}
+
+
+def to_articles(records, store=None):
+    """
+    dict 형식의 기사들(datas.news_datas, 저장소의 레코드 등)을 Article로 한 건씩 바꿉니다.
+    store를 주면 본문은 들고 있지 않고 필요할 때 store에서 다시 읽습니다.
+    """
+    for news in records:
+        yield news if isinstance(news, Article) else Article.from_dict(news, store)
@@ -0,0 +1,358 @@
+"""
+배치 API로 많은 기사를 한꺼번에 요약합니다. (밤새 돌리는 대량 작업용)
+
+기사마다 요청을 보내는 대신 모든 프롬프트를 하나의 JSONL 작업 파일로 만들어 제출하고,
+작업이 끝날 때까지 주기적으로 상태를 확인한 뒤 결과를 기사 id 기준으로 합칩니다.
+요청 본문과 캐시 키는 main.py의 요약 요청과 같은 방식(입력 한도를 넘는 본문은 나눠서
+요약)으로 만들고, 결과는 LLM 캐시에도 저장합니다. 그래서 이후 main.py를 --mode separate로
+실행하면 같은 기사는 다시 요약하지 않습니다. 기본 combined 모드는 요약과 분류를 한 번에
+요청하는 다른 프롬프트를 쓰므로 이 캐시를 사용하지 않습니다.
+
+작업 파일은 Gemini 배치 API 형식({"key": ..., "request": {...}})을 따릅니다.
+--provider local을 사용하면 배치 API 없이 파일 기반으로 같은 흐름을 실행합니다.
+이때 요청은 main.py와 같은 모델로, 공유 스케줄러를 거쳐 보냅니다. (네트워크 필요)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from itertools import islice
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from shared.llm_scheduler import get_scheduler
+from shared.news_store import NewsStore
+
+import main
+from llm_engine import LLMEngine, estimate_tokens
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+BATCH_DIR = os.path.join(_DIR, "batch_jobs")
+DEFAULT_POLL_INTERVAL = 60.0
+
+# 더 이상 상태가 바뀌지 않는 작업 상태
+DONE_STATES = {"succeeded", "partially_succeeded", "failed", "cancelled", "expired"}
+
+
+def prompt_to_request(prompt, inputs):
+    """
+    ChatPromptTemplate을 Gemini generateContent 요청 본문으로 바꿉니다.
+    """
+    system, contents = [], []
+    for message in prompt.format_messages(**inputs):
+        if message.type == "system":
+            system.append({"text": message.content})
+        else:
+            role = "model" if message.type == "ai" else "user"
+            contents.append({"role": role, "parts": [{"text": message.content}]})
+    request = {"contents": contents}
+    if system:
+        request["system_instruction"] = {"parts": system}
+    return request
+
+
+def request_to_messages(request):
+    messages = [
+        SystemMessage(part["text"])
+        for part in request.get("system_instruction", {}).get("parts", [])
+    ]
+    messages += [
+        HumanMessage("".join(part["text"] for part in content["parts"]))
+        for content in request["contents"]
+    ]
+    return messages
+
+
+def response_text(response):
+    """
+    응답에서 텍스트를 꺼냅니다. 차단되었거나 비어 있는 응답이면 None을 반환합니다.
+    """
+    candidates = response.get("candidates") or []
+    parts = (candidates[0].get("content") or {}).get("parts") if candidates else None
+    if not parts:
+        return None
+    return "".join(part.get("text", "") for part in parts) or None
+
+
+def summarize_inputs(news, budget):
+    """
+    main.py의 요약 요청과 같은 입력을 만듭니다. 캐시 키도 이 입력으로 만듭니다.
+    """
+    title = news.get("title")
+    content = main.condense_content(title, news.get("content"), budget)
+    return {"title": title, "content": content}
+
+
+def summary_record(news, summary):
+    return {"id": news["id"], "title": news.get("title"), "summary": summary}
+
+
+def write_batch_file(news_list, prompt, path, budget):
+    """
+    요약 요청을 작업 파일에 한 줄씩 씁니다. 이미 캐시에 있는 기사는 제외합니다.
+    (작업 파일에 쓴 기사 수, 캐시에 있던 기사의 요약 레코드 리스트)를 반환합니다.
+    """
+    count, cached = 0, []
+    with open(path, "w", encoding="utf-8") as f:
+        for news in news_list:
+            inputs = summarize_inputs(news, budget)
+            key = main.get_cache_key(prompt, inputs["title"], inputs["content"])
+            summary = main.get_llm_cache().get(key)
+            if summary:
+                cached.append(summary_record(news, summary))
+                continue
+            line = {
+                "key": str(news["id"]),
+                "request": prompt_to_request(prompt, inputs),
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count, cached
+
+
+def read_batch_results(path):
+    """
+    결과 파일에서 (기사 id, 요약 또는 None, 오류 메시지 또는 None)을 한 건씩 읽습니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            if "response" in result:
+                summary = response_text(result["response"])
+                error = None if summary else "빈 응답 (차단되었거나 후보가 없음)"
+                yield result["key"], summary, error
+            else:
+                yield result["key"], None, str(result.get("error"))
+
+
+class LocalBatchProvider:
+    """
+    배치 API를 파일로 흉내 내는 대체 구현입니다.
+    작업마다 디렉터리를 만들고, 백그라운드 스레드에서 공유 스케줄러를 거쳐 요청을 보내
+    Gemini와 같은 형식의 결과 파일을 씁니다.
+    llm을 주지 않으면 main.py와 같은 실제 모델을 사용합니다.
+    """
+
+    def __init__(self, directory=BATCH_DIR, llm=None, max_concurrency=8):
+        self.directory = directory
+        self.llm = llm or main.get_llm()
+        self.max_concurrency = max_concurrency
+        self._threads = {}
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.directory, job_id)
+
+    def _set_state(self, job_id, state):
+        with open(os.path.join(self._job_dir(job_id), "status.json"), "w") as f:
+            json.dump({"state": state}, f)
+
+    def submit(self, input_path):
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        os.makedirs(self._job_dir(job_id))
+        shutil.copy(input_path, os.path.join(self._job_dir(job_id), "input.jsonl"))
+        self._set_state(job_id, "running")
+        self._start(job_id)
+        return job_id
+
+    def _start(self, job_id):
+        thread = threading.Thread(target=self._process, args=(job_id,), daemon=True)
+        self._threads[job_id] = thread
+        thread.start()
+
+    def _process(self, job_id):
+        job_dir = self._job_dir(job_id)
+        with open(os.path.join(job_dir, "input.jsonl"), encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        outputs = asyncio.run(
+            self._invoke_all([request_to_messages(line["request"]) for line in lines])
+        )
+        with open(os.path.join(job_dir, "output.jsonl"), "w", encoding="utf-8") as f:
+            for line, output in zip(lines, outputs):
+                if isinstance(output, Exception):
+                    result = {"key": line["key"], "error": {"message": str(output)}}
+                else:
+                    result = {
+                        "key": line["key"],
+                        "response": {
+                            "candidates": [
+                                {"content": {"parts": [{"text": output.content}]}}
+                            ]
+                        },
+                    }
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        failed = any(isinstance(output, Exception) for output in outputs)
+        self._set_state(job_id, "partially_succeeded" if failed else "succeeded")
+
+    async def _invoke_all(self, requests):
+        """
+        요청들을 동시에 보내고, 요청 순서대로 응답 또는 예외를 반환합니다.
+        """
+        engine = LLMEngine(
+            concurrency=self.max_concurrency, scheduler=get_scheduler(main.LLM_PROVIDER)
+        )
+
+        async def invoke(messages):
+            tokens = estimate_tokens(*(message.content for message in messages))
+            try:
+                return await engine.run(self.llm, messages, tokens)
+            except Exception as e:
+                return e
+
+        return await asyncio.gather(*(invoke(messages) for messages in requests))
+
+    def status(self, job_id):
+        with open(os.path.join(self._job_dir(job_id), "status.json")) as f:
+            state = json.load(f)["state"]
+        # 처리하던 프로세스가 종료된 작업이면 이 프로세스에서 다시 처리합니다.
+        if state == "running" and job_id not in self._threads:
+            self._start(job_id)
+        return state
+
+    def download(self, job_id, path):
+        shutil.copy(os.path.join(self._job_dir(job_id), "output.jsonl"), path)
+
+
+class GeminiBatchProvider:
+    """
+    Gemini 배치 API(google-genai 패키지)를 사용합니다.
+    작업 파일을 업로드해서 제출하고, 완료되면 결과 파일을 내려받습니다.
+    """
+
+    def __init__(self, model=None):
+        try:
+            from google import genai
+            from google.genai import types
+        except ImportError:
+            raise ImportError("배치 모드에는 google-genai 패키지가 필요합니다.")
+        self.client = genai.Client()
+        self.types = types
+        self.model = model or main.LLM_MODEL
+
+    def submit(self, input_path):
+        uploaded = self.client.files.upload(
+            file=input_path,
+            config=self.types.UploadFileConfig(
+                display_name=os.path.basename(input_path), mime_type="jsonl"
+            ),
+        )
+        job = self.client.batches.create(
+            model=self.model,
+            src=uploaded.name,
+            config={"display_name": os.path.basename(input_path)},
+        )
+        return job.name
+
+    def status(self, job_id):
+        state = self.client.batches.get(name=job_id).state.name
+        return state.removeprefix("JOB_STATE_").lower()
+
+    def download(self, job_id, path):
+        job = self.client.batches.get(name=job_id)
+        data = self.client.files.download(file=job.dest.file_name)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+PROVIDERS = {"local": LocalBatchProvider, "google_genai": GeminiBatchProvider}
+
+
+def wait_for_job(provider, job_id, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    작업이 끝날 때까지 poll_interval초마다 상태를 확인하고, 마지막 상태를 반환합니다.
+    """
+    while True:
+        state = provider.status(job_id)
+        if state in DONE_STATES:
+            return state
+        print(f"[{time.strftime('%H:%M:%S')}] 작업 {job_id}: {state}")
+        time.sleep(poll_interval)
+
+
+def merge_results(news_list, prompt, output_path, store, budget):
+    """
+    결과를 기사 id 기준으로 합쳐 store에 저장하고 LLM 캐시에도 넣습니다.
+    (저장한 건수, 실패한 건수)를 반환합니다.
+    """
+    news_by_id = {str(news["id"]): news for news in news_list}
+    records, failed = [], 0
+    for key, summary, error in read_batch_results(output_path):
+        news = news_by_id.get(key)
+        if news is None:
+            continue
+        if summary is None:
+            print(f"요약 실패 (id: {key}): {error}")
+            failed += 1
+            continue
+        inputs = summarize_inputs(news, budget)
+        main.get_llm_cache().set(
+            main.get_cache_key(prompt, inputs["title"], inputs["content"]), summary
+        )
+        records.append(summary_record(news, summary))
+    store.append(records)
+    return len(records), failed
+
+
+def run_batch(provider, news_list, store, job_id=None, poll_interval=DEFAULT_POLL_INTERVAL):
+    """
+    작업 파일 생성 -> 제출 -> 완료 대기 -> 결과 병합을 차례로 실행합니다.
+    job_id를 주면 이미 제출한 작업의 완료를 기다렸다가 결과만 합칩니다.
+    """
+    os.makedirs(BATCH_DIR, exist_ok=True)
+    prompt = main.get_summarize_prompt()
+    budget = main.get_token_budgets()["summarize"]
+    if job_id is None:
+        input_path = os.path.join(BATCH_DIR, f"batch_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+        count, cached = write_batch_file(news_list, prompt, input_path, budget)
+        # 캐시에 있던 요약은 작업에 넣지 않고 바로 결과에 저장합니다.
+        if cached:
+            store.append(cached)
+            print(f"캐시에 있던 요약 {len(cached)}건을 '{store.path}'에 저장했습니다.")
+        if count == 0:
+            os.remove(input_path)
+            print("새로 요약할 기사가 없습니다.")
+            return
+        job_id = provider.submit(input_path)
+        print(f"기사 {count}건으로 배치 작업을 제출했습니다: {job_id}")
+        print(f"중단되면 --job {job_id} 으로 이어서 기다릴 수 있습니다.")
+
+    state = wait_for_job(provider, job_id, poll_interval)
+    if state not in ("succeeded", "partially_succeeded"):
+        raise RuntimeError(f"배치 작업이 실패했습니다: {job_id} ({state})")
+
+    output_path = os.path.join(BATCH_DIR, f"{job_id.replace('/', '_')}_output.jsonl")
+    provider.download(job_id, output_path)
+    saved, failed = merge_results(news_list, prompt, output_path, store, budget)
+    print(f"요약 {saved}건을 '{store.path}'에 저장했습니다. (실패 {failed}건)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="배치 API로 뉴스 대량 요약")
+    parser.add_argument("--provider", choices=list(PROVIDERS), default="google_genai")
+    parser.add_argument(
+        "--input", default="news_data2.jsonl", help="요약할 기사가 들어 있는 JSONL 파일"
+    )
+    parser.add_argument(
+        "--output", default="batch_summaries.jsonl", help="요약 결과를 저장할 JSONL 파일"
+    )
+    parser.add_argument("--limit", type=int, help="앞에서부터 이 개수만 요약")
+    parser.add_argument("--job", help="이미 제출한 작업 id (결과만 기다렸다가 병합)")
+    parser.add_argument(
+        "--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help="상태 확인 주기(초)"
+    )
+    args = parser.parse_args()
+
+    news_list = list(islice(main.get_news_store(args.input).iter_records(), args.limit))
+    run_batch(
+        PROVIDERS[args.provider](),
+        news_list,
+        NewsStore(os.path.join(_DIR, args.output)),
+        job_id=args.job,
+        poll_interval=args.poll_interval,
+    )
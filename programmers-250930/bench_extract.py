@@ -0,0 +1,104 @@
+"""
+기사 본문 추출 벤치마크
+
+저장해 둔 다음(Daum) 뉴스 HTML로 파서별 속도와 결과 일치 여부를 비교합니다.
+기준은 기존 방식(bs4로 전체 문서 파싱)입니다.
+
+fixtures/html에는 다음 뉴스와 같은 구조로 만든 페이지가 들어 있습니다.
+(작은따옴표, 속성 순서, 공백, 대문자 태그, 본문 안의 script/주석 등 표기가 다른 경우 포함)
+
+    # 1. (선택) news_data.json의 pcUrl에서 실제 HTML을 내려받아 fixtures/html에 추가
+    python bench_extract.py --record
+
+    # 2. 벤치마크 실행
+    python bench_extract.py --repeat 20
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import httpx
+
+from shared.extractor import BACKEND_PRIORITY, extract_article_body, is_available
+
+DIR_PATH = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(DIR_PATH, "fixtures", "html")
+
+
+def record_fixtures(news_file="news_data.json"):
+    """
+    뉴스 데이터의 pcUrl 페이지를 fixtures/html/<id>.html로 저장합니다.
+    """
+    with open(os.path.join(DIR_PATH, news_file), encoding="utf-8") as f:
+        news_data = json.load(f)
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with httpx.Client(follow_redirects=True, timeout=10.0) as client:
+        for news in news_data:
+            path = os.path.join(FIXTURE_DIR, f"{news['id']}.html")
+            if os.path.exists(path):
+                continue
+            try:
+                response = client.get(news["pcUrl"])
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"저장 실패 (URL: {news['pcUrl']}): {e}")
+                continue
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(response.text)
+            print(f"저장: {path}")
+
+
+def load_fixtures():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def run_extraction(pages, backend, early_stop, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [
+            extract_article_body(html, backend=backend, early_stop=early_stop)
+            for html in pages
+        ]
+    elapsed = time.perf_counter() - start
+    return outputs, elapsed / (repeat * len(pages))
+
+
+def benchmark(repeat=10):
+    pages = load_fixtures()
+    if not pages:
+        print(f"'{FIXTURE_DIR}'에 HTML 파일이 없습니다. --record로 먼저 저장하세요.")
+        return
+
+    baseline, baseline_time = run_extraction(pages, "bs4", False, repeat)
+    print(f"페이지 {len(pages)}개, 반복 {repeat}회")
+    print(f"{'backend':<12}{'early_stop':>11}{'ms/page':>10}{'speedup':>9}{'parity':>9}")
+    for backend in BACKEND_PRIORITY:
+        if not is_available(backend):
+            print(f"{backend:<12} (설치되지 않음)")
+            continue
+        for early_stop in (False, True):
+            outputs, per_page = run_extraction(pages, backend, early_stop, repeat)
+            same = sum(a == b for a, b in zip(outputs, baseline))
+            print(
+                f"{backend:<12}{str(early_stop):>11}{per_page * 1000:>10.2f}"
+                f"{baseline_time / per_page:>8.1f}x{same / len(pages):>9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기사 본문 추출 벤치마크")
+    parser.add_argument("--record", action="store_true", help="HTML 픽스처 저장")
+    parser.add_argument("--repeat", type=int, default=10, help="반복 횟수")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+    benchmark(args.repeat)
@@ -0,0 +1,281 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import statistics
+import time
+import zlib
+
+from shared.news_store import NewsStore
+
+# 특징(feature)을 해시해서 넣을 가중치 칸 수
+DIMENSIONS = 1 << 18
+# 로컬 분류 결과를 그대로 쓰기 위한 최소 확률. 이보다 낮으면 LLM에 묻습니다.
+DEFAULT_THRESHOLD = 0.8
+EPOCHS = 8
+LEARNING_RATE = 0.3
+# 키워드를 뽑을 때 사용하는 본문 앞부분 길이
+LEAD_CHARS = 300
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(_DIR, "category_model.json")
+LABELS_PATH = os.path.join(_DIR, "category_labels.jsonl")
+
+_WORD = re.compile(r"[가-힣A-Za-z0-9]{2,}")
+
+
+def extract_features(news):
+    """
+    매체명(cpName), 제목 단어와 두 글자 조각, 본문 앞부분의 키워드를
+    해시한 인덱스 목록을 만듭니다.
+    """
+    title = news.get("title") or ""
+    lead = (news.get("content") or news.get("summary") or "")[:LEAD_CHARS]
+    compact = re.sub(r"\s+", "", title)
+    names = ["bias", f"cp:{news.get('cpName')}"]
+    names += [f"w:{word}" for word in _WORD.findall(title)]
+    names += [f"b:{compact[i : i + 2]}" for i in range(len(compact) - 1)]
+    names += [f"k:{word}" for word in _WORD.findall(lead)]
+    return sorted({zlib.crc32(name.encode()) % DIMENSIONS for name in names})
+
+
+def softmax(scores):
+    top = max(scores)
+    exps = [math.exp(score - top) for score in scores]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class CategoryClassifier:
+    """
+    해시 특징을 쓰는 선형(소프트맥스) 분류기입니다.
+    LLM이 붙인 카테고리로 학습하고, 확신이 높은 기사만 로컬에서 분류합니다.
+    """
+
+    def __init__(self, categories, weights=None):
+        self.categories = list(categories)
+        # {특징 인덱스: [카테고리별 가중치]} 형태로, 학습에 나온 특징만 저장합니다.
+        self.weights = weights or {}
+
+    def predict_proba(self, news):
+        scores = [0.0] * len(self.categories)
+        for index in extract_features(news):
+            row = self.weights.get(index)
+            if row:
+                for c, weight in enumerate(row):
+                    scores[c] += weight
+        return softmax(scores)
+
+    def predict(self, news):
+        """
+        (카테고리, 확률)을 반환합니다.
+        """
+        probs = self.predict_proba(news)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.categories[best], probs[best]
+
+    def fit(self, samples, epochs=EPOCHS, learning_rate=LEARNING_RATE, seed=0):
+        """
+        (기사, 카테고리) 목록으로 확률적 경사 하강법 학습을 합니다.
+        목록에 없는 카테고리가 붙은 샘플은 건너뜁니다.
+        """
+        label_index = {category: c for c, category in enumerate(self.categories)}
+        samples = [
+            (extract_features(news), label_index[label])
+            for news, label in samples
+            if label in label_index
+        ]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(samples)
+            for features, target in samples:
+                scores = [0.0] * len(self.categories)
+                for index in features:
+                    row = self.weights.get(index)
+                    if row:
+                        for c, weight in enumerate(row):
+                            scores[c] += weight
+                probs = softmax(scores)
+                for index in features:
+                    row = self.weights.setdefault(index, [0.0] * len(self.categories))
+                    for c, prob in enumerate(probs):
+                        row[c] -= learning_rate * (prob - (c == target))
+        return self
+
+    def save(self, path=MODEL_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "categories": self.categories,
+                    "weights": {str(k): v for k, v in self.weights.items()},
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        """
+        저장된 모델을 불러옵니다. 아직 학습하지 않았으면 None을 반환합니다.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        weights = {int(k): v for k, v in data["weights"].items()}
+        return cls(data["categories"], weights)
+
+
+def get_label_store(path=LABELS_PATH):
+    """
+    LLM이 분류한 결과를 기사 id별로 모아 두는 학습 데이터 저장소입니다.
+    """
+    return NewsStore(path)
+
+
+def make_label(news, category):
+    return {
+        "id": news.get("id"),
+        "title": news.get("title"),
+        "cpName": news.get("cpName"),
+        "content": (news.get("content") or "")[:LEAD_CHARS],
+        "category": category,
+    }
+
+
+def evaluate(classifier, samples, threshold=DEFAULT_THRESHOLD):
+    """
+    LLM 라벨을 정답으로 보고 로컬 분류기의 정확도와 처리 시간을 잽니다.
+    threshold 이상인 기사(로컬 처리분)만의 정확도와 비율도 함께 계산합니다.
+    """
+    correct, local, local_correct = 0, 0, 0
+    latencies = []
+    for news, label in samples:
+        start = time.perf_counter()
+        predicted, confidence = classifier.predict(news)
+        latencies.append(time.perf_counter() - start)
+        correct += predicted == label
+        if confidence >= threshold:
+            local += 1
+            local_correct += predicted == label
+    total = len(samples)
+    return {
+        "total": total,
+        "accuracy": correct / total if total else 0.0,
+        "coverage": local / total if total else 0.0,
+        "local_accuracy": local_correct / local if local else 0.0,
+        "latency": statistics.mean(latencies) if latencies else 0.0,
+    }
+
+
+def cross_validate(samples, folds=5, threshold=DEFAULT_THRESHOLD, seed=0):
+    """
+    samples를 folds개로 나눠, 한 조각씩 빼고 학습한 모델을 뺀 조각으로 평가합니다.
+    학습에 쓴 기사로 평가하면 정확도가 부풀려지므로 report는 이 결과를 사용합니다.
+    evaluate와 같은 형식으로 전체 조각의 결과를 합쳐 반환합니다.
+    """
+    samples = list(samples)
+    random.Random(seed).shuffle(samples)
+    categories = sorted({label for _, label in samples})
+    folds = max(2, min(folds, len(samples)))
+    total, correct, local, local_correct, latency = 0, 0.0, 0.0, 0.0, 0.0
+    for k in range(folds):
+        test = samples[k::folds]
+        train = [sample for i, sample in enumerate(samples) if i % folds != k]
+        result = evaluate(CategoryClassifier(categories).fit(train), test, threshold)
+        n = result["total"]
+        total += n
+        correct += result["accuracy"] * n
+        local += result["coverage"] * n
+        local_correct += result["local_accuracy"] * result["coverage"] * n
+        latency += result["latency"] * n
+    return {
+        "total": total,
+        "accuracy": correct / total if total else 0.0,
+        "coverage": local / total if total else 0.0,
+        "local_accuracy": local_correct / local if local else 0.0,
+        "latency": latency / total if total else 0.0,
+    }
+
+
+# LLM이 분류하는 호출의 태그. combined 모드(기본)는 요약과 분류를 analyze_news 한 번으로 요청합니다.
+LLM_CATEGORIZE_TAGS = ("categorize_news", "analyze_news")
+
+
+def llm_latency_from_traces(paths, names=LLM_CATEGORIZE_TAGS):
+    """
+    파이프라인이 저장한 trace_*.json에서 LLM 분류 호출의 지연 시간을 모읍니다.
+    """
+    latencies = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+        latencies += [
+            call["latency"]
+            for call in trace.get("llm_calls", [])
+            if call["name"] in names and not call["error"]
+        ]
+    return latencies
+
+
+def print_report(result, threshold, llm_latencies):
+    print(f"평가 기사 수: {result['total']}건 (임계값 {threshold})")
+    print(f"로컬 분류기 전체 정확도: {result['accuracy']:.1%}")
+    print(
+        f"로컬 처리 비율: {result['coverage']:.1%}, "
+        f"로컬 처리분 정확도: {result['local_accuracy']:.1%}"
+    )
+    print(f"로컬 분류 평균 시간: {result['latency'] * 1e6:.1f}µs")
+    if llm_latencies:
+        print(
+            f"LLM 분류 평균 시간: {statistics.mean(llm_latencies) * 1e3:.1f}ms "
+            f"(p50 {statistics.median(llm_latencies) * 1e3:.1f}ms, "
+            f"{len(llm_latencies)}건)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 카테고리 분류기 학습/평가")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--holdout", type=float, default=0.2, help="평가용으로 떼어 둘 비율"
+    )
+    parser.add_argument(
+        "--folds", type=int, default=5, help="report에서 교차 검증할 조각 수"
+    )
+    parser.add_argument(
+        "--trace", nargs="*", default=[], help="LLM 지연 시간을 읽을 trace_*.json"
+    )
+    args = parser.parse_args()
+
+    labeled = [
+        (record, record["category"]) for record in get_label_store().iter_records()
+    ]
+    if not labeled:
+        print("학습 데이터가 없습니다. 먼저 main.py로 LLM 분류 결과를 모아주세요.")
+        raise SystemExit(1)
+
+    if args.command == "train":
+        random.Random(0).shuffle(labeled)
+        split = int(len(labeled) * (1 - args.holdout))
+        categories = sorted({label for _, label in labeled})
+        held_out = CategoryClassifier(categories).fit(labeled[:split])
+        print_report(
+            evaluate(held_out, labeled[split:], args.threshold),
+            args.threshold,
+            llm_latency_from_traces(args.trace),
+        )
+        # 평가가 끝나면 전체 데이터로 다시 학습해서 저장합니다.
+        CategoryClassifier(categories).fit(labeled).save()
+        print(f"모델이 '{MODEL_PATH}'에 저장되었습니다.")
+    else:
+        # 저장된 모델은 전체 데이터로 학습했으므로, 교차 검증으로 정확도를 잽니다.
+        print(f"{args.folds}겹 교차 검증 결과")
+        print_report(
+            cross_validate(labeled, args.folds, args.threshold),
+            args.threshold,
+            llm_latency_from_traces(args.trace),
+        )
@@ -0,0 +1,353 @@
+"""
+처리한 기사 결과를 열(column) 단위 파일로 쌓아 두고, 전체 기록을 집계합니다.
+
+실행마다 archive/ 아래에 파트(part) 하나를 씁니다.
+이미 보관한 id는 다시 쓰지 않으므로, --resume으로 이어서 실행하거나 요약 기록을 다시
+내보내도 같은 기사가 두 번 집계되지 않습니다.
+- npy 형식: 파트 디렉터리에 열마다 .npy 파일 하나와 meta.json(행 수, 값 사전)
+- parquet 형식: 파트마다 .parquet 파일 하나 (pyarrow 패키지 필요)
+
+매체(cpName), 카테고리, 기사 유형은 값 사전 + 정수 코드로 저장(dictionary encoding)하므로
+수백만 건이어도 파일이 작고, 집계는 파트를 BATCH_ROWS 행씩 읽어 NumPy로 처리합니다.
+
+    python columnar_archive.py export        # 요약 기록(summaries_journal.jsonl)을 내보내기
+    python columnar_archive.py stats --freq month
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from shared.news_store import NewsStore
+
+from news_index import NO_TIME, parse_time
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(_DIR, "archive")
+META_FILE = "meta.json"
+
+# 값 사전으로 인코딩하는 열
+DICTIONARY_COLUMNS = ("cpName", "category", "type")
+FORMATS = ["npy", "parquet"]
+# 집계할 때 한 번에 메모리에 올리는 행 수
+BATCH_ROWS = 1 << 20
+
+# 시간 히스토그램 구간 -> numpy datetime64 단위
+FREQUENCIES = {"hour": "h", "day": "D", "month": "M", "year": "Y"}
+# createdAt은 한국 시각 기준으로 구간을 나눕니다.
+KST_OFFSET = np.timedelta64(9, "h")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("parquet 형식에는 pyarrow 패키지가 필요합니다.")
+    return pyarrow
+
+
+def encode(values):
+    """
+    문자열 목록을 (값 사전, int32 코드 배열)로 바꿉니다. 값 사전은 처음 나온 순서입니다.
+    """
+    dictionary = {}
+    codes = np.fromiter(
+        (dictionary.setdefault(value, len(dictionary)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return list(dictionary), codes
+
+
+def to_columns(news_list, results):
+    """
+    기사 목록과 같은 순서의 처리 결과(summary, category, related)를 열로 바꿉니다.
+    id, cpName/category/type(사전 코드), created_at(유닉스 시각),
+    related_count(묶인 중복 기사 수), summary_chars 열을 만들고
+    (열 이름 -> 배열, 열 이름 -> 값 사전)을 반환합니다.
+    """
+    fields = ("summary", "category", "related")
+    # 기사 전체를 펼치면 Article의 본문까지 읽게 되므로, 필요한 키만 꺼냅니다.
+    keys = ("id", "createdAt", *DICTIONARY_COLUMNS)
+    rows = [
+        {
+            **{key: news.get(key) for key in keys},
+            **{key: result.get(key) for key in fields},
+        }
+        for news, result in zip(news_list, results)
+    ]
+    columns, dictionaries = {}, {}
+    columns["id"] = np.array([row.get("id") or "" for row in rows], dtype=np.str_)
+    for name in DICTIONARY_COLUMNS:
+        dictionaries[name], columns[name] = encode([row.get(name) for row in rows])
+    times = [parse_time(row.get("createdAt")) for row in rows]
+    columns["created_at"] = np.array(
+        [NO_TIME if value is None else value for value in times], dtype=np.int64
+    )
+    columns["related_count"] = np.array(
+        [len(row.get("related") or []) for row in rows], dtype=np.int32
+    )
+    columns["summary_chars"] = np.array(
+        [len(row.get("summary") or "") for row in rows], dtype=np.int32
+    )
+    return columns, dictionaries
+
+
+def export_results(news_list, results, directory=ARCHIVE_DIR, format="npy"):
+    """
+    이번 실행의 결과를 파트 하나로 저장하고 파트 경로를 반환합니다.
+    파트는 임시 이름으로 쓴 뒤 바꾸므로, 집계 중에 반쯤 쓴 파트를 읽지 않습니다.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {format}")
+    columns, dictionaries = to_columns(news_list, results)
+    keep = new_rows(columns["id"], directory)
+    if not keep.any():
+        return None
+    columns = {key: value[keep] for key, value in columns.items()}
+    os.makedirs(directory, exist_ok=True)
+    name = f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+
+    if format == "parquet":
+        pa = _import_pyarrow()
+        arrays = {
+            key: (
+                pa.DictionaryArray.from_arrays(
+                    pa.array(value), pa.array(dictionaries[key], type=pa.string())
+                )
+                if key in dictionaries
+                else pa.array(value)
+            )
+            for key, value in columns.items()
+        }
+        path = os.path.join(directory, f"{name}.parquet")
+        pa.parquet.write_table(pa.table(arrays), f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        return path
+
+    tmp_path = os.path.join(directory, f".tmp.{name}")
+    os.makedirs(tmp_path)
+    for key, value in columns.items():
+        np.save(os.path.join(tmp_path, f"{key}.npy"), value)
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(
+            {"rows": len(columns["id"]), "dictionaries": dictionaries},
+            f,
+            ensure_ascii=False,
+        )
+    path = os.path.join(directory, name)
+    os.replace(tmp_path, path)
+    return path
+
+
+def new_rows(ids, directory=ARCHIVE_DIR):
+    """
+    아직 보관하지 않은 id의 행이면 True인 마스크를 반환합니다.
+    같은 id가 여러 번 있으면 처음 행만 남깁니다.
+    """
+    keep = np.zeros(len(ids), dtype=bool)
+    keep[np.unique(ids, return_index=True)[1]] = True
+    for arrays, _ in iter_batches(["id"], directory):
+        keep &= ~np.isin(ids, arrays["id"])
+    return keep
+
+
+def list_parts(directory=ARCHIVE_DIR):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith("part-")
+    )
+
+
+def iter_batches(columns, directory=ARCHIVE_DIR, batch_rows=BATCH_ROWS):
+    """
+    모든 파트에서 필요한 열만 batch_rows 행씩 읽어 (열 배열, 값 사전)을 돌려줍니다.
+    npy 파트는 메모리 맵으로 열어서 읽는 구간만 메모리에 올립니다.
+    """
+    for part in list_parts(directory):
+        if part.endswith(".parquet"):
+            pa = _import_pyarrow()
+            wanted = [name for name in columns if name in DICTIONARY_COLUMNS]
+            parquet_file = pa.parquet.ParquetFile(part, read_dictionary=wanted)
+            for batch in parquet_file.iter_batches(batch_rows, columns=list(columns)):
+                arrays, dictionaries = {}, {}
+                for name in columns:
+                    column = batch.column(name)
+                    if name in DICTIONARY_COLUMNS:
+                        arrays[name] = column.indices.to_numpy(zero_copy_only=False)
+                        dictionaries[name] = column.dictionary.to_pylist()
+                    else:
+                        arrays[name] = column.to_numpy(zero_copy_only=False)
+                yield arrays, dictionaries
+            continue
+
+        with open(os.path.join(part, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        mapped = {
+            name: np.load(os.path.join(part, f"{name}.npy"), mmap_mode="r")
+            for name in columns
+        }
+        for start in range(0, meta["rows"], batch_rows):
+            yield (
+                {
+                    name: np.asarray(array[start : start + batch_rows])
+                    for name, array in mapped.items()
+                },
+                meta["dictionaries"],
+            )
+
+
+def _in_range(created_at, start, end):
+    mask = created_at != NO_TIME
+    if start is not None:
+        mask &= created_at >= parse_time(start)
+    if end is not None:
+        mask &= created_at < parse_time(end)
+    return mask
+
+
+def time_buckets(created_at, freq="day"):
+    """
+    유닉스 시각 배열을 한국 시각 기준 구간(예: 2025-09-27, 2025-09) 배열로 바꿉니다.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"지원하지 않는 구간입니다: {freq}")
+    local = created_at.astype("datetime64[s]") + KST_OFFSET
+    return local.astype(f"datetime64[{FREQUENCIES[freq]}]")
+
+
+def count_by(field, directory=ARCHIVE_DIR, start=None, end=None):
+    """
+    값별 기사 수를 많은 순서로 반환합니다. (예: count_by("category"))
+    """
+    counts = Counter()
+    for arrays, dictionaries in iter_batches((field, "created_at"), directory):
+        codes = arrays[field]
+        if start is not None or end is not None:
+            codes = codes[_in_range(arrays["created_at"], start, end)]
+        for code, count in enumerate(np.bincount(codes)):
+            if count:
+                counts[dictionaries[field][code]] += int(count)
+    return dict(counts.most_common())
+
+
+def time_histogram(freq="day", by=None, directory=ARCHIVE_DIR, start=None, end=None):
+    """
+    구간별 기사 수를 시간 순서로 반환합니다.
+    by에 열 이름을 주면 {구간: {값: 기사 수}} 형태로 나눠서 셉니다.
+    """
+    columns = ("created_at",) if by is None else ("created_at", by)
+    counts = defaultdict(Counter)
+    for arrays, dictionaries in iter_batches(columns, directory):
+        mask = _in_range(arrays["created_at"], start, end)
+        buckets = time_buckets(arrays["created_at"][mask], freq)
+        if by is None:
+            keys, values = np.unique(buckets, return_counts=True)
+            for key, value in zip(keys, values):
+                counts[str(key)][None] += int(value)
+            continue
+        # (구간, 값 코드) 쌍을 정수 하나로 합쳐서 한 번에 셉니다.
+        codes = arrays[by][mask]
+        width = len(dictionaries[by])
+        units, bucket_index = np.unique(buckets, return_inverse=True)
+        keys, values = np.unique(bucket_index * width + codes, return_counts=True)
+        for key, value in zip(keys, values):
+            bucket, code = divmod(int(key), width)
+            counts[str(units[bucket])][dictionaries[by][code]] += int(value)
+
+    if by is None:
+        return {bucket: counts[bucket][None] for bucket in sorted(counts)}
+    return {bucket: dict(counts[bucket].most_common()) for bucket in sorted(counts)}
+
+
+def duplicate_rate_trend(freq="day", directory=ARCHIVE_DIR, start=None, end=None):
+    """
+    구간별로 수집한 기사 중 다른 기사와 묶여 요약하지 않은 기사의 비율을 반환합니다.
+    {구간: {"articles": 수집 기사 수, "duplicates": 묶인 기사 수, "rate": 비율}}
+    """
+    totals = defaultdict(lambda: np.zeros(2, dtype=np.int64))
+    for arrays, _ in iter_batches(("created_at", "related_count"), directory):
+        mask = _in_range(arrays["created_at"], start, end)
+        buckets = time_buckets(arrays["created_at"][mask], freq)
+        units, bucket_index = np.unique(buckets, return_inverse=True)
+        representatives = np.bincount(bucket_index, minlength=len(units))
+        duplicates = np.bincount(
+            bucket_index,
+            weights=arrays["related_count"][mask],
+            minlength=len(units),
+        ).astype(np.int64)
+        for unit, kept, folded in zip(units, representatives, duplicates):
+            totals[str(unit)] += (kept + folded, folded)
+
+    trend = {}
+    for bucket in sorted(totals):
+        articles, duplicates = (int(value) for value in totals[bucket])
+        trend[bucket] = {
+            "articles": articles,
+            "duplicates": duplicates,
+            "rate": duplicates / articles if articles else 0.0,
+        }
+    return trend
+
+
+def load_journal_results():
+    """
+    요약 기록(summaries_journal.jsonl)과 기사 저장소(news_data2.jsonl)를 id로 맞춰
+    (기사 목록, 결과 목록)을 만듭니다. 이미 처리한 결과를 처음 내보낼 때 사용합니다.
+    """
+    journal = NewsStore(os.path.join(_DIR, "summaries_journal.jsonl"))
+    store = NewsStore(os.path.join(_DIR, "news_data2.jsonl"))
+    if not os.path.exists(journal.path):
+        return [], []
+    news_list, results = [], []
+    for result in journal.iter_records():
+        news = store.get(result["id"]) if os.path.exists(store.path) else None
+        news_list.append(news or {"id": result["id"], "title": result.get("title")})
+        results.append(result)
+    return news_list, results
+
+
+def print_stats(freq, directory=ARCHIVE_DIR):
+    print("카테고리별 기사 수:", count_by("category", directory))
+    top_publishers = list(count_by("cpName", directory).items())[:10]
+    print("매체별 기사 수 (상위 10):", dict(top_publishers))
+    print(f"구간별 기사 수 ({freq}):")
+    for bucket, count in time_histogram(freq, directory=directory).items():
+        print(f"  {bucket}: {count}")
+    print(f"구간별 중복 기사 비율 ({freq}):")
+    for bucket, trend in duplicate_rate_trend(freq, directory).items():
+        print(
+            f"  {bucket}: {trend['rate']:.1%} "
+            f"({trend['duplicates']}/{trend['articles']})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="처리 결과 열 단위 보관/집계")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="요약 기록을 파트로 내보내기")
+    export_parser.add_argument("--format", choices=FORMATS, default="npy")
+    stats_parser = subparsers.add_parser("stats", help="보관한 전체 기록 집계")
+    stats_parser.add_argument("--freq", choices=list(FREQUENCIES), default="day")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        news_list, results = load_journal_results()
+        path = export_results(news_list, results, format=args.format)
+        if path is None:
+            print("새로 내보낼 결과가 없습니다.")
+        else:
+            print(f"결과를 '{path}'에 저장했습니다.")
+    else:
+        start = time.perf_counter()
+        print_stats(args.freq)
+        print(f"집계 시간: {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,157 @@
+from shared.tracing import tracer
+
+from llm_engine import estimate_tokens
+
+# 작업별로 LLM에 보낼 본문의 최대 토큰 수
+# - categorize: 분류는 리드 문단만 보면 충분합니다.
+# - summarize: 조각별로 요약(map)한 본문을 다시 요약(reduce)할 때 합친 조각 요약의 최대 크기
+DEFAULT_TOKEN_BUDGETS = {
+    "categorize": 300,
+    "summarize": 2000,
+}
+
+
+# 조각 요약 자체가 100~200토큰 정도라, 이보다 작은 예산은 나눠 요약해도 맞출 수 없습니다.
+MIN_TOKEN_BUDGETS = {
+    "categorize": 50,
+    "summarize": 300,
+}
+# 나눠서 요약하는 최대 횟수. 그래도 예산을 넘으면 잘라서 보냅니다.
+MAX_CONDENSE_PASSES = 3
+# 나눠서 요약하면 본문 전체를 조각으로 한 번 더 보내고 조각 요약 출력까지 생기므로
+# 본문을 그대로 보낼 때보다 토큰이 늘어납니다. 그래서 모델이 한 번에 받을 수 있는
+# 입력 한도를 넘는 본문만 나눠서 요약하고, 나머지는 그대로 보냅니다.
+MAX_INPUT_TOKENS = 100_000
+
+
+def get_token_budgets(token_budgets=None):
+    return {**DEFAULT_TOKEN_BUDGETS, **(token_budgets or {})}
+
+
+def split_paragraphs(text):
+    """
+    extract_article_text가 줄 단위로 정리한 본문을 문단 리스트로 나눕니다.
+    """
+    return [line.strip() for line in (text or "").split("\n") if line.strip()]
+
+
+def truncate_to_budget(text, budget):
+    """
+    앞 문단부터 budget 토큰을 넘지 않는 만큼만 남깁니다.
+    첫 문단이 이미 budget보다 길면 글자 수로 자릅니다.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    lines, used = [], 0
+    for paragraph in split_paragraphs(text):
+        tokens = estimate_tokens(paragraph)
+        if used + tokens > budget:
+            break
+        lines.append(paragraph)
+        used += tokens
+    if not lines:
+        # estimate_tokens는 2글자를 1토큰으로 계산합니다.
+        return text[: budget * 2]
+    return "\n".join(lines)
+
+
+def chunk_paragraphs(text, budget):
+    """
+    본문을 budget 토큰 이하의 조각들로 나눕니다. 문단 중간에서는 자르지 않으며,
+    budget보다 긴 문단은 글자 수로 나눕니다.
+    """
+    chunks, lines, used = [], [], 0
+    for paragraph in split_paragraphs(text):
+        pieces = [
+            paragraph[i : i + budget * 2] for i in range(0, len(paragraph), budget * 2)
+        ]
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if lines and used + tokens > budget:
+                chunks.append("\n".join(lines))
+                lines, used = [], 0
+            lines.append(piece)
+            used += tokens
+    if lines:
+        chunks.append("\n".join(lines))
+    return chunks
+
+
+def prepare_for_categorize(content, budget=DEFAULT_TOKEN_BUDGETS["categorize"]):
+    """
+    분류용으로 리드 문단만 남기고, 줄어든 토큰 수를 기록합니다.
+    """
+    lead = truncate_to_budget(content or "", budget)
+    record_tokens("categorize", content, lead)
+    return lead
+
+
+def needs_condense(content):
+    return estimate_tokens(content) > MAX_INPUT_TOKENS
+
+
+def finish_condense(original, content, budget):
+    """
+    나눠서 요약한 뒤에도 budget을 넘는 본문은 잘라 내고, 줄어든 토큰 수를 기록합니다.
+    """
+    content = truncate_to_budget(content, budget)
+    record_tokens("summarize", original, content)
+    return content
+
+
+def record_tokens(task, original, sent):
+    tracer.incr(f"content_prep.{task}.original_tokens", estimate_tokens(original))
+    tracer.incr(f"content_prep.{task}.sent_tokens", estimate_tokens(sent))
+
+
+def record_map_tokens(chunks, summaries):
+    """
+    조각 요약(map) 호출에 보낸 조각과 받은 요약의 토큰 수를 기록합니다.
+    보낸 조각은 요약 작업의 입력 토큰에 포함해서 계산합니다.
+    """
+    tracer.incr("content_prep.summarize.map_input_tokens", estimate_tokens(*chunks))
+    tracer.incr("content_prep.summarize.map_output_tokens", estimate_tokens(*summaries))
+
+
+def token_savings():
+    """
+    작업별 {원래 토큰 수, 보낸 토큰 수, 조각 요약 입력/출력 토큰 수, 절감한 토큰 수}를
+    반환합니다. 보낸 토큰 수에는 조각 요약(map) 입력이 포함되고, 절감한 토큰 수에서는
+    조각 요약 출력까지 뺍니다. 나눠서 요약해 토큰이 늘었으면 음수가 됩니다.
+    """
+    savings = {}
+    counters = tracer.counters
+    for task in DEFAULT_TOKEN_BUDGETS:
+        original = counters[f"content_prep.{task}.original_tokens"]
+        map_input = counters[f"content_prep.{task}.map_input_tokens"]
+        map_output = counters[f"content_prep.{task}.map_output_tokens"]
+        sent = counters[f"content_prep.{task}.sent_tokens"] + map_input
+        if original:
+            savings[task] = {
+                "original": original,
+                "sent": sent,
+                "map_input": map_input,
+                "map_output": map_output,
+                "saved": original - sent - map_output,
+            }
+    return savings
+
+
+def print_token_savings():
+    for task, saving in token_savings().items():
+        detail = ""
+        if saving["map_input"]:
+            detail = (
+                f" (조각 요약 입력 {saving['map_input']} 포함, "
+                f"조각 요약 출력 {saving['map_output']})"
+            )
+        saved = saving["saved"]
+        print(
+            f"{task} 입력 토큰: {saving['original']} -> {saving['sent']}{detail}, "
+            f"{abs(saved)} {'절감' if saved >= 0 else '증가'} "
+            f"({abs(saved) / saving['original']:.0%})"
+        )
+    if tracer.counters["content_prep.chunked_articles"]:
+        print(
+            f"긴 기사 나눠서 요약: {tracer.counters['content_prep.chunked_articles']}건"
+        )
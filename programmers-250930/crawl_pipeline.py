@@ -0,0 +1,153 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from shared.extractor import extract_article_body
+
+from fetcher import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PER_HOST,
+    create_async_client,
+    fetch_html,
+)
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class StageStats:
+    """
+    단계별 처리 건수, 작업 시간, 처리량을 기록합니다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.failed = 0
+        self.bytes = 0
+        self.busy = 0.0
+        self.started = None
+        self.finished = None
+
+    def record(self, elapsed, size=0, ok=True):
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now - elapsed
+        self.finished = now
+        self.count += 1
+        self.failed += 0 if ok else 1
+        self.bytes += size
+        self.busy += elapsed
+
+    @property
+    def wall_time(self):
+        if self.started is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def throughput(self):
+        return self.count / self.wall_time if self.wall_time else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.name:<10} {self.count:>6}건 (실패 {self.failed}) "
+            f"{self.wall_time:>7.2f}s  {self.throughput:>8.1f}건/s  "
+            f"작업시간 합계 {self.busy:>7.2f}s  {self.bytes / 1024 / 1024:>7.1f}MB"
+        )
+
+
+def parse_article(html_content):
+    """
+    프로세스 풀에서 실행되는 파싱 작업입니다. (pickle 가능하도록 모듈 최상위에 둡니다)
+    """
+    return extract_article_body(html_content)
+
+
+async def crawl_articles(
+    urls,
+    concurrency=DEFAULT_CONCURRENCY,
+    per_host=DEFAULT_PER_HOST,
+    workers=None,
+    queue_size=DEFAULT_QUEUE_SIZE,
+):
+    """
+    기사 HTML 다운로드와 본문 파싱을 나눠서 실행하는 파이프라인입니다.
+
+    - 다운로드 단계: concurrency개의 코루틴이 하나의 AsyncClient로 HTML을 받습니다.
+    - 파싱 단계: ProcessPoolExecutor가 여러 코어에서 본문을 추출합니다.
+    - 두 단계 사이의 큐는 queue_size로 크기가 제한되어,
+      파싱이 밀리면 다운로드도 자동으로 속도를 늦춥니다.
+
+    urls와 같은 순서로 본문 텍스트(실패 시 None) 리스트와 단계별 통계를 반환합니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(urls)
+    url_queue = asyncio.Queue()
+    html_queue = asyncio.Queue(maxsize=queue_size)
+    download_stats = StageStats("download")
+    parse_stats = StageStats("parse")
+    host_semaphores = {}
+
+    for index, url in enumerate(urls):
+        url_queue.put_nowait((index, url))
+
+    async def downloader(client):
+        while True:
+            try:
+                index, url = url_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if not url:
+                continue
+            host = urlsplit(url).netloc
+            semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(per_host))
+            start = time.perf_counter()
+            async with semaphore:
+                html_content = await fetch_html(client, url)
+            download_stats.record(
+                time.perf_counter() - start,
+                size=len(html_content or ""),
+                ok=html_content is not None,
+            )
+            if html_content is not None:
+                # 큐가 가득 차 있으면 파싱 단계가 따라올 때까지 기다립니다.
+                await html_queue.put((index, html_content))
+
+    async def parser(loop, pool):
+        while True:
+            item = await html_queue.get()
+            if item is None:
+                return
+            index, html_content = item
+            start = time.perf_counter()
+            try:
+                results[index] = await loop.run_in_executor(
+                    pool, parse_article, html_content
+                )
+            except Exception as e:
+                # 한 기사의 파싱 오류로 파서가 멈추면 큐가 막혀 다운로드까지 멈춥니다.
+                print(f"본문 추출 실패 (URL: {urls[index]}): {e!r}")
+            parse_stats.record(
+                time.perf_counter() - start,
+                size=len(html_content),
+                ok=results[index] is not None,
+            )
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with create_async_client(concurrency=concurrency) as client:
+            parsers = [asyncio.create_task(parser(loop, pool)) for _ in range(workers)]
+            await asyncio.gather(*(downloader(client) for _ in range(concurrency)))
+            for _ in parsers:
+                await html_queue.put(None)
+            await asyncio.gather(*parsers)
+
+    return results, [download_stats, parse_stats]
+
+
+def print_stage_stats(stats):
+    print("단계별 처리량")
+    for stage in stats:
+        print(f"  {stage}")
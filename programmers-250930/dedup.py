@@ -0,0 +1,158 @@
+import hashlib
+import re
+from collections import defaultdict
+
+from article import with_fields
+
+# MinHash 서명 길이 = BANDS * ROWS
+# 밴드 16개 x 행 4개이면 자카드 유사도 0.5 전후부터 후보로 잡힙니다.
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+DEFAULT_THRESHOLD = 0.5
+SHINGLE_SIZE = 3
+# 본문은 앞부분만 사용합니다. 같은 기사를 옮겨 실은 경우 리드 문단이 거의 같습니다.
+LEAD_CHARS = 400
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# 빈 칸(해당 구간에 shingle이 하나도 없음)을 나타내는 값
+_EMPTY = 1 << 64
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    공백과 문장부호를 지운 문자열에서 size글자 단위 조각(shingle) 집합을 만듭니다.
+    한국어는 띄어쓰기가 매체마다 달라서 단어보다 글자 단위가 잘 맞습니다.
+    """
+    text = _NON_WORD.sub("", (text or "").lower())
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def article_shingles(news):
+    content = news.get("content") or news.get("summary") or ""
+    return shingles(news.get("title")) | shingles(content[:LEAD_CHARS])
+
+
+def minhash_signature(shingle_set):
+    """
+    shingle 집합의 MinHash 서명(NUM_PERM개의 정수 튜플)을 계산합니다.
+
+    해시 함수를 NUM_PERM개 쓰는 대신, 해시값 하나를 NUM_PERM개 구간으로 나눠
+    구간마다 최솟값을 고릅니다. (one permutation hashing)
+    shingle마다 해시를 한 번만 계산하므로 기사가 많아도 빠릅니다.
+    """
+    if not shingle_set:
+        return None
+    signature = [_EMPTY] * NUM_PERM
+    for shingle in shingle_set:
+        h = int.from_bytes(
+            hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big"
+        )
+        slot, value = h % NUM_PERM, h // NUM_PERM
+        if value < signature[slot]:
+            signature[slot] = value
+    return tuple(signature)
+
+
+def estimate_similarity(a, b):
+    """
+    두 MinHash 서명이 일치하는 비율로 자카드 유사도를 추정합니다.
+    양쪽 모두 비어 있는 구간은 계산에서 뺍니다.
+    """
+    used = [(x, y) for x, y in zip(a, b) if x != _EMPTY or y != _EMPTY]
+    if not used:
+        return 0.0
+    return sum(x == y for x, y in used) / len(used)
+
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def cluster_articles(news_list, threshold=DEFAULT_THRESHOLD):
+    """
+    제목과 본문이 거의 같은 기사들을 묶습니다.
+
+    LSH로 서명의 밴드가 하나라도 같은 쌍만 후보로 고르고,
+    추정 유사도가 threshold 이상인 쌍을 같은 묶음으로 합칩니다.
+    기사 순서를 유지한 인덱스 묶음 리스트를 반환합니다.
+    """
+    signatures = [minhash_signature(article_shingles(news)) for news in news_list]
+    parents = list(range(len(news_list)))
+
+    buckets = defaultdict(list)
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(BANDS):
+            buckets[(band, signature[band * ROWS : (band + 1) * ROWS])].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        # 같은 버킷 안에서는 이미 만든 묶음마다 하나씩만 비교합니다.
+        heads = []
+        for j in members:
+            for i in heads:
+                if _find(parents, i) == _find(parents, j) or (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if estimate_similarity(signatures[i], signatures[j]) >= threshold:
+                    parents[_find(parents, j)] = _find(parents, i)
+            if all(_find(parents, i) != _find(parents, j) for i in heads):
+                heads.append(j)
+
+    clusters = defaultdict(list)
+    for i in range(len(news_list)):
+        clusters[_find(parents, i)].append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def choose_representative(news_list, members):
+    """
+    묶음에서 요약할 대표 기사를 고릅니다.
+    다른 매체가 많이 받아 쓴 기사(mediaPickDuplicateCount)를 우선하고,
+    같으면 본문이 긴 기사, 그래도 같으면 먼저 나온 기사를 고릅니다.
+    """
+    return max(
+        members,
+        key=lambda i: (
+            news_list[i].get("mediaPickDuplicateCount") or 0,
+            len(news_list[i].get("content") or ""),
+            -i,
+        ),
+    )
+
+
+def related_link(news):
+    return {
+        "title": news.get("title"),
+        "url": news.get("pcUrl") or news.get("url"),
+        "cpName": news.get("cpName"),
+    }
+
+
+def deduplicate_articles(news_data, threshold=DEFAULT_THRESHOLD):
+    """
+    묶음마다 대표 기사 하나만 남기고, 나머지는 대표 기사의 'related'에 링크로 붙입니다.
+    대표 기사는 묶음에서 처음 나온 기사의 위치에 놓입니다.
+    (대표 기사 리스트, 묶음 리스트)를 반환합니다.
+    """
+    news_list = list(news_data)
+    clusters = cluster_articles(news_list, threshold)
+    representatives = []
+    for members in clusters:
+        leader = choose_representative(news_list, members)
+        representatives.append(
+            with_fields(
+                news_list[leader],
+                related=[related_link(news_list[i]) for i in members if i != leader],
+            )
+        )
+    return representatives, clusters
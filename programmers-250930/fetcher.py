@@ -0,0 +1,80 @@
+import asyncio
+import random
+
+from shared.tracing import tracer
+
+# 동시에 진행할 전체 요청 수와 호스트(도메인)별 최대 연결 수
+DEFAULT_CONCURRENCY = 20
+DEFAULT_PER_HOST = 8
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# 재시도할 가치가 있는 HTTP 상태 코드 (요청 과다, 일시적인 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def create_async_client(concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """
+    연결 풀을 공유하는 httpx.AsyncClient를 생성합니다.
+    같은 호스트로 가는 요청은 TCP/TLS 연결을 재사용합니다.
+    """
+    # httpx import에 시간이 걸려, 실제로 수집할 때 불러옵니다.
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(timeout),
+        follow_redirects=True,
+        event_hooks={"request": [count_request]},
+    )
+
+
+async def count_request(request):
+    tracer.incr("http.requests")
+
+
+async def count_connection(event_name, info):
+    # 새 TCP 연결을 맺을 때만 증가하므로 요청 수와 비교하면 연결 재사용률을 알 수 있습니다.
+    if event_name == "connection.connect_tcp.complete":
+        tracer.incr("http.new_connections")
+
+
+def _backoff_delay(attempt, backoff):
+    """
+    지수 백오프에 지터를 더한 대기 시간(초)을 계산합니다.
+    """
+    return backoff * (2**attempt) * (0.5 + random.random())
+
+
+async def fetch_html(client, url, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """
+    주어진 URL의 HTML을 가져옵니다.
+    네트워크 오류나 일시적인 서버 오류는 백오프 후 재시도하고,
+    끝내 실패하면 None을 반환합니다.
+    """
+    import httpx
+
+    for attempt in range(retries + 1):
+        try:
+            response = await client.get(url, extensions={"trace": count_connection})
+            if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                await asyncio.sleep(_backoff_delay(attempt, backoff))
+                continue
+            response.raise_for_status()
+            return response.text
+        except httpx.HTTPStatusError as e:
+            print(f"기사 콘텐츠를 가져오는 중 오류 발생 (URL: {url}): {e}")
+            return None
+        except httpx.RequestError as e:
+            if attempt < retries:
+                await asyncio.sleep(_backoff_delay(attempt, backoff))
+                continue
+            print(f"기사 콘텐츠를 가져오는 중 오류 발생 (URL: {url}): {e}")
+            return None
+    return None
+
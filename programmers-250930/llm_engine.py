@@ -0,0 +1,65 @@
+import asyncio
+import math
+
+from shared.llm_scheduler import BATCH
+
+DEFAULT_CONCURRENCY = 8
+
+
+def estimate_tokens(*texts):
+    """
+    문자열 길이로 대략적인 토큰 수를 추정합니다.
+    한국어는 대략 2글자당 1토큰 정도로 계산합니다.
+    """
+    return sum(math.ceil(len(text or "") / 2) for text in texts)
+
+
+class LLMEngine:
+    """
+    LCEL 체인을 동시에 실행하는 비동기 실행기입니다.
+    세마포어로 이 실행기의 동시 실행 수를 제한하고,
+    공유 LLMScheduler로 분당 한도, 한도 초과 시 재시도, 우선순위를 처리합니다.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, scheduler=None, priority=BATCH):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.scheduler = scheduler
+        self.priority = priority
+
+    async def run(self, chain, inputs, tokens=None):
+        """
+        체인 하나를 실행합니다. tokens가 없으면 입력 문자열로 추정합니다.
+        """
+        if tokens is None:
+            tokens = estimate_tokens(*(str(v) for v in inputs.values()))
+        async with self.semaphore:
+            if self.scheduler is None:
+                return await chain.ainvoke(inputs)
+            return await self.scheduler.run(
+                lambda: chain.ainvoke(inputs), tokens, self.priority
+            )
+
+    async def map(self, chain, inputs_list):
+        """
+        같은 체인을 여러 입력으로 실행하고, 입력 순서대로 결과를 반환합니다.
+        """
+        return await asyncio.gather(
+            *(self.run(chain, inputs) for inputs in inputs_list)
+        )
+
+    async def stream(self, chain, inputs, tokens=None):
+        """
+        체인을 astream으로 실행하며 응답 조각을 생성되는 대로 돌려줍니다.
+        스트리밍이 끝날 때까지 동시 실행 슬롯 하나를 사용합니다.
+        """
+        if tokens is None:
+            tokens = estimate_tokens(*(str(v) for v in inputs.values()))
+        async with self.semaphore:
+            if self.scheduler is None:
+                chunks = chain.astream(inputs)
+            else:
+                chunks = self.scheduler.stream(
+                    lambda: chain.astream(inputs), tokens, self.priority
+                )
+            async for chunk in chunks:
+                yield chunk
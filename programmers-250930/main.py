@@ -1,33 +1,145 @@
-import httpx
+import argparse
+import asyncio
+import functools
+import sys
 import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from bs4 import BeautifulSoup
+from itertools import islice
+from typing import Literal
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
-from langchain_core.prompts import ChatPromptTemplate
+
+from shared.extractor import NOT_FOUND_MESSAGE, extract_article_body
+from shared.llm_cache import LLMCache, template_text
+from shared.llm_scheduler import get_scheduler
+from shared.model_registry import get_chat_model
+from shared.news_store import NewsStore
+from shared.tracing import tracer
+
+from article import to_articles
+from category_classifier import (
+    DEFAULT_THRESHOLD,
+    CategoryClassifier,
+    get_label_store,
+    make_label,
+)
+from content_prep import (
+    DEFAULT_TOKEN_BUDGETS,
+    MAX_CONDENSE_PASSES,
+    MIN_TOKEN_BUDGETS,
+    chunk_paragraphs,
+    finish_condense,
+    get_token_budgets,
+    needs_condense,
+    prepare_for_categorize,
+    print_token_savings,
+    record_map_tokens,
+    record_tokens,
+)
+from crawl_pipeline import crawl_articles, print_stage_stats
+from dedup import deduplicate_articles
+from llm_engine import DEFAULT_CONCURRENCY, LLMEngine, estimate_tokens
 
 load_dotenv()
-llm = init_chat_model("gemini-2.5-flash", model_provider="google_genai")
+LLM_PROVIDER = "google_genai"
+LLM_MODEL = "gemini-2.5-flash"
+
+
+def get_llm():
+    """
+    공유 채팅 모델을 반환합니다. 처음 LLM이 필요할 때 만들어집니다.
+    """
+    return get_chat_model(
+        LLM_MODEL, model_provider=LLM_PROVIDER, callbacks=[tracer.callback]
+    )
+
+
+# 이미 처리한 기사는 다시 LLM을 호출하지 않도록 결과를 파일에 캐시합니다.
+# 캐시 파일(SQLite)은 처음 사용할 때 엽니다.
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache(
+                os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"
+                )
+            )
+        return _llm_cache
+
+
+def tagged_chain(prompt, model, name):
+    """
+    호출 기록(tracing)에서 구분할 수 있도록 체인에 이름 태그를 붙입니다.
+    """
+    return (prompt | model).with_config(tags=[name])
+
+
+def get_cache_key(prompt, title, content):
+    return get_llm_cache().make_key(LLM_MODEL, template_text(prompt), title, content)
+
+
+def cached_invoke(prompt, chain, title, content, to_value):
+    """
+    캐시에 결과가 있으면 그대로 반환하고, 없으면 체인을 실행한 뒤 저장합니다.
+    to_value는 체인 결과를 캐시에 저장할 값으로 변환합니다.
+    """
+    key = get_cache_key(prompt, title, content)
+    cached = get_llm_cache().get(key)
+    if cached is not None:
+        return cached
+    inputs = {"title": title, "content": content}
+    value = to_value(
+        get_scheduler(LLM_PROVIDER).run_sync(
+            lambda: chain.invoke(inputs), estimate_tokens(title, content)
+        )
+    )
+    if value is not None:
+        get_llm_cache().set(key, value)
+    return value
+
+
+async def acached_invoke(engine, prompt, chain, inputs, to_value):
+    key = get_cache_key(prompt, inputs["title"], inputs["content"])
+    cached = get_llm_cache().get(key)
+    if cached is not None:
+        return cached
+    value = to_value(await engine.run(chain, inputs))
+    if value is not None:
+        get_llm_cache().set(key, value)
+    return value
+
+
+def message_content(message):
+    return message.content
+
+
+def analysis_to_dict(analysis):
+    # 구조화 출력을 파싱하지 못하면 with_structured_output이 None을 반환합니다.
+    return analysis.model_dump() if analysis is not None else None
 
 
 def extract_article_text(html_content):
     """
     HTML에서 data-tiara-layer="article_body" 속성을 가진 div의 텍스트를 추출
+    설치된 파서 중 가장 빠른 것(selectolax > lxml > bs4)을 사용합니다.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    article_div = soup.find("div", attrs={"data-tiara-layer": "article_body"})
-    if article_div:
-        text = article_div.get_text(strip=True, separator="\n")
-        lines = [line.strip() for line in text.split("\n") if line.strip() != ""]
-        clean_text = "\n".join(lines)
-        return clean_text
-    else:
-        return "article_body를 찾을 수 없습니다."
+    clean_text = extract_article_body(html_content)
+    if clean_text is None:
+        return NOT_FOUND_MESSAGE
+    return clean_text
+
 
+def get_summarize_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
 
-def summarize_news(title, content):
-    prompt = ChatPromptTemplate(
+    return ChatPromptTemplate(
         [
             (
                 "system",
@@ -37,9 +149,102 @@ def summarize_news(title, content):
             ("human", "제목: {title}\n내용: {content}\n\n 주어진 뉴스를 요약해주세요."),
         ]
     )
-    chain = prompt | llm
-    result = chain.invoke({"title": title, "content": content})
-    return result.content
+
+
+def get_chunk_summarize_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 요약 전문가 입니다. "
+                "주어진 내용은 긴 뉴스 기사의 일부입니다. "
+                "이 부분의 핵심 사실만 간결하게 요약해주세요.",
+            ),
+            ("human", "제목: {title}\n내용 일부: {content}\n\n 주어진 부분을 요약해주세요."),
+        ]
+    )
+
+
+def condense_content(title, content, budget):
+    """
+    (map) 모델 입력 한도(MAX_INPUT_TOKENS)를 넘는 본문은 budget 토큰 이하의 문단 조각으로
+    나눠 각각 요약하고, 조각 요약을 이어 붙여 반환합니다. 나머지 본문은 그대로 반환합니다.
+    반환된 본문을 다시 요약하는 것이 reduce 단계입니다.
+    최대 MAX_CONDENSE_PASSES번 나눠 요약하고, 더 줄어들지 않거나 그래도 길면 잘라 냅니다.
+    """
+    original = content = content or ""
+    if not needs_condense(content):
+        # 나눠서 요약하면 토큰이 오히려 늘어나므로 그대로 보냅니다.
+        record_tokens("summarize", content, content)
+        return content
+
+    tracer.incr("content_prep.chunked_articles")
+    prompt = get_chunk_summarize_prompt()
+    chain = tagged_chain(prompt, get_llm(), "summarize_chunk")
+    for _ in range(MAX_CONDENSE_PASSES):
+        chunks = chunk_paragraphs(content, budget)
+        summaries = [
+            cached_invoke(prompt, chain, title, chunk, message_content)
+            for chunk in chunks
+        ]
+        record_map_tokens(chunks, summaries)
+        condensed = "\n".join(summaries)
+        if estimate_tokens(condensed) >= estimate_tokens(content):
+            break
+        content = condensed
+        if estimate_tokens(content) <= budget:
+            break
+    return finish_condense(original, content, budget)
+
+
+async def acondense_content(engine, title, content, budget):
+    """
+    condense_content의 비동기 버전입니다. 조각 요약을 동시에 요청합니다.
+    """
+    original = content = content or ""
+    if not needs_condense(content):
+        record_tokens("summarize", content, content)
+        return content
+
+    tracer.incr("content_prep.chunked_articles")
+    prompt = get_chunk_summarize_prompt()
+    chain = tagged_chain(prompt, get_llm(), "summarize_chunk")
+    for _ in range(MAX_CONDENSE_PASSES):
+        chunks = chunk_paragraphs(content, budget)
+        summaries = await asyncio.gather(
+            *(
+                acached_invoke(
+                    engine,
+                    prompt,
+                    chain,
+                    {"title": title, "content": chunk},
+                    message_content,
+                )
+                for chunk in chunks
+            )
+        )
+        record_map_tokens(chunks, summaries)
+        condensed = "\n".join(summaries)
+        if estimate_tokens(condensed) >= estimate_tokens(content):
+            break
+        content = condensed
+        if estimate_tokens(content) <= budget:
+            break
+    return finish_condense(original, content, budget)
+
+
+def summarize_news(title, content, token_budgets=None):
+    prompt = get_summarize_prompt()
+    budget = get_token_budgets(token_budgets)["summarize"]
+    return cached_invoke(
+        prompt,
+        tagged_chain(prompt, get_llm(), "summarize_news"),
+        title,
+        condense_content(title, content, budget),
+        message_content,
+    )
 
 
 NEWS_CATEGORIES: list[str] = [
@@ -55,8 +260,10 @@ NEWS_CATEGORIES: list[str] = [
 ]
 
 
-def categorize_news(title, content):
-    prompt = ChatPromptTemplate(
+def get_categorize_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
         [
             (
                 "system",
@@ -66,33 +273,326 @@ def categorize_news(title, content):
             ("human", "제목: {title}\n내용: {content}\n\n 주어진 뉴스를 분류합니다."),
         ]
     )
-    chain = prompt | llm
-    result = chain.invoke({"title": title, "content": content})
-    return result.content
 
 
-def summarize_and_categorize(count, news_data):
+def categorize_news(title, content, token_budgets=None):
+    prompt = get_categorize_prompt()
+    budget = get_token_budgets(token_budgets)["categorize"]
+    return cached_invoke(
+        prompt,
+        tagged_chain(prompt, get_llm(), "categorize_news"),
+        title,
+        prepare_for_categorize(content, budget),
+        message_content,
+    )
+
+
+@functools.cache
+def get_analysis_schema():
+    """
+    요약과 분류를 한 번의 호출로 받기 위한 구조화 출력 스키마
+    pydantic import에 시간이 걸리므로 처음 필요할 때 만듭니다.
+    """
+    from pydantic import BaseModel, Field, field_validator
+
+    class NewsAnalysis(BaseModel):
+        summary: str = Field(
+            description="뉴스의 핵심을 간결하게 정리한 두세 문장의 요약"
+        )
+        category: Literal[*NEWS_CATEGORIES] = Field(
+            description=f"다음 중 하나의 카테고리: {','.join(NEWS_CATEGORIES)}"
+        )
+
+        @field_validator("category", mode="before")
+        @classmethod
+        def check_category(cls, value):
+            # 공백이 섞이거나 목록에 없는 값이 오면 '기타'로 처리합니다.
+            value = str(value).strip()
+            return value if value in NEWS_CATEGORIES else "기타"
+
+    return NewsAnalysis
+
+
+def get_analyze_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 요약 및 분류 전문가 입니다. "
+                "주어진 뉴스 데이터를 핵심만 간결하게 두세 문장으로 요약하고, "
+                f"다음 카테고리중 하나로 정확히 분류 해주세요. {','.join(NEWS_CATEGORIES)}"
+                "반드시 주어진 카테고리에서만 선택해야합니다.",
+            ),
+            (
+                "human",
+                "제목: {title}\n내용: {content}\n\n 주어진 뉴스를 요약하고 분류해주세요.",
+            ),
+        ]
+    )
+
+
+def get_analyze_chain(prompt=None):
+    prompt = prompt or get_analyze_prompt()
+    return tagged_chain(
+        prompt, get_llm().with_structured_output(get_analysis_schema()), "analyze_news"
+    )
+
+
+def analyze_news(title, content, token_budgets=None):
+    """
+    요약과 카테고리를 한 번의 LLM 호출로 가져옵니다.
+    """
+    prompt = get_analyze_prompt()
+    budget = get_token_budgets(token_budgets)["summarize"]
+    result = cached_invoke(
+        prompt,
+        get_analyze_chain(prompt),
+        title,
+        condense_content(title, content, budget),
+        analysis_to_dict,
+    )
+    if result is None:
+        # 응답을 스키마로 파싱하지 못하면 요약과 분류를 따로 요청합니다.
+        tracer.incr("analyze.fallback")
+        return (
+            summarize_news(title, content, token_budgets),
+            categorize_news(title, content, token_budgets),
+        )
+    return result["summary"], result["category"]
+
+
+# combined: 요약+분류를 한 번에 호출, separate: 요약과 분류를 따로 호출
+ANALYZE_MODES = ("combined", "separate")
+
+
+def summarize_and_categorize(count, news_data, mode="separate", token_budgets=None):
     results = []
-    for news in news_data[:count]:
+    for news in islice(news_data, count):
         title = news.get("title")
         content = news.get("content")
-        summary = summarize_news(title, content)
-        print(summary)
-        category = categorize_news(title, content)
+        if mode == "combined":
+            summary, category = analyze_news(title, content, token_budgets)
+            print(summary)
+        else:
+            summary = summarize_news(title, content, token_budgets)
+            print(summary)
+            category = categorize_news(title, content, token_budgets)
         results.append(
             {
                 "title": title,
                 "summary": summary,
                 "category": category,
+                "related": news.get("related", []),
             }
         )
     return results
 
 
+async def astream_summary(engine, prompt, chain, inputs, queue):
+    """
+    요약을 astream으로 받아 조각마다 queue에 넣고, 끝나면 None을 넣습니다.
+    완성된 요약은 캐시에 저장하고 반환합니다.
+    """
+    key = get_cache_key(prompt, inputs["title"], inputs["content"])
+    cached = get_llm_cache().get(key)
+    if cached is not None:
+        queue.put_nowait(cached)
+        queue.put_nowait(None)
+        return cached
+
+    parts = []
+    try:
+        async for chunk in engine.stream(chain, inputs):
+            parts.append(chunk.content)
+            queue.put_nowait(chunk.content)
+    finally:
+        queue.put_nowait(None)
+    summary = "".join(parts)
+    get_llm_cache().set(key, summary)
+    return summary
+
+
+async def print_streams_in_order(queues):
+    """
+    기사 순서대로 요약 조각을 출력합니다.
+    앞 기사가 끝나면 뒤 기사의 이미 받아둔 조각부터 바로 이어서 출력합니다.
+    """
+    for queue in queues:
+        while (token := await queue.get()) is not None:
+            print(token, end="", flush=True)
+        print()
+
+
+# 진행 기록(journal)에 저장하는 기사별 결과 필드
+JOURNAL_FIELDS = ("title", "summary", "category", "related")
+
+
+async def asummarize_and_categorize(
+    count,
+    news_data,
+    concurrency=DEFAULT_CONCURRENCY,
+    mode="combined",
+    stream=False,
+    classifier=None,
+    threshold=DEFAULT_THRESHOLD,
+    label_store=None,
+    token_budgets=None,
+    journal=None,
+):
+    """
+    모든 기사의 요약과 분류를 동시에 실행합니다.
+    결과는 news_data의 순서를 그대로 유지합니다.
+
+    stream=True이면 요약을 토큰 단위로 받아 기사 순서대로 바로 출력합니다.
+    (요약을 스트리밍해야 하므로 separate 모드로 실행됩니다)
+
+    classifier가 있으면 확률이 threshold 이상인 기사는 로컬에서 분류하고 요약만 LLM에 요청합니다.
+    label_store가 있으면 LLM이 분류한 결과를 분류기 학습 데이터로 저장합니다.
+
+    token_budgets로 작업별 본문 토큰 한도를 정합니다. (content_prep.DEFAULT_TOKEN_BUDGETS)
+    분류에는 리드 문단만 보내고, 모델 입력 한도를 넘는 본문은 조각별로 먼저 요약합니다.
+
+    journal(NewsStore)이 있으면 기사 하나가 끝날 때마다 결과를 id별로 추가 기록하고,
+    이미 기록된 기사는 LLM을 호출하지 않고 기록된 결과를 그대로 사용합니다.
+    """
+    if mode not in ANALYZE_MODES:
+        raise ValueError(f"지원하지 않는 모드입니다: {mode}")
+    if stream:
+        mode = "separate"
+
+    engine = LLMEngine(
+        concurrency=concurrency,
+        scheduler=get_scheduler(LLM_PROVIDER),
+    )
+    if mode == "combined":
+        analyze_prompt = get_analyze_prompt()
+        analyze_chain = get_analyze_chain(analyze_prompt)
+    # combined 모드에서도 파싱 실패 시 따로 요청할 수 있도록 요약/분류 체인을 만들어 둡니다.
+    summarize_prompt = get_summarize_prompt()
+    summarize_chain = tagged_chain(summarize_prompt, get_llm(), "summarize_news")
+    categorize_prompt = get_categorize_prompt()
+    categorize_chain = tagged_chain(categorize_prompt, get_llm(), "categorize_news")
+
+    news_list = list(islice(news_data, count))
+    queues = [asyncio.Queue() for _ in news_list] if stream else []
+    labels = []
+    token_budgets = get_token_budgets(token_budgets)
+
+    async def process(index, news):
+        article_id = news.get("id")
+        if journal is not None and article_id in journal:
+            # 이전 실행에서 끝낸 기사는 기록된 결과를 재사용합니다.
+            tracer.incr("journal.resumed")
+            done = journal.get(article_id)
+            if stream:
+                queues[index].put_nowait(done["summary"])
+                queues[index].put_nowait(None)
+            return {field: done[field] for field in JOURNAL_FIELDS}
+
+        title = news.get("title")
+        content = news.get("content") or ""
+        inputs = {
+            "title": title,
+            "content": await acondense_content(
+                engine, title, content, token_budgets["summarize"]
+            ),
+        }
+
+        def categorize_inputs():
+            lead = prepare_for_categorize(content, token_budgets["categorize"])
+            return {"title": title, "content": lead}
+
+        async def summarize_and_categorize_separately():
+            return await asyncio.gather(
+                acached_invoke(
+                    engine, summarize_prompt, summarize_chain, inputs, message_content
+                ),
+                acached_invoke(
+                    engine,
+                    categorize_prompt,
+                    categorize_chain,
+                    categorize_inputs(),
+                    message_content,
+                ),
+            )
+
+        local = False
+        if classifier:
+            category, confidence = classifier.predict(news)
+            local = confidence >= threshold
+        if local:
+            # 로컬 분류기를 믿을 수 있으면 요약만 LLM에 요청합니다.
+            tracer.incr("classifier.local")
+            if stream:
+                summary = await astream_summary(
+                    engine, summarize_prompt, summarize_chain, inputs, queues[index]
+                )
+            else:
+                summary = await acached_invoke(
+                    engine, summarize_prompt, summarize_chain, inputs, message_content
+                )
+        elif stream:
+            summary, category = await asyncio.gather(
+                astream_summary(
+                    engine, summarize_prompt, summarize_chain, inputs, queues[index]
+                ),
+                acached_invoke(
+                    engine,
+                    categorize_prompt,
+                    categorize_chain,
+                    categorize_inputs(),
+                    message_content,
+                ),
+            )
+        elif mode == "combined":
+            analysis = await acached_invoke(
+                engine, analyze_prompt, analyze_chain, inputs, analysis_to_dict
+            )
+            if analysis is None:
+                # 응답을 스키마로 파싱하지 못하면 요약과 분류를 따로 요청합니다.
+                tracer.incr("analyze.fallback")
+                summary, category = await summarize_and_categorize_separately()
+            else:
+                summary, category = analysis["summary"], analysis["category"]
+        else:
+            summary, category = await summarize_and_categorize_separately()
+        if not local:
+            if classifier:
+                tracer.incr("classifier.llm")
+            if category in NEWS_CATEGORIES:
+                labels.append(make_label(news, category))
+        if not stream:
+            print(summary)
+        result = {
+            "title": inputs["title"],
+            "summary": summary,
+            "category": category,
+            "related": news.get("related", []),
+        }
+        if journal is not None and article_id is not None:
+            journal.append([{"id": article_id, **result}])
+        return result
+
+    tasks = [process(index, news) for index, news in enumerate(news_list)]
+    if stream:
+        results, _ = await asyncio.gather(
+            asyncio.gather(*tasks), print_streams_in_order(queues)
+        )
+    else:
+        results = await asyncio.gather(*tasks)
+    if label_store is not None:
+        label_store.append(label for label in labels if label["id"])
+    return results
+
+
 def fetch_news_data_from_url(url):
     """
     주어진 URL에서 JSON 데이터를 가져옵니다.
     """
+    import httpx
+
     try:
         response = httpx.get(url)
         response.raise_for_status()
@@ -105,6 +605,28 @@ def fetch_news_data_from_url(url):
         return None
 
 
+# 요약/분류 진행 기록 파일
+JOURNAL_FILENAME = "summaries_journal.jsonl"
+
+
+@contextmanager
+def atomic_open(path):
+    """
+    임시 파일에 모두 쓴 뒤 한 번에 이름을 바꿉니다.
+    중간에 중단되어도 반쯤 쓴 파일이 남지 않고, 기존 파일은 그대로 유지됩니다.
+    """
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def save_data_as_json(data, filename="generated_datas.json"):
     """
     주어진 데이터를 JSON 파일로 저장합니다.
@@ -116,7 +638,7 @@ def save_data_as_json(data, filename="generated_datas.json"):
     dir_path = os.path.dirname(os.path.abspath(__file__))
     file_path = os.path.join(dir_path, filename)
 
-    with open(file_path, "w", encoding="utf-8") as f:
+    with atomic_open(file_path) as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
     print(f"데이터를 '{filename}' 파일로 저장했습니다.")
 
@@ -140,47 +662,163 @@ def load_data_from_json(filename="generated_datas.json"):
         return None
 
 
-def main():
+def get_news_store(filename="news_data2.jsonl"):
+    """
+    JSON Lines 형식의 뉴스 저장소를 반환합니다.
+    파일명이 .gz/.zst로 끝나면 압축해서 저장합니다.
+    """
+    dir_path = os.path.dirname(os.path.abspath(__file__))
+    return NewsStore(os.path.join(dir_path, filename))
+
+
+def save_data_as_jsonl(data, filename="news_data2.jsonl", append=False):
+    """
+    주어진 데이터를 JSON Lines 파일로 저장합니다.
+    append=True이면 기존 파일 끝에 추가합니다.
+    """
+    if not data:
+        print("저장할 데이터가 없습니다.")
+        return
+
+    store = get_news_store(filename)
+    count = store.append(data) if append else store.rewrite(data)
+    print(f"데이터 {count}건을 '{filename}' 파일로 저장했습니다.")
+
+
+def load_data_from_jsonl(filename="news_data2.jsonl"):
+    """
+    JSON Lines 파일에서 데이터를 한 건씩 읽어오는 제너레이터를 반환합니다.
+    """
+    store = get_news_store(filename)
+    if not os.path.exists(store.path):
+        print(f"'{filename}' 파일을 찾을 수 없습니다.")
+        return None
+    return store.iter_records()
+
+
+def collect_news_data():
+    """
+    원본 뉴스 목록을 받아 기사 본문을 채운 뒤 'news_data2.jsonl'로 저장합니다.
+    """
     # 1. GitHub에서 원본 뉴스 데이터를 가져옵니다.
     url = "https://raw.githubusercontent.com/wapj/learning-archive/refs/heads/main/programmers-250930/news_data.json"
-    news_data_from_url = fetch_news_data_from_url(url)
-
-    # 2. 각 뉴스를 순회하며 'content' 필드를 채웁니다. (불필요한 if문 제거)
-    for news in news_data_from_url:
-        pc_url = news.get("pcUrl")
-        article_text = None
-        try:
-            response = httpx.get(pc_url)
-            response.raise_for_status()
-            html_content = response.text
-            article_text = extract_article_text(html_content)
-        except httpx.RequestError as e:
-            print(f"기사 콘텐츠를 가져오는 중 오류 발생 (URL: {pc_url}): {e}")
-
+    with tracer.span("fetch_metadata"):
+        news_data_from_url = fetch_news_data_from_url(url)
+
+    # 2. 기사 HTML 다운로드와 본문 파싱을 파이프라인으로 실행해 'content' 필드를 채웁니다.
+    pc_urls = [news.get("pcUrl") for news in news_data_from_url]
+    with tracer.span("crawl", articles=len(pc_urls)):
+        article_texts, crawl_stats = asyncio.run(crawl_articles(pc_urls))
+    print_stage_stats(crawl_stats)
+    for stage in crawl_stats:
+        if stage.started is not None:
+            tracer.add_span(
+                stage.name,
+                stage.started,
+                stage.finished,
+                count=stage.count,
+                failed=stage.failed,
+                busy=stage.busy,
+            )
+
+    for news, article_text in zip(news_data_from_url, article_texts):
         # 3. 본문 추출 성공 여부에 따라 'content'를 설정합니다.
-        if article_text and "article_body를 찾을 수 없습니다." not in article_text:
+        if article_text and NOT_FOUND_MESSAGE not in article_text:
             news["content"] = article_text
         else:
             news["content"] = news.get("summary", "내용 없음")
 
-    # 4. 업데이트된 데이터를 'news_data.json'으로 저장합니다.
-    save_data_as_json(news_data_from_url, filename="news_data2.json")
+    # 4. 업데이트된 데이터를 'news_data2.jsonl'로 저장합니다.
+    save_data_as_jsonl(news_data_from_url, filename="news_data2.jsonl")
+
+
+def main(
+    stream=False,
+    mode="combined",
+    dedup=True,
+    threshold=DEFAULT_THRESHOLD,
+    token_budgets=None,
+    resume=False,
+    archive_format="npy",
+):
+    # 1~4. 기사 수집 (이어서 실행할 때는 이미 저장한 'news_data2.jsonl'을 사용합니다)
+    news_store = get_news_store("news_data2.jsonl")
+    if resume and len(news_store) > 0:
+        print("이전 실행에서 저장한 'news_data2.jsonl'로 이어서 진행합니다.")
+    else:
+        collect_news_data()
 
-    # 5. 저장된 'news_data.json'을 다시 불러와 후속 작업을 진행합니다.
-    loaded_news_data = load_data_from_json(filename="news_data2.json")
-    if not loaded_news_data:
-        print("JSON 파일에서 데이터를 불러오는 데 실패했습니다.")
+    # 5. 저장된 'news_data2.jsonl'을 다시 불러와 후속 작업을 진행합니다.
+    news_store = get_news_store("news_data2.jsonl")
+    loaded_news_data = load_data_from_jsonl(filename="news_data2.jsonl")
+    if loaded_news_data is None or len(news_store) == 0:
+        print("JSONL 파일에서 데이터를 불러오는 데 실패했습니다.")
         return
+    # 필요한 필드만 담은 Article로 들고 있고, 본문은 처음 쓸 때 저장소에서 읽습니다.
+    loaded_news_data = to_articles(loaded_news_data, store=news_store)
+
+    # 6. 거의 같은 기사들을 묶어 대표 기사만 요약하고, 나머지는 관련 기사로 붙입니다.
+    news_count = len(news_store)
+    if dedup:
+        with tracer.span("dedup", articles=news_count):
+            loaded_news_data, clusters = deduplicate_articles(loaded_news_data)
+        tracer.incr("dedup.skipped", news_count - len(clusters))
+        print(f"중복 기사 묶기: {news_count}건 -> {len(clusters)}건")
+        news_count = len(clusters)
+
+    # 7. 요약, 분류 및 리포트 생성 작업을 수행합니다.
+    # 학습된 로컬 분류기가 있으면 확신이 높은 기사는 LLM 없이 분류합니다.
+    classifier = CategoryClassifier.load()
+    # 기사별 결과를 바로 기록해 두고, --resume이면 기록된 기사는 건너뜁니다.
+    journal = get_news_store(JOURNAL_FILENAME)
+    if not resume:
+        journal.rewrite([])
+    news_list = list(islice(loaded_news_data, news_count))
+    with tracer.span("summarize_and_categorize", articles=news_count):
+        datas = asyncio.run(
+            asummarize_and_categorize(
+                news_count,
+                news_list,
+                mode=mode,
+                stream=stream,
+                classifier=classifier,
+                threshold=threshold,
+                label_store=get_label_store(),
+                token_budgets=token_budgets,
+                journal=journal,
+            )
+        )
+    # 요약이 끝나면 본문은 더 쓰지 않으므로 읽어 둔 본문을 내려놓습니다.
+    for news in news_list:
+        news.release_content()
+    if tracer.counters["journal.resumed"]:
+        print(f"이전 실행 결과 재사용: {tracer.counters['journal.resumed']}건")
+    print_token_savings()
+    if classifier:
+        print(
+            f"로컬 분류: {tracer.counters['classifier.local']}건, "
+            f"LLM 분류: {tracer.counters['classifier.llm']}건"
+        )
+    cache_stats = get_llm_cache().stats()
+    tracer.incr("llm_cache.hits", cache_stats["hits"])
+    tracer.incr("llm_cache.misses", cache_stats["misses"])
+    print(
+        f"LLM 캐시 적중: {cache_stats['hits']}건, 미스: {cache_stats['misses']}건 "
+        f"(적중률 {cache_stats['hit_rate']:.0%})"
+    )
 
-    # 6. 요약, 분류 및 리포트 생성 작업을 수행합니다.
-    news_count = len(loaded_news_data)
-    datas = summarize_and_categorize(news_count, loaded_news_data)
+    # 8. 처리 결과를 열 단위 파일로 쌓아 두어 전체 기록을 집계할 수 있게 합니다.
+    from columnar_archive import export_results
 
-    print(datas)
-    result = llm.invoke(
-        f"{datas}\n 첨부한 데이터를 마크다운으로 변환하고 보고서 형식으로 바꿔주세요. "
-        "결괏값으로는 마크다운 형식만 반환하세요."
-    )
+    with tracer.span("export"):
+        archive_path = export_results(news_list, datas, format=archive_format)
+    if archive_path:
+        print(f"처리 결과를 '{archive_path}'에 보관했습니다.")
+
+    # 보고서 형식은 로컬에서 만들고, LLM에는 시사점/개요/결론 문장만 요청합니다.
+    from report import build_report, stream_report
+
+    engine = LLMEngine(scheduler=get_scheduler(LLM_PROVIDER))
 
     current_time = datetime.now().strftime("%Y%m%d_%H%M")
     report_filename = f"report_{current_time}.md"
@@ -188,11 +826,115 @@ def main():
     dir_path = os.path.dirname(os.path.abspath(__file__))
     file_path = os.path.join(dir_path, report_filename)
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(result.content)
+    with tracer.span("report"):
+        if stream:
+            # 완성되는 부분부터 파일과 표준출력에 바로 씁니다.
+            # 진행 중에도 파일을 열어 볼 수 있도록 임시 파일을 거치지 않으므로,
+            # 도중에 실패하면 쓰다 만 보고서가 남습니다.
+            with open(file_path, "w", encoding="utf-8") as f:
+
+                def write(text):
+                    f.write(text)
+                    f.flush()
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+
+                asyncio.run(
+                    stream_report(
+                        datas, get_llm(), NEWS_CATEGORIES, write, engine=engine
+                    )
+                )
+        else:
+            report = asyncio.run(
+                build_report(datas, get_llm(), NEWS_CATEGORIES, engine=engine)
+            )
+            with atomic_open(file_path) as f:
+                f.write(report)
 
     print(f"파일이 '{file_path}'으로 저장되었습니다.")
 
+    # 단계별 실행 시간과 LLM 호출 기록을 저장하고 요약 표를 출력합니다.
+    for name, value in get_scheduler(LLM_PROVIDER).stats.items():
+        tracer.incr(f"scheduler.{name}", value)
+    tracer.export_json(os.path.join(dir_path, f"trace_{current_time}.json"))
+    tracer.print_summary()
+
+
+def budget_type(task):
+    """
+    MIN_TOKEN_BUDGETS보다 작은 예산은 나눠 요약해도 맞출 수 없으므로 받지 않습니다.
+    """
+
+    def parse(value):
+        budget = int(value)
+        if budget < MIN_TOKEN_BUDGETS[task]:
+            raise argparse.ArgumentTypeError(
+                f"{MIN_TOKEN_BUDGETS[task]} 이상이어야 합니다: {budget}"
+            )
+        return budget
+
+    return parse
+
 
 if __name__ == "__main__":
-    main()
+    from columnar_archive import FORMATS
+
+    parser = argparse.ArgumentParser(description="뉴스 요약 보고서 생성")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="요약과 보고서를 생성되는 대로 출력",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=ANALYZE_MODES,
+        default="combined",
+        help="combined: 요약과 분류를 한 번에 요청, separate: 따로 요청 (비교용)",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="비슷한 기사를 묶지 않고 모든 기사를 요약",
+    )
+    parser.add_argument(
+        "--classifier-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="로컬 분류기 결과를 그대로 쓸 최소 확률 (1보다 크면 항상 LLM 사용)",
+    )
+    parser.add_argument(
+        "--categorize-budget",
+        type=budget_type("categorize"),
+        default=DEFAULT_TOKEN_BUDGETS["categorize"],
+        help="분류에 보낼 본문의 최대 토큰 수 (리드 문단만 사용)",
+    )
+    parser.add_argument(
+        "--summarize-budget",
+        type=budget_type("summarize"),
+        default=DEFAULT_TOKEN_BUDGETS["summarize"],
+        help="입력 한도를 넘는 본문을 나눠서 요약할 때, 합친 조각 요약의 최대 토큰 수",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="중단된 실행을 이어서 진행 (수집한 기사와 끝낸 요약을 재사용)",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=FORMATS,
+        default="npy",
+        help="처리 결과를 보관할 형식 (parquet은 pyarrow 필요)",
+    )
+    args = parser.parse_args()
+    main(
+        resume=args.resume,
+        archive_format=args.archive_format,
+        stream=args.stream,
+        mode=args.mode,
+        dedup=not args.no_dedup,
+        threshold=args.classifier_threshold,
+        token_budgets={
+            "categorize": args.categorize_budget,
+            "summarize": args.summarize_budget,
+        },
+    )
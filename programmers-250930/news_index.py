@@ -0,0 +1,400 @@
+"""
+기사 메타데이터를 조건으로 빠르게 골라내기 위한 디스크 색인입니다.
+
+- 제목/요약 단어의 역색인 (한국어는 형태소 분석 없이 두 글자 조각으로 나눔)
+- 작성 시각(createdAt) 정렬 열: 기간 조건을 이진 탐색으로 처리
+- 매체(cpName), 카테고리, 서비스, 기사 유형 정렬 열: 값별 행 번호 구간
+
+    python news_index.py build
+    python news_index.py query --category IT/과학 --cp 연합뉴스 \\
+        --since 2025-09-26T00:00 --until 2025-09-28T00:00
+    python news_index.py query --text 검찰청 폐지
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from shared.news_store import NewsStore
+
+from vector_index import load_corpus
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(_DIR, "news_index")
+
+DOCS_FILE = "docs.json"
+ARRAYS_FILE = "arrays.npz"
+
+# 값별로 정렬 열을 만드는 필드
+FIELDS = ("cpName", "category", "serviceName", "type")
+# 역색인에 넣을 요약/본문 앞부분 길이
+TEXT_CHARS = 300
+# 작성 시각이 없는 기사의 정렬 값 (기간 조건에는 걸리지 않음)
+NO_TIME = np.iinfo(np.int64).min
+KST = timezone(timedelta(hours=9))
+_EMPTY_ROWS = np.empty(0, dtype=np.uint32)
+
+_HANGUL = re.compile(r"[가-힣]+")
+_ALNUM = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text):
+    """
+    한글은 두 글자 조각(bigram)으로, 영문/숫자는 단어 단위(소문자)로 나눕니다.
+    질의도 같은 방식으로 나누므로 "검찰청"은 "검찰", "찰청"이 모두 있는 기사와 맞습니다.
+    한 글자짜리 한글 단어는 그 글자 하나를 조각으로 씁니다.
+    """
+    text = text or ""
+    tokens = set()
+    for word in _HANGUL.findall(text):
+        if len(word) == 1:
+            tokens.add(word)
+        tokens.update(word[i : i + 2] for i in range(len(word) - 1))
+    tokens.update(word.lower() for word in _ALNUM.findall(text))
+    return tokens
+
+
+def parse_time(value):
+    """
+    ISO 형식 문자열이나 datetime을 유닉스 시각(초)으로 바꿉니다.
+    시간대가 없으면 한국 시각(+09:00)으로 봅니다.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=KST)
+    return int(value.timestamp())
+
+
+def load_categories():
+    """
+    LLM이나 분류기가 붙인 카테고리를 기사 id별로 모읍니다.
+    (요약 기록 summaries_journal.jsonl, 분류기 학습 데이터 category_labels.jsonl)
+    """
+    categories = {}
+    for filename in ("category_labels.jsonl", "summaries_journal.jsonl"):
+        store = NewsStore(os.path.join(_DIR, filename))
+        if os.path.exists(store.path):
+            for record in store.iter_records():
+                if record.get("category"):
+                    categories[record["id"]] = record["category"]
+    return categories
+
+
+def _sorted_column(codes, size):
+    """
+    값 코드별로 행 번호를 모읍니다. 코드 c의 행은 order[offsets[c]:offsets[c + 1]]이며
+    각 구간 안의 행 번호는 오름차순입니다.
+    """
+    order = np.argsort(codes, kind="stable").astype(np.uint32)
+    offsets = np.searchsorted(codes[order], np.arange(size + 1)).astype(np.int64)
+    return order, offsets
+
+
+class NewsIndex:
+    """
+    docs.json(행 번호별 기사 정보, 필드 값 사전, 단어 목록)과
+    arrays.npz(역색인, 정렬 열)로 이루어진 색인입니다.
+    """
+
+    def __init__(self, directory, docs, values, terms, arrays):
+        self.directory = directory
+        self.docs = docs
+        self.values = values
+        self.value_codes = {
+            field: {value: code for code, value in enumerate(field_values)}
+            for field, field_values in values.items()
+        }
+        self.term_codes = {term: code for code, term in enumerate(terms)}
+        self.arrays = arrays
+
+    def __len__(self):
+        return len(self.docs)
+
+    @classmethod
+    def build(cls, articles, directory=INDEX_DIR, categories=None):
+        """
+        기사 목록으로 색인을 만들어 저장하고, 저장한 색인을 열어서 반환합니다.
+        categories({기사 id: 카테고리})가 있으면 기사에 없는 카테고리를 채웁니다.
+        """
+        categories = categories or {}
+        docs, times, postings = [], [], {}
+        values = {field: {} for field in FIELDS}
+        codes = {field: [] for field in FIELDS}
+        for row, news in enumerate(articles):
+            doc = {
+                "id": news.get("id"),
+                "title": news.get("title"),
+                "cpName": news.get("cpName"),
+                "category": news.get("category") or categories.get(news.get("id")),
+                "serviceName": news.get("serviceName"),
+                "type": news.get("type"),
+                "createdAt": news.get("createdAt"),
+                "url": news.get("pcUrl") or news.get("url"),
+            }
+            docs.append(doc)
+            timestamp = parse_time(doc["createdAt"])
+            times.append(NO_TIME if timestamp is None else timestamp)
+            for field in FIELDS:
+                code = values[field].setdefault(doc[field], len(values[field]))
+                codes[field].append(code)
+            text = news.get("summary") or (news.get("content") or "")[:TEXT_CHARS]
+            for token in tokenize(f"{doc['title']} {text}"):
+                postings.setdefault(token, []).append(row)
+
+        times = np.array(times, dtype=np.int64)
+        time_order = np.argsort(times, kind="stable").astype(np.uint32)
+        terms = sorted(postings)
+        arrays = {
+            "times": times,
+            "time_order": time_order,
+            "time_sorted": times[time_order],
+            "term_offsets": np.cumsum(
+                [0] + [len(postings[term]) for term in terms], dtype=np.int64
+            ),
+            "term_postings": np.array(
+                [row for term in terms for row in postings[term]], dtype=np.uint32
+            ),
+        }
+        for field in FIELDS:
+            field_codes = np.array(codes[field], dtype=np.int32)
+            order, offsets = _sorted_column(field_codes, len(values[field]))
+            arrays[f"{field}_codes"] = field_codes
+            arrays[f"{field}_order"] = order
+            arrays[f"{field}_offsets"] = offsets
+
+        os.makedirs(directory, exist_ok=True)
+        table = {
+            "docs": docs,
+            "values": {field: list(values[field]) for field in FIELDS},
+            "terms": terms,
+        }
+        # 임시 파일에 쓴 뒤 바꿔치기해서, 읽는 쪽이 반쯤 쓴 색인을 보지 않게 합니다.
+        tmp_path = os.path.join(directory, f".tmp.{ARRAYS_FILE}")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, os.path.join(directory, ARRAYS_FILE))
+        tmp_path = os.path.join(directory, f".tmp.{DOCS_FILE}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(table, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(directory, DOCS_FILE))
+        return cls.open(directory)
+
+    @classmethod
+    def open(cls, directory=INDEX_DIR):
+        """
+        저장된 색인을 엽니다. 아직 만들지 않았으면 None을 반환합니다.
+        """
+        docs_path = os.path.join(directory, DOCS_FILE)
+        if not os.path.exists(docs_path):
+            return None
+        with open(docs_path, encoding="utf-8") as f:
+            table = json.load(f)
+        with np.load(os.path.join(directory, ARRAYS_FILE)) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(directory, table["docs"], table["values"], table["terms"], arrays)
+
+    def _postings(self, code):
+        offsets = self.arrays["term_offsets"]
+        return self.arrays["term_postings"][offsets[code] : offsets[code + 1]]
+
+    def _term_rows(self, term):
+        # 한 글자 질의는 그 글자가 들어간 단어(조각)를 모두 훑어서 찾습니다.
+        if len(term) == 1:
+            return self._char_rows(term)
+        code = self.term_codes.get(term)
+        if code is None:
+            return _EMPTY_ROWS
+        return self._postings(code)
+
+    def _char_rows(self, char):
+        """
+        한글 한 글자는 그 글자가 들어 있는 조각, 영문/숫자 한 글자는 그 글자로 시작하는
+        단어가 있는 기사의 행 번호를 오름차순으로 반환합니다.
+        """
+        if _HANGUL.fullmatch(char):
+            codes = [code for term, code in self.term_codes.items() if char in term]
+        else:
+            codes = [
+                code for term, code in self.term_codes.items() if term.startswith(char)
+            ]
+        rows = [self._postings(code) for code in codes]
+        return np.unique(np.concatenate([_EMPTY_ROWS, *rows]))
+
+    def _value_rows(self, field, value):
+        code = self.value_codes[field].get(value)
+        if code is None:
+            return _EMPTY_ROWS
+        offsets = self.arrays[f"{field}_offsets"]
+        return self.arrays[f"{field}_order"][offsets[code] : offsets[code + 1]]
+
+    def _time_range(self, start, end):
+        """
+        start <= 작성 시각 < end인 기사가 정렬 열에서 차지하는 구간을 반환합니다.
+        """
+        sorted_times = self.arrays["time_sorted"]
+        lo = np.searchsorted(sorted_times, start, side="left")
+        hi = np.searchsorted(sorted_times, end, side="left")
+        return lo, hi
+
+    def select(self, text=None, start=None, end=None, **filters):
+        """
+        조건을 모두 만족하는 기사의 행 번호를 오름차순 배열로 반환합니다.
+
+        - text: 이 문장의 단어(조각)가 모두 들어 있는 기사
+          (한 글자 단어는 그 글자가 들어간 조각이나 그 글자로 시작하는 단어가 있는 기사)
+        - start, end: start <= createdAt < end (ISO 문자열, datetime 또는 유닉스 시각)
+        - filters: cpName, category, serviceName, type 중 값이 같은 기사
+          (값 대신 리스트를 주면 그중 하나와 같은 기사)
+        """
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 필터입니다: {', '.join(sorted(unknown))}")
+        filters = {
+            field: list(value) if isinstance(value, (list, tuple, set)) else [value]
+            for field, value in filters.items()
+            if value is not None
+        }
+
+        # 조건마다 후보 행 목록(오름차순)을 만듭니다.
+        candidates = [self._term_rows(term) for term in tokenize(text)]
+        for field, field_values in filters.items():
+            rows = [self._value_rows(field, value) for value in field_values]
+            if len(rows) == 1:
+                candidates.append(rows[0])
+            else:
+                candidates.append(np.sort(np.concatenate([_EMPTY_ROWS, *rows])))
+        start, end = parse_time(start), parse_time(end)
+        check_times = False
+        if start is not None or end is not None:
+            start = NO_TIME + 1 if start is None else start
+            end = np.iinfo(np.int64).max if end is None else end
+            lo, hi = self._time_range(start, end)
+            # 기간에 든 기사가 다른 조건의 후보보다 많으면 후보의 시각만 확인합니다.
+            check_times = bool(candidates) and hi - lo >= min(map(len, candidates))
+            if not check_times:
+                candidates.append(np.sort(self.arrays["time_order"][lo:hi]))
+        if not candidates:
+            return np.arange(len(self), dtype=np.uint32)
+
+        # 가장 짧은 목록에서 시작해서 나머지 조건은 이진 탐색으로 확인하므로
+        # 비용이 가장 짧은 목록의 길이에 비례합니다.
+        candidates.sort(key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            if len(rows) == 0:
+                break
+            positions = np.minimum(np.searchsorted(other, rows), len(other) - 1)
+            rows = rows[other[positions] == rows]
+        if check_times:
+            times = self.arrays["times"][rows]
+            rows = rows[(times >= start) & (times < end)]
+        return rows
+
+    def query(self, text=None, start=None, end=None, limit=None, **filters):
+        """
+        select와 같은 조건으로 기사 정보를 최신순으로 반환합니다.
+        예) index.query(category="IT/과학", cpName="연합뉴스",
+                        start="2025-09-26T00:00", end="2025-09-28T00:00")
+        """
+        rows = self.select(text, start, end, **filters)
+        rows = rows[np.argsort(-self.arrays["times"][rows], kind="stable")]
+        if limit is not None:
+            rows = rows[:limit]
+        return [self.docs[row] for row in rows]
+
+    def counts(self, field, rows=None):
+        """
+        필드 값별 기사 수를 많은 순서로 반환합니다. rows를 주면 그 행들만 셉니다.
+        """
+        codes = self.arrays[f"{field}_codes"]
+        if rows is not None:
+            codes = codes[rows]
+        counts = np.bincount(codes, minlength=len(self.values[field]))
+        return {
+            self.values[field][code]: int(counts[code])
+            for code in np.argsort(-counts, kind="stable")
+            if counts[code]
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(directory=INDEX_DIR):
+    """
+    프로세스에서 공유하는 색인을 반환합니다. 처음 호출할 때 파일을 엽니다.
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.directory != directory:
+            _index = NewsIndex.open(directory)
+            if _index is None:
+                raise FileNotFoundError(
+                    "기사 색인이 없습니다. 먼저 python news_index.py build를 실행해주세요."
+                )
+        return _index
+
+
+def select_news(text=None, start=None, end=None, limit=None, **filters):
+    """
+    보고서 작성이나 에이전트 도구에서 조건에 맞는 기사만 고를 때 사용합니다.
+    """
+    return get_index().query(text, start, end, limit, **filters)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기사 메타데이터 색인 생성/조회")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="수집한 기사로 색인 생성")
+
+    query_parser = subparsers.add_parser("query", help="조건으로 기사 조회")
+    query_parser.add_argument("--text", help="제목/요약에 들어 있는 단어")
+    query_parser.add_argument("--cp", dest="cpName", help="매체명 (예: 연합뉴스)")
+    query_parser.add_argument("--category", help="카테고리 (예: IT/과학)")
+    query_parser.add_argument("--service", dest="serviceName")
+    query_parser.add_argument("--type", choices=["TEXT", "VIDEO"])
+    query_parser.add_argument("--since", help="이 시각 이후 (ISO 형식)")
+    query_parser.add_argument("--until", help="이 시각 이전 (ISO 형식)")
+    query_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = NewsIndex.build(load_corpus(), categories=load_categories())
+        print(
+            f"기사 {len(index)}건, 단어 {len(index.term_codes)}개 색인 완료 "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+        print("매체별 기사 수:", index.counts("cpName"))
+    else:
+        index = get_index()
+        start = time.perf_counter()
+        results = index.query(
+            args.text,
+            args.since,
+            args.until,
+            args.limit,
+            cpName=args.cpName,
+            category=args.category,
+            serviceName=args.serviceName,
+            type=args.type,
+        )
+        elapsed = time.perf_counter() - start
+        for doc in results:
+            print(
+                f"{doc['createdAt']} [{doc['category'] or '-'}] "
+                f"{doc['title']} ({doc['cpName']})"
+            )
+        print(f"{len(results)}건, 조회 시간: {elapsed * 1e3:.3f}ms")
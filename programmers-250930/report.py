@@ -0,0 +1,407 @@
+import asyncio
+import re
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from shared.tracing import tracer
+
+from llm_engine import LLMEngine
+
+# 한 번의 시사점 작성 요청에 넣을 최대 기사 수
+MAX_ITEMS_PER_SECTION = 20
+# 개요 작성 요청에 카테고리별로 넣을 최대 제목 수
+MAX_TITLES_PER_CATEGORY = 10
+
+# 개요/결론을 작성하지 못했을 때 대신 쓰는 문장
+CONCLUSION_FAILED = "결론을 작성하지 못했습니다. (LLM 응답이 비어 있거나 해석하지 못함)"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class ArticleInsight(BaseModel):
+    number: int = Field(description="기사 번호")
+    implications: list[str] = Field(description="기사의 시사점 2~3개")
+
+
+class SectionInsights(BaseModel):
+    items: list[ArticleInsight]
+
+
+class ReportSummary(BaseModel):
+    overview: list[str] = Field(description="보고서 전체 개요 3~5개")
+    conclusion: list[str] = Field(description="결론 및 권고 2~4개")
+
+
+def group_by_category(results, categories):
+    """
+    요약 결과를 카테고리별로 묶고, 카테고리 순서대로 기사에 1부터 번호를 붙입니다.
+    카테고리 순서는 categories를 따르고, 목록에 없는 카테고리는 뒤에 붙입니다.
+    {카테고리: [(번호, 기사), ...]}를 반환합니다.
+    """
+    groups = {category: [] for category in categories}
+    for item in results:
+        groups.setdefault(item.get("category") or "기타", []).append(item)
+
+    numbered = {}
+    number = 0
+    for category, items in groups.items():
+        if not items:
+            continue
+        numbered[category] = []
+        for item in items:
+            number += 1
+            numbered[category].append((number, item))
+    return numbered
+
+
+def chunked(items, size):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def split_sentences(text):
+    sentences = _SENTENCE_END.split(text or "")
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def get_insight_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 보고서 작성 전문가 입니다. "
+                "주어진 '{category}' 카테고리 뉴스마다 시사점을 2~3개씩 간결하게 작성해주세요. "
+                "기사 번호는 주어진 번호를 그대로 사용합니다.",
+            ),
+            ("human", "{items}"),
+        ]
+    )
+
+
+def get_summary_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 보고서 작성 전문가 입니다. "
+                "카테고리별 주요 뉴스 제목을 보고 보고서 맨 앞에 들어갈 개요와 "
+                "보고서 마지막에 들어갈 결론 및 권고를 작성해주세요.",
+            ),
+            ("human", "{digest}"),
+        ]
+    )
+
+
+def format_items(numbered_items):
+    return "\n\n".join(
+        f"[{number}] 제목: {item['title']}\n요약: {item['summary']}"
+        for number, item in numbered_items
+    )
+
+
+def build_digest(groups):
+    """
+    개요 작성에 쓸 카테고리별 요약 정보를 만듭니다.
+    기사 수와 상관없이 크기가 일정하도록 카테고리당 제목 수를 제한합니다.
+    """
+    lines = []
+    for category, items in groups.items():
+        lines.append(f"[{category}] {len(items)}건")
+        lines.extend(
+            f"- {item['title']}" for _, item in items[:MAX_TITLES_PER_CATEGORY]
+        )
+    return "\n".join(lines)
+
+
+def section_implications(section, category):
+    """
+    시사점 응답을 {기사 번호: [시사점, ...]}로 바꿉니다.
+    응답을 스키마로 파싱하지 못해 None이면 그 묶음은 시사점 없이 씁니다.
+    """
+    if section is None:
+        tracer.incr("report.insights_failed")
+        print(f"시사점 응답을 해석하지 못했습니다. ({category}) 시사점 없이 작성합니다.")
+        return {}
+    return {item.number: item.implications for item in section.items}
+
+
+async def write_insights(llm, engine, groups):
+    """
+    (map) 카테고리별로 기사 시사점을 동시에 작성합니다.
+    기사가 많은 카테고리는 MAX_ITEMS_PER_SECTION개씩 나눠서 요청합니다.
+    {기사 번호: [시사점, ...]}를 반환합니다.
+    """
+    chain = (
+        get_insight_prompt() | llm.with_structured_output(SectionInsights)
+    ).with_config(tags=["report_insights"])
+    jobs = [
+        {"category": category, "items": format_items(chunk)}
+        for category, items in groups.items()
+        for chunk in chunked(items, MAX_ITEMS_PER_SECTION)
+    ]
+    sections = await asyncio.gather(*(engine.run(chain, inputs) for inputs in jobs))
+    implications = {}
+    for inputs, section in zip(jobs, sections):
+        implications.update(section_implications(section, inputs["category"]))
+    return implications
+
+
+async def write_summary(llm, engine, groups):
+    """
+    (reduce) 카테고리별 제목 목록만으로 개요와 결론을 작성합니다.
+    """
+    chain = (
+        get_summary_prompt() | llm.with_structured_output(ReportSummary)
+    ).with_config(tags=["report_summary"])
+    summary = await engine.run(chain, {"digest": build_digest(groups)})
+    if summary is None:
+        tracer.incr("report.summary_failed")
+        print("개요/결론 응답을 해석하지 못했습니다. 대체 문장으로 작성합니다.")
+        return ReportSummary(
+            overview=fallback_overview(groups), conclusion=[CONCLUSION_FAILED]
+        )
+    return summary
+
+
+def fallback_overview(groups):
+    """
+    개요를 작성하지 못했을 때 카테고리별 기사 수와 첫 기사 제목으로 대신합니다.
+    """
+    return [
+        f"{category}: 기사 {len(items)}건 (예: {items[0][1]['title']})"
+        for category, items in groups.items()
+        if items
+    ]
+
+
+def render_bullets(lines, items, indent=""):
+    lines.extend(f"{indent}- {item}" for item in items)
+
+
+def render_header(created_at):
+    return f"# 뉴스 요약 보고서\n작성일: {created_at.strftime('%Y-%m-%d')}\n\n"
+
+
+def render_overview(overview):
+    lines = ["## 개요 (Executive Summary)"]
+    render_bullets(lines, overview)
+    lines += ["", "---", "", ""]
+    return "\n".join(lines)
+
+
+def render_index(groups):
+    """
+    카테고리별 기사 수 표와 목차를 만듭니다.
+    """
+    lines = ["## 카테고리별 기사 수", "", "| 카테고리 | 기사 수 |", "| --- | ---: |"]
+    lines.extend(f"| {category} | {len(items)} |" for category, items in groups.items())
+    lines += ["", "---", "", "## 목차"]
+    lines.extend(
+        f"{number}. [{item['title']}](#{number})"
+        for items in groups.values()
+        for number, item in items
+    )
+    lines += ["", "---", "", ""]
+    return "\n".join(lines)
+
+
+def render_article(number, category, item, implications=None):
+    lines = [
+        f'## {number}. {item["title"]} <a name="{number}"></a>',
+        f"- 카테고리: {category}",
+        "- 요약:",
+    ]
+    render_bullets(lines, split_sentences(item.get("summary")), indent="  ")
+    if implications:
+        lines += ["", "- 시사점:"]
+        render_bullets(lines, implications, indent="  ")
+    if item.get("related"):
+        lines += ["", "- 관련 기사:"]
+        render_bullets(
+            lines,
+            [
+                f"[{link['title']}]({link['url']}) ({link['cpName']})"
+                for link in item["related"]
+            ],
+            indent="  ",
+        )
+    lines += ["", "---", "", ""]
+    return "\n".join(lines)
+
+
+def render_conclusion(conclusion):
+    lines = ["## 결론 및 권고"]
+    render_bullets(lines, conclusion)
+    lines += ["", "---", ""]
+    return "\n".join(lines)
+
+
+def render_report(
+    results,
+    categories,
+    created_at,
+    overview=(),
+    implications=None,
+    conclusion=(),
+):
+    """
+    요약 결과를 고정된 형식의 마크다운 보고서로 만듭니다. (LLM 호출 없음)
+    입력이 같으면 항상 같은 문자열을 반환합니다.
+    """
+    implications = implications or {}
+    groups = group_by_category(results, categories)
+
+    parts = [render_header(created_at)]
+    if overview:
+        parts.append(render_overview(overview))
+    parts.append(render_index(groups))
+    for category, items in groups.items():
+        for number, item in items:
+            parts.append(
+                render_article(number, category, item, implications.get(number))
+            )
+    if conclusion:
+        parts.append(render_conclusion(conclusion))
+    return "".join(parts)
+
+
+async def build_report(results, llm, categories, engine=None, created_at=None):
+    """
+    요약 결과로 마크다운 보고서를 만듭니다.
+
+    목차, 앵커, 제목, 카테고리 표, 요약 항목은 render_report가 로컬에서 만들고,
+    LLM에는 시사점(map)과 개요/결론(reduce) 같은 서술형 문장만 요청합니다.
+    기사가 많아도 한 번의 요청에 들어가는 기사 수는 일정하게 유지됩니다.
+    """
+    engine = engine or LLMEngine()
+    created_at = created_at or datetime.now()
+    groups = group_by_category(results, categories)
+
+    implications, summary = await asyncio.gather(
+        write_insights(llm, engine, groups),
+        write_summary(llm, engine, groups),
+    )
+    return render_report(
+        results,
+        categories,
+        created_at,
+        overview=summary.overview,
+        implications=implications,
+        conclusion=summary.conclusion,
+    )
+
+
+def get_overview_stream_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 보고서 작성 전문가 입니다. "
+                "카테고리별 주요 뉴스 제목을 보고 보고서 맨 앞에 들어갈 개요를 "
+                "3~5개의 '- '로 시작하는 글머리표로 작성해주세요. "
+                "결괏값으로는 마크다운 글머리표만 반환하세요.",
+            ),
+            ("human", "{digest}"),
+        ]
+    )
+
+
+def get_conclusion_stream_prompt():
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate(
+        [
+            (
+                "system",
+                "당신은 뉴스 보고서 작성 전문가 입니다. "
+                "카테고리별 주요 뉴스 제목을 보고 보고서 마지막에 들어갈 결론 및 권고를 "
+                "2~4개의 '- '로 시작하는 글머리표로 작성해주세요. "
+                "결괏값으로는 마크다운 글머리표만 반환하세요.",
+            ),
+            ("human", "{digest}"),
+        ]
+    )
+
+
+async def stream_text(llm, engine, prompt, inputs, write, fallback):
+    """
+    LLM 응답을 도착하는 대로 씁니다. 응답이 비어 있으면 fallback 글머리표를 대신 씁니다.
+    """
+    chain = (prompt | llm).with_config(tags=["report_stream"])
+    written = False
+    async for chunk in engine.stream(chain, inputs):
+        written = written or bool(chunk.content.strip())
+        write(chunk.content)
+    if not written:
+        tracer.incr("report.empty_stream")
+        print("보고서 일부의 LLM 응답이 비어 있어 대체 문장으로 작성합니다.")
+        write("\n".join(f"- {line}" for line in fallback))
+
+
+async def stream_report(results, llm, categories, write, engine=None, created_at=None):
+    """
+    보고서를 완성되는 순서대로 write에 흘려보냅니다.
+
+    머리말과 목차는 바로 쓰고, 개요와 결론은 LLM 토큰이 도착하는 대로 씁니다.
+    기사별 시사점은 백그라운드에서 동시에 작성하며, 준비된 기사부터 순서대로 씁니다.
+    """
+    engine = engine or LLMEngine()
+    created_at = created_at or datetime.now()
+    groups = group_by_category(results, categories)
+    digest = {"digest": build_digest(groups)}
+
+    chain = (
+        get_insight_prompt() | llm.with_structured_output(SectionInsights)
+    ).with_config(tags=["report_insights"])
+    jobs = [
+        (category, chunk)
+        for category, items in groups.items()
+        for chunk in chunked(items, MAX_ITEMS_PER_SECTION)
+    ]
+    tasks = [
+        asyncio.create_task(
+            engine.run(chain, {"category": category, "items": format_items(chunk)})
+        )
+        for category, chunk in jobs
+    ]
+
+    try:
+        write(render_header(created_at))
+        write("## 개요 (Executive Summary)\n")
+        await stream_text(
+            llm,
+            engine,
+            get_overview_stream_prompt(),
+            digest,
+            write,
+            fallback_overview(groups),
+        )
+        write("\n\n---\n\n")
+        write(render_index(groups))
+
+        for (category, chunk), task in zip(jobs, tasks):
+            implications = section_implications(await task, category)
+            for number, item in chunk:
+                write(render_article(number, category, item, implications.get(number)))
+
+        write("## 결론 및 권고\n")
+        await stream_text(
+            llm,
+            engine,
+            get_conclusion_stream_prompt(),
+            digest,
+            write,
+            [CONCLUSION_FAILED],
+        )
+        write("\n\n---\n")
+    finally:
+        # 중간에 실패하면 아직 진행 중인 시사점 작성 작업을 취소하고 끝날 때까지 기다립니다.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,566 @@
+"""
+수집한 기사에 대한 로컬 벡터 색인입니다. (비슷한 기사 찾기, 에이전트 검색 도구용)
+
+기사 제목과 본문을 배치로 임베딩해서 정규화한 float32 벡터를 메모리 맵 파일에 저장하고,
+행 번호별 기사 정보(id 표)는 ids.json에 저장합니다.
+검색은 NumPy 행렬-벡터 곱 한 번과 부분 정렬(argpartition)로 처리합니다.
+
+기사가 많을 때는 IVF(k-means로 나눈 목록 중 가까운 몇 개만 검색)나
+HNSW(hnswlib 패키지 필요) 색인을 추가로 만들어 쓸 수 있습니다.
+
+    python vector_index.py build --embedder local --ivf
+    python vector_index.py search "반도체 수출" -k 5 --mode ivf
+    python vector_index.py similar hamny-20250927221313840
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from shared.llm_scheduler import get_scheduler
+from shared.model_registry import get_embeddings
+from shared.news_store import NewsStore
+
+from llm_engine import estimate_tokens
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(_DIR, "vector_index")
+
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.json"
+IVF_FILE = "ivf.npz"
+HNSW_FILE = "hnsw.bin"
+
+# 임베딩 제공자별 모델. "local"은 API 없이 해시 임베딩을 사용합니다.
+EMBEDDING_MODELS = {
+    "google_genai": "models/gemini-embedding-001",
+    "openai": "text-embedding-3-small",
+}
+LOCAL_DIMENSIONS = 1024
+DEFAULT_EMBEDDER = "local"
+DEFAULT_BATCH_SIZE = 100
+# 임베딩에 넣을 본문 길이 (리드 문단 위주)
+MAX_CHARS = 2000
+
+DEFAULT_K = 5
+SEARCH_MODES = ["exact", "ivf", "hnsw"]
+# IVF 검색 시 살펴볼 목록 수
+DEFAULT_NPROBE = 4
+IVF_ITERATIONS = 10
+# IVF 학습에 쓰는 목록당 최대 표본 수
+IVF_SAMPLES_PER_LIST = 64
+# 한 번에 내적을 계산할 행 수 (메모리 맵 전체를 한꺼번에 읽지 않도록)
+CHUNK_ROWS = 65536
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+_WORD = re.compile(r"[가-힣A-Za-z0-9]{2,}")
+
+
+def article_text(news):
+    content = news.get("content") or news.get("summary") or ""
+    return f"{news.get('title') or ''}\n{content[:MAX_CHARS]}"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def load_corpus():
+    """
+    저장소에 쌓인 기사(news_data.json, datas.py, news_data2.jsonl)를 id 기준으로 합칩니다.
+    같은 기사가 여러 곳에 있으면 본문이 있는 나중 기록을 사용합니다.
+    """
+    articles = {}
+
+    def add(news):
+        if news.get("id") and (news["id"] not in articles or news.get("content")):
+            articles[news["id"]] = news
+
+    path = os.path.join(_DIR, "news_data.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for news in json.load(f):
+                add(news)
+
+    from datas import news_datas
+
+    for news in news_datas:
+        add(news)
+
+    store = NewsStore(os.path.join(_DIR, "news_data2.jsonl"))
+    if os.path.exists(store.path):
+        for news in store.iter_records():
+            add(news)
+    return list(articles.values())
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def top_k(scores, k):
+    """
+    점수가 높은 순서로 k개의 위치를 반환합니다. 전체 정렬 대신 부분 정렬을 사용합니다.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class HashingEmbedder:
+    """
+    API 없이 쓰는 임베딩입니다. 단어와 두 글자 조각을 해시해서 고정 길이 벡터로 만듭니다.
+    의미보다는 어휘가 겹치는 정도를 반영하므로 같은 사건을 다룬 기사 찾기에 알맞습니다.
+    """
+
+    def __init__(self, dimensions=LOCAL_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _embed(self, text):
+        compact = re.sub(r"\s+", "", text)
+        names = [f"w:{word}" for word in _WORD.findall(text)]
+        names += [f"b:{compact[i : i + 2]}" for i in range(len(compact) - 1)]
+        hashes = np.array(
+            [zlib.crc32(name.encode()) for name in names], dtype=np.uint32
+        )
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        # 해시의 최상위 비트로 부호를 정해서 충돌한 특징끼리 서로 상쇄되도록 합니다.
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dimensions, signs)
+        return vector
+
+    def embed_documents(self, texts):
+        return np.stack([self._embed(text) for text in texts])
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class ProviderEmbedder:
+    """
+    임베딩 API를 사용합니다. 공유 스케줄러로 분당 한도와 재시도를 처리합니다.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.embeddings = get_embeddings(EMBEDDING_MODELS[provider], provider)
+
+    def embed_documents(self, texts):
+        return get_scheduler(self.provider).run_sync(
+            lambda: self.embeddings.embed_documents(texts), estimate_tokens(*texts)
+        )
+
+    def embed_query(self, text):
+        return get_scheduler(self.provider).run_sync(
+            lambda: self.embeddings.embed_query(text), estimate_tokens(text)
+        )
+
+
+def get_embedder(name=DEFAULT_EMBEDDER):
+    if name == "local":
+        return HashingEmbedder()
+    if name not in EMBEDDING_MODELS:
+        raise ValueError(f"지원하지 않는 임베딩입니다: {name}")
+    return ProviderEmbedder(name)
+
+
+def _import_hnswlib():
+    try:
+        import hnswlib
+    except ImportError:
+        raise ImportError("HNSW 색인에는 hnswlib 패키지가 필요합니다.")
+    return hnswlib
+
+
+def _atomic_write(path, write):
+    tmp_path = os.path.join(os.path.dirname(path), f".tmp.{os.path.basename(path)}")
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class VectorIndex:
+    """
+    directory 아래의 파일들로 이루어진 벡터 색인입니다.
+
+    - vectors.f32: (기사 수, 차원) 모양의 정규화한 float32 벡터 (메모리 맵으로 읽음)
+    - ids.json: 행 번호별 기사 id, 제목, 매체, 링크, 본문 해시와 임베딩 이름
+    - ivf.npz, hnsw.bin: 선택적으로 만드는 근사 검색 색인
+
+    벡터가 정규화되어 있으므로 코사인 유사도는 내적과 같습니다.
+    """
+
+    def __init__(self, directory, vectors, entries, embedder_name):
+        self.directory = directory
+        self.vectors = vectors
+        self.entries = entries
+        self.embedder_name = embedder_name
+        self.rows = {entry["id"]: row for row, entry in enumerate(entries)}
+        self._embedder = None
+        self._ivf = None
+        self._hnsw = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def dimensions(self):
+        return self.vectors.shape[1]
+
+    @property
+    def embedder(self):
+        # 질의는 색인을 만들 때와 같은 임베딩으로 변환해야 합니다.
+        if self._embedder is None:
+            self._embedder = get_embedder(self.embedder_name)
+        return self._embedder
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    @classmethod
+    def open(cls, directory=INDEX_DIR):
+        """
+        저장된 색인을 엽니다. 아직 만들지 않았으면 None을 반환합니다.
+        """
+        ids_path = os.path.join(directory, IDS_FILE)
+        if not os.path.exists(ids_path):
+            return None
+        with open(ids_path, encoding="utf-8") as f:
+            table = json.load(f)
+        vectors = np.memmap(
+            os.path.join(directory, VECTORS_FILE),
+            dtype=np.float32,
+            mode="r",
+            shape=(len(table["entries"]), table["dimensions"]),
+        )
+        return cls(directory, vectors, table["entries"], table["embedder"])
+
+    @classmethod
+    def build(
+        cls,
+        articles,
+        directory=INDEX_DIR,
+        embedder=DEFAULT_EMBEDDER,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        """
+        기사 목록으로 색인을 만듭니다.
+        이전 색인에 같은 임베딩, 같은 본문으로 들어 있는 기사는 벡터를 다시 계산하지 않습니다.
+        (색인, 새로 임베딩한 기사 수)를 반환합니다.
+        """
+        if not articles:
+            raise ValueError("색인할 기사가 없습니다.")
+        os.makedirs(directory, exist_ok=True)
+        texts = [article_text(news) for news in articles]
+        entries = [
+            {
+                "id": news["id"],
+                "title": news.get("title"),
+                "cpName": news.get("cpName"),
+                "url": news.get("pcUrl") or news.get("url"),
+                "createdAt": news.get("createdAt"),
+                "hash": content_hash(text),
+            }
+            for news, text in zip(articles, texts)
+        ]
+
+        previous = cls.open(directory)
+        reused = {}
+        if previous is not None and previous.embedder_name == embedder:
+            for row, entry in enumerate(entries):
+                old_row = previous.rows.get(entry["id"])
+                if old_row is None:
+                    continue
+                if previous.entries[old_row]["hash"] == entry["hash"]:
+                    reused[row] = old_row
+        pending = [row for row in range(len(entries)) if row not in reused]
+        batches = [
+            pending[start : start + batch_size]
+            for start in range(0, len(pending), batch_size)
+        ]
+
+        model = get_embedder(embedder) if batches else None
+        # 차원 수를 알아야 파일을 만들 수 있으므로 첫 배치를 먼저 임베딩합니다.
+        first = (
+            normalize(model.embed_documents([texts[row] for row in batches[0]]))
+            if batches
+            else None
+        )
+        dimensions = first.shape[1] if first is not None else previous.dimensions
+
+        vectors_path = os.path.join(directory, VECTORS_FILE)
+        tmp_path = os.path.join(directory, f".tmp.{VECTORS_FILE}")
+        vectors = np.memmap(
+            tmp_path, dtype=np.float32, mode="w+", shape=(len(entries), dimensions)
+        )
+        if reused:
+            vectors[list(reused)] = previous.vectors[list(reused.values())]
+        for n, batch in enumerate(batches):
+            embedded = (
+                first
+                if n == 0
+                else normalize(model.embed_documents([texts[row] for row in batch]))
+            )
+            vectors[batch] = embedded
+        vectors.flush()
+        # 이전 파일의 메모리 맵을 닫아야 바꿔치기할 수 있습니다. (Windows)
+        del vectors, previous
+        os.replace(tmp_path, vectors_path)
+
+        table = {"embedder": embedder, "dimensions": dimensions, "entries": entries}
+        _atomic_write(
+            os.path.join(directory, IDS_FILE),
+            lambda f: f.write(json.dumps(table, ensure_ascii=False).encode("utf-8")),
+        )
+        # 행 번호가 바뀌었으므로 근사 검색 색인은 다시 만들어야 합니다.
+        for filename in (IVF_FILE, HNSW_FILE):
+            if os.path.exists(os.path.join(directory, filename)):
+                os.remove(os.path.join(directory, filename))
+        return cls.open(directory), len(pending)
+
+    def _scores(self, query, rows=None):
+        if rows is not None:
+            return self.vectors[rows] @ query
+        return np.concatenate(
+            [
+                self.vectors[start : start + CHUNK_ROWS] @ query
+                for start in range(0, len(self), CHUNK_ROWS)
+            ]
+        )
+
+    def build_ivf(self, nlist=None, iterations=IVF_ITERATIONS, seed=0):
+        """
+        벡터를 nlist개 목록으로 나누는 IVF 색인을 만듭니다. (구면 k-means)
+        nlist를 주지 않으면 기사 수의 제곱근을 사용합니다.
+        """
+        n = len(self)
+        nlist = min(n, nlist or max(1, int(math.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(
+            rng.choice(n, min(n, nlist * IVF_SAMPLES_PER_LIST), replace=False)
+        )
+        sample = np.asarray(self.vectors[sample_rows])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            counts = np.bincount(assign, minlength=nlist)
+            starts = np.cumsum(counts) - counts
+            # 목록별로 모아 놓고 구간 합으로 새 중심을 구합니다.
+            # 비어 버린 목록은 이전 중심을 그대로 둡니다.
+            filled = counts > 0
+            sums = np.add.reduceat(
+                sample[np.argsort(assign, kind="stable")], starts[filled]
+            )
+            centroids[filled] = normalize(sums)
+
+        assign = np.concatenate(
+            [
+                np.argmax(
+                    self.vectors[start : start + CHUNK_ROWS] @ centroids.T, axis=1
+                )
+                for start in range(0, n, CHUNK_ROWS)
+            ]
+        )
+        order = np.argsort(assign, kind="stable")
+        offsets = np.searchsorted(assign[order], np.arange(nlist + 1))
+        _atomic_write(
+            self._path(IVF_FILE),
+            lambda f: np.savez(f, centroids=centroids, order=order, offsets=offsets),
+        )
+        self._ivf = None
+
+    def build_hnsw(self, m=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION):
+        """
+        hnswlib로 HNSW 그래프 색인을 만듭니다.
+        """
+        hnswlib = _import_hnswlib()
+        index = hnswlib.Index(space="ip", dim=self.dimensions)
+        index.init_index(
+            max_elements=len(self), ef_construction=ef_construction, M=m
+        )
+        index.add_items(np.asarray(self.vectors), np.arange(len(self)))
+        index.save_index(self._path(HNSW_FILE))
+        self._hnsw = None
+
+    def _load_ivf(self):
+        if self._ivf is None:
+            if not os.path.exists(self._path(IVF_FILE)):
+                raise ValueError("IVF 색인이 없습니다. 먼저 build --ivf를 실행해주세요.")
+            with np.load(self._path(IVF_FILE)) as data:
+                self._ivf = (data["centroids"], data["order"], data["offsets"])
+        return self._ivf
+
+    def _load_hnsw(self):
+        if self._hnsw is None:
+            if not os.path.exists(self._path(HNSW_FILE)):
+                raise ValueError("HNSW 색인이 없습니다. 먼저 build --hnsw를 실행해주세요.")
+            hnswlib = _import_hnswlib()
+            index = hnswlib.Index(space="ip", dim=self.dimensions)
+            index.load_index(self._path(HNSW_FILE), max_elements=len(self))
+            self._hnsw = index
+        return self._hnsw
+
+    def search(
+        self, query, k=DEFAULT_K, mode="exact", nprobe=DEFAULT_NPROBE, exclude=()
+    ):
+        """
+        질의 벡터와 가장 비슷한 기사 k개를 유사도가 높은 순서로 반환합니다.
+
+        - mode: "exact"(전체 내적), "ivf"(가까운 nprobe개 목록만), "hnsw"
+        - exclude: 결과에서 뺄 기사 id (비슷한 기사 찾기에서 자기 자신 제외)
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {mode}")
+        query = normalize(query).reshape(-1)
+        exclude_rows = {self.rows[i] for i in exclude if i in self.rows}
+        wanted = k + len(exclude_rows)
+
+        if mode == "hnsw":
+            index = self._load_hnsw()
+            index.set_ef(max(HNSW_EF_SEARCH, wanted))
+            labels, distances = index.knn_query(query, k=min(wanted, len(self)))
+            rows, scores = labels[0], 1.0 - distances[0]
+        else:
+            rows = None
+            if mode == "ivf":
+                centroids, order, offsets = self._load_ivf()
+                lists = top_k(centroids @ query, nprobe)
+                rows = np.sort(
+                    np.concatenate([order[offsets[i] : offsets[i + 1]] for i in lists])
+                )
+            scores = self._scores(query, rows)
+            top = top_k(scores, wanted)
+            rows = top if rows is None else rows[top]
+            scores = scores[top]
+
+        results = []
+        for row, score in zip(rows, scores):
+            if row in exclude_rows:
+                continue
+            entry = self.entries[row]
+            results.append(
+                {
+                    **{key: value for key, value in entry.items() if key != "hash"},
+                    "score": float(score),
+                }
+            )
+        return results[:k]
+
+    def search_text(self, text, k=DEFAULT_K, mode="exact", nprobe=DEFAULT_NPROBE):
+        return self.search(self.embedder.embed_query(text), k, mode, nprobe)
+
+    def similar(self, article_id, k=DEFAULT_K, mode="exact", nprobe=DEFAULT_NPROBE):
+        """
+        색인에 있는 기사와 비슷한 다른 기사를 찾습니다. (관련 보도 찾기)
+        """
+        if article_id not in self.rows:
+            raise KeyError(f"색인에 없는 기사입니다: {article_id}")
+        vector = np.asarray(self.vectors[self.rows[article_id]])
+        return self.search(vector, k, mode, nprobe, exclude=(article_id,))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(directory=INDEX_DIR):
+    """
+    프로세스에서 공유하는 색인을 반환합니다. 처음 호출할 때 파일을 엽니다.
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.directory != directory:
+            _index = VectorIndex.open(directory)
+            if _index is None:
+                raise FileNotFoundError(
+                    "벡터 색인이 없습니다. 먼저 python vector_index.py build를 실행해주세요."
+                )
+        return _index
+
+
+def search_news(query, k=DEFAULT_K, mode="exact"):
+    """
+    에이전트 검색 도구 등에서 쓰는 간단한 검색 함수입니다.
+    "제목 (매체) 링크" 형식의 줄을 유사도가 높은 순서로 반환합니다.
+    """
+    return [
+        f"{result['title']} ({result['cpName']}) {result['url']}"
+        for result in get_index().search_text(query, k, mode)
+    ]
+
+
+def print_results(results, elapsed):
+    for rank, result in enumerate(results, 1):
+        print(f"{rank}. [{result['score']:.3f}] {result['title']} ({result['cpName']})")
+        print(f"   {result['url']}")
+    print(f"검색 시간: {elapsed * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기사 벡터 색인 생성/검색")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="수집한 기사로 색인 생성")
+    build_parser.add_argument(
+        "--embedder", choices=["local", *EMBEDDING_MODELS], default=DEFAULT_EMBEDDER
+    )
+    build_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    build_parser.add_argument(
+        "--ivf",
+        type=int,
+        nargs="?",
+        const=0,
+        help="IVF 색인도 생성 (값은 목록 수, 생략하면 기사 수의 제곱근)",
+    )
+    build_parser.add_argument(
+        "--hnsw", action="store_true", help="HNSW 색인도 생성 (hnswlib 필요)"
+    )
+
+    for command, help_text, target in [
+        ("search", "문장으로 검색", "query"),
+        ("similar", "기사 id로 비슷한 기사 찾기", "article_id"),
+    ]:
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument(target)
+        sub.add_argument("-k", type=int, default=DEFAULT_K)
+        sub.add_argument("--mode", choices=SEARCH_MODES, default="exact")
+        sub.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index, embedded = VectorIndex.build(
+            load_corpus(), embedder=args.embedder, batch_size=args.batch_size
+        )
+        print(
+            f"기사 {len(index)}건 색인 완료 (새로 임베딩 {embedded}건, "
+            f"{time.perf_counter() - start:.2f}s)"
+        )
+        if args.ivf is not None:
+            index.build_ivf(args.ivf or None)
+            print("IVF 색인을 만들었습니다.")
+        if args.hnsw:
+            index.build_hnsw()
+            print("HNSW 색인을 만들었습니다.")
+    else:
+        index = get_index()
+        start = time.perf_counter()
+        if args.command == "search":
+            results = index.search_text(args.query, args.k, args.mode, args.nprobe)
+        else:
+            results = index.similar(args.article_id, args.k, args.mode, args.nprobe)
+        print_results(results, time.perf_counter() - start)
@@ -0,0 +1,15 @@
+"""
+여러 실습 프로젝트(programmers-250930, aisummit-251110, multicampus-2025)가 함께 쓰는 모듈입니다.
+프로젝트마다 복사해 두면 한쪽에만 고친 내용이 다른 쪽에 빠지므로 이 패키지 하나만 고칩니다.
+
+- llm_scheduler: 프로바이더별 분당 한도, 재시도, 우선순위를 처리하는 공유 스케줄러
+- llm_cache: SQLite 기반 LLM 응답 캐시
+- model_registry: 프로세스에서 공유하는 채팅/임베딩 모델
+- tracing: 구간별 소요 시간과 LLM 호출 추적
+- conversation_memory: 토큰 예산 안에서 대화 기록을 요약해 접는 메모리
+- extractor: 다음 뉴스 HTML에서 기사 본문 추출
+- news_store: 색인을 갖춘 JSON Lines 기사 저장소
+
+각 프로젝트의 pyproject.toml에 경로 의존성으로 들어 있어서 uv sync로 함께 설치됩니다.
+pip를 쓰면 프로젝트 디렉터리에서 pip install -e ../shared 로 설치합니다.
+"""
@@ -0,0 +1,142 @@
+import asyncio
+
+# 대화 기록(요약문 포함)에 쓸 토큰 예산
+DEFAULT_MAX_TOKENS = 2000
+# 예산을 넘어도 원문 그대로 남기는 최근 메시지 수 (질문/답변 한 쌍이 2개)
+DEFAULT_KEEP_RECENT = 4
+# 요약할 때 예산의 이 비율까지 줄여 둡니다. 매 턴마다 요약하지 않도록 여유를 둡니다.
+FOLD_TARGET_RATIO = 0.5
+# 요약문은 이 길이(글자 수) 이내로 만들도록 요청합니다.
+SUMMARY_CHARS = 500
+
+SUMMARY_PREFIX = "[이전 대화 요약]\n"
+ROLE_NAMES = {"user": "사용자", "assistant": "AI"}
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 대략적인 토큰 수를 계산합니다. (한국어 기준 2글자당 1토큰)
+    """
+    return len(text or "") // 2 + 1
+
+
+def format_transcript(messages):
+    """
+    요약 프롬프트에 넣을 수 있게 메시지들을 "사용자: ..." 형식의 대화록으로 만듭니다.
+    """
+    return "\n".join(
+        f"{ROLE_NAMES.get(message['role'], message['role'])}: {message['content']}"
+        for message in messages
+    )
+
+
+def build_summary_prompt(summary, messages):
+    return (
+        f"다음은 지금까지의 대화 요약과 그 뒤에 이어진 대화입니다.\n"
+        f"두 내용을 합쳐 이후 대화에 필요한 사실, 사용자의 요청과 선호, "
+        f"결정된 사항 위주로 {SUMMARY_CHARS}자 이내의 한국어 요약을 작성하세요.\n"
+        f"요약만 출력하세요.\n\n"
+        f"[기존 요약]\n{summary or '없음'}\n\n"
+        f"[이어진 대화]\n{format_transcript(messages)}"
+    )
+
+
+class ConversationMemory:
+    """
+    토큰 예산 안에서 대화 기록을 관리합니다.
+
+    최근 메시지는 원문 그대로 두고, 예산을 넘은 오래된 메시지는 요약문 하나로 접습니다.
+    요약은 백그라운드 작업으로 만들기 때문에 다음 질문의 응답을 기다리게 하지 않습니다.
+    요약이 끝나기 전까지는 접을 메시지도 원문 그대로 전달합니다.
+
+    summarize(summary, messages)는 기존 요약문과 접을 메시지들을 받아
+    새 요약문을 반환하는 코루틴 함수입니다.
+    """
+
+    def __init__(
+        self,
+        summarize,
+        max_tokens=DEFAULT_MAX_TOKENS,
+        keep_recent=DEFAULT_KEEP_RECENT,
+        summary_role="system",
+        count_tokens=estimate_tokens,
+    ):
+        self.summarize = summarize
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.summary_role = summary_role
+        self.count_tokens = count_tokens
+        self.summary = ""
+        self.summary_count = 0
+        self._folding = []
+        self._recent = []
+        self._task = None
+
+    def add(self, role, content):
+        """
+        메시지를 기록하고, 예산을 넘으면 오래된 메시지의 요약을 시작합니다.
+        실행 중인 이벤트 루프 안에서 호출해야 합니다.
+        """
+        self._recent.append({"role": role, "content": content})
+        self._maybe_fold()
+
+    def messages(self):
+        """
+        모델에 보낼 대화 기록입니다: [요약문] + 요약 중인 메시지 + 최근 메시지
+        """
+        history = []
+        if self.summary:
+            history.append(
+                {"role": self.summary_role, "content": SUMMARY_PREFIX + self.summary}
+            )
+        return history + self._folding + self._recent
+
+    def tokens(self):
+        return self._count(self.messages())
+
+    def _count(self, messages):
+        return sum(self.count_tokens(message["content"]) for message in messages)
+
+    def _maybe_fold(self):
+        if self._task is not None:
+            return
+        if self.tokens() <= self.max_tokens:
+            return
+
+        # 최근 keep_recent개는 남기고, 목표치 아래로 내려갈 때까지 오래된 것부터 접습니다.
+        target = int(self.max_tokens * FOLD_TARGET_RATIO)
+        total = self.tokens()
+        count = 0
+        while count < len(self._recent) - self.keep_recent and total > target:
+            total -= self.count_tokens(self._recent[count]["content"])
+            count += 1
+        if count == 0:
+            return
+        self._folding = self._recent[:count]
+        del self._recent[:count]
+        self._task = asyncio.get_running_loop().create_task(self._fold())
+
+    async def _fold(self):
+        try:
+            summary = await self.summarize(self.summary, self._folding)
+        except Exception as e:
+            # 요약에 실패하면 접으려던 메시지를 되돌리고, 다음 메시지가 추가될 때 다시 시도합니다.
+            print(f"대화 요약 실패: {e}")
+            self._recent[:0] = self._folding
+            self._folding = []
+            self._task = None
+            return
+
+        self.summary = summary
+        self.summary_count += len(self._folding)
+        self._folding = []
+        self._task = None
+        # 요약하는 동안 대화가 더 쌓였으면 이어서 접습니다.
+        self._maybe_fold()
+
+    async def wait(self):
+        """
+        진행 중인 요약이 있으면 끝날 때까지 기다립니다.
+        """
+        while self._task is not None:
+            await asyncio.shield(self._task)
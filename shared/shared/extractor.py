@@ -0,0 +1,151 @@
+import functools
+import re
+
+ARTICLE_BODY_MARKER = 'data-tiara-layer="article_body"'
+NOT_FOUND_MESSAGE = "article_body를 찾을 수 없습니다."
+
+# 설치되어 있으면 빠른 파서부터 사용합니다.
+BACKEND_PRIORITY = ("selectolax", "lxml", "bs4")
+
+# div 태그를 셀 때 script/style 내용과 주석 안의 "<div"는 건너뜁니다.
+_DIV_TAG = re.compile(
+    r"<!--.*?-->|<(script|style)\b.*?</\1\s*>|<(/?)div\b", re.IGNORECASE | re.DOTALL
+)
+# article_body div의 여는 태그. 따옴표 종류, 속성 순서, 공백, 대소문자가 달라도 찾습니다.
+_ARTICLE_BODY_DIV = re.compile(
+    r"""<div\b[^>]*?\sdata-tiara-layer\s*=\s*(["']?)article_body\1(?=[\s/>])""",
+    re.IGNORECASE,
+)
+
+
+@functools.cache
+def is_available(backend):
+    try:
+        if backend == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+        elif backend == "lxml":
+            import lxml.html  # noqa: F401
+        elif backend == "bs4":
+            import bs4  # noqa: F401
+        else:
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def get_backend(backend=None):
+    """
+    사용할 파서 이름을 반환합니다. backend가 없으면 설치된 것 중 가장 빠른 것을 고릅니다.
+    """
+    if backend:
+        if not is_available(backend):
+            raise ImportError(f"'{backend}' 파서를 사용할 수 없습니다.")
+        return backend
+    for name in BACKEND_PRIORITY:
+        if is_available(name):
+            return name
+    raise ImportError("HTML 파서(selectolax, lxml, beautifulsoup4)가 설치되어 있지 않습니다.")
+
+
+def slice_article_body(html_content):
+    """
+    article_body div가 닫히는 곳까지만 잘라서 반환합니다.
+    전체 문서를 파싱하지 않고 본문 부분만 파싱하기 위해 사용합니다.
+    찾지 못하면 None을 반환합니다.
+    """
+    # 대부분의 페이지는 표준 표기라 빠른 문자열 검색으로 먼저 찾습니다.
+    marker = html_content.find(ARTICLE_BODY_MARKER)
+    start = html_content.rfind("<div", 0, marker) if marker != -1 else -1
+    if start == -1 or ">" in html_content[start:marker]:
+        match = _ARTICLE_BODY_DIV.search(html_content)
+        if match is None:
+            return None
+        start = match.start()
+
+    depth = 0
+    for match in _DIV_TAG.finditer(html_content, start):
+        if match.group(2) is None:
+            continue
+        depth += -1 if match.group(2) else 1
+        if depth == 0:
+            end = html_content.find(">", match.end())
+            return html_content[start : end + 1 if end != -1 else None]
+    # 닫는 태그가 없으면 문서 끝까지 사용합니다.
+    return html_content[start:]
+
+
+def clean_lines(text):
+    lines = [line.strip() for line in text.split("\n") if line.strip() != ""]
+    return "\n".join(lines)
+
+
+def _extract_bs4(html_content, clean):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    article_div = soup.find("div", attrs={"data-tiara-layer": "article_body"})
+    if article_div is None:
+        return None
+    if clean:
+        return article_div.get_text(strip=True, separator="\n")
+    return article_div.get_text()
+
+
+def _extract_lxml(html_content, clean):
+    import lxml.html
+
+    root = lxml.html.fromstring(html_content)
+    nodes = root.xpath('//div[@data-tiara-layer="article_body"]')
+    if not nodes:
+        return None
+    article_div = nodes[0]
+    # bs4의 get_text처럼 script/style/주석은 본문에서 제외합니다.
+    for node in article_div.xpath(".//script | .//style | .//comment()"):
+        node.drop_tree()
+    texts = article_div.itertext()
+    if clean:
+        return "\n".join(text.strip() for text in texts if text.strip())
+    return "".join(texts)
+
+
+def _extract_selectolax(html_content, clean):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html_content)
+    article_div = tree.css_first('div[data-tiara-layer="article_body"]')
+    if article_div is None:
+        return None
+    article_div.strip_tags(["script", "style"])
+    if clean:
+        return article_div.text(deep=True, separator="\n", strip=True)
+    return article_div.text(deep=True)
+
+
+EXTRACTORS = {
+    "bs4": _extract_bs4,
+    "lxml": _extract_lxml,
+    "selectolax": _extract_selectolax,
+}
+
+
+def extract_article_body(html_content, backend=None, early_stop=True, clean=True):
+    """
+    HTML에서 data-tiara-layer="article_body" div의 텍스트를 추출합니다.
+
+    - backend: "selectolax", "lxml", "bs4" 중 하나 (없으면 자동 선택)
+    - early_stop: 본문 div가 닫히는 곳까지만 잘라서 파싱
+    - clean: 줄 단위로 공백을 정리한 텍스트를 반환 (False면 원문 텍스트 그대로)
+
+    본문을 찾지 못하면 None을 반환합니다.
+    """
+    if not html_content:
+        return None
+    if early_stop:
+        # 본문 div를 잘라 내지 못하면 전체 문서를 파싱해서 결과가 달라지지 않게 합니다.
+        html_content = slice_article_body(html_content) or html_content
+
+    text = EXTRACTORS[get_backend(backend)](html_content, clean)
+    if text is None:
+        return None
+    return clean_lines(text) if clean else text
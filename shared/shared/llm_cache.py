@@ -0,0 +1,113 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+DEFAULT_TTL = 60 * 60 * 24 * 7  # 7일
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def template_text(prompt):
+    """
+    ChatPromptTemplate의 메시지 템플릿을 문자열로 만들어 캐시 키에 사용합니다.
+    프롬프트를 수정하면 키가 바뀌어 이전 결과를 재사용하지 않습니다.
+    """
+    parts = []
+    for message in prompt.messages:
+        template = getattr(getattr(message, "prompt", None), "template", None)
+        parts.append(f"{type(message).__name__}:{template or message!r}")
+    return "\n".join(parts)
+
+
+class LLMCache:
+    """
+    LLM 결과를 SQLite 파일에 저장하는 캐시입니다.
+    (모델명, 프롬프트 템플릿, 제목, 내용)의 해시를 키로 사용하고,
+    TTL이 지난 항목은 버리며, 최대 개수를 넘으면 오래 안 쓴 항목부터 지웁니다.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed"
+                " ON llm_cache (accessed_at)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(model, template, title, content):
+        payload = json.dumps([model, template, title, content], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        캐시된 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다.
+        """
+        row = self.conn.execute(
+            "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.ttl and now - row[1] > self.ttl):
+            if row is not None:
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.conn.commit()
+            self.misses += 1
+            return None
+
+        self.conn.execute(
+            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+        )
+        self.conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at)"
+            " VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now, now),
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
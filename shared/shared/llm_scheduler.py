@@ -0,0 +1,351 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# 프로바이더별 분당 요청 수(rpm)와 분당 토큰 수(tpm) 한도
+# 사용하는 요금제에 맞게 조정해서 사용합니다.
+PROVIDER_RATE_LIMITS = {
+    "google_genai": {"rpm": 1000, "tpm": 1_000_000},
+    "openai": {"rpm": 500, "tpm": 200_000},
+    "gemini": {"rpm": 1000, "tpm": 1_000_000},
+}
+
+# 우선순위(lane): 숫자가 작을수록 먼저 처리합니다.
+# 사용자가 기다리는 대화형 요청이 대량 요약 작업 뒤에 밀리지 않도록 합니다.
+INTERACTIVE = 0
+BATCH = 1
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+
+# 재시도할 상태 코드와, 그중 동시 실행 수를 줄여야 하는(한도 초과) 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+# 상태 코드를 알 수 없을 때 예외 클래스 이름으로 판단합니다.
+THROTTLE_ERROR_NAMES = {
+    "RateLimitError": 429,
+    "ResourceExhausted": 429,
+    "TooManyRequests": 429,
+    "ServiceUnavailable": 503,
+    "ServiceUnavailableError": 503,
+}
+
+# 한도 초과 시 동시 실행 수에 곱하는 값 (AIMD의 multiplicative decrease)
+DECREASE_FACTOR = 0.5
+# 차례를 기다리는 동안 상태를 다시 확인하는 최대 간격(초)
+POLL_INTERVAL = 0.05
+
+
+def _error_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def get_status_code(error):
+    """
+    예외에서 HTTP 상태 코드를 찾습니다. (httpx, openai, litellm, google api_core 등)
+    감싸진 예외(__cause__)까지 확인하고, 찾지 못하면 None을 반환합니다.
+    """
+    for e in _error_chain(error):
+        response = getattr(e, "response", None)
+        for value in (
+            getattr(e, "status_code", None),
+            getattr(e, "code", None),
+            getattr(response, "status_code", None),
+        ):
+            if isinstance(value, int):
+                return int(value)
+        for cls in type(e).__mro__:
+            if cls.__name__ in THROTTLE_ERROR_NAMES:
+                return THROTTLE_ERROR_NAMES[cls.__name__]
+    return None
+
+
+def get_retry_after(error):
+    """
+    응답의 Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 반환합니다. 없으면 None.
+    """
+    for e in _error_chain(error):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if not headers:
+            continue
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            continue
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    return None
+
+
+class TokenBucket:
+    """
+    분당 per_minute만큼 채워지는 토큰 버킷입니다.
+    per_minute가 없으면 제한하지 않습니다.
+    """
+
+    def __init__(self, per_minute=None):
+        self.capacity = per_minute
+        self.rate = per_minute / 60 if per_minute else None
+        self.level = per_minute or 0
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount, now):
+        """
+        amount만큼 꺼낼 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+        """
+        if self.rate is None:
+            return 0.0
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        if self.rate is not None:
+            self.level -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    모든 LLM 호출이 함께 쓰는 클라이언트 측 스케줄러입니다.
+
+    - 토큰 버킷으로 분당 요청 수(rpm)와 토큰 수(tpm)를 지킵니다.
+    - 동시 실행 수는 AIMD로 조절합니다. 성공하면 조금씩 늘리고,
+      429/503 응답을 받으면 절반으로 줄입니다.
+    - 재시도는 지터를 더한 지수 백오프로 하되, Retry-After가 있으면 그 시간만큼
+      모든 호출을 멈춥니다.
+    - 우선순위가 높은(숫자가 작은) 요청부터 차례를 줍니다.
+
+    스레드와 이벤트 루프에 묶이지 않으므로 동기 코드(run_sync)와
+    비동기 코드(run, stream)에서 같은 인스턴스를 함께 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute=None,
+        tokens_per_minute=None,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        min_concurrency=1,
+        retries=DEFAULT_RETRIES,
+        backoff=DEFAULT_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.window = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    @classmethod
+    def for_provider(cls, provider, **kwargs):
+        limits = PROVIDER_RATE_LIMITS.get(provider, {})
+        return cls(limits.get("rpm"), limits.get("tpm"), **kwargs)
+
+    def _enqueue(self, priority):
+        ticket = (priority, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket):
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _try_admit(self, ticket, tokens):
+        """
+        차례가 되었고 한도에 여유가 있으면 슬롯을 잡고 0을,
+        아니면 다시 확인할 때까지 기다릴 시간을 반환합니다.
+        """
+        with self._lock:
+            if self._waiters[0] != ticket:
+                return POLL_INTERVAL
+            now = time.monotonic()
+            wait = max(
+                self.paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+            if self.in_flight >= int(self.window):
+                wait = max(wait, POLL_INTERVAL)
+            if wait > 0:
+                return min(wait, POLL_INTERVAL)
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.stats["requests"] += 1
+            return 0.0
+
+    async def _acquire(self, tokens, priority):
+        """
+        슬롯을 잡을 때까지 기다리고, 슬롯을 잡은 시각을 반환합니다.
+        """
+        ticket = self._enqueue(priority)
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        return time.monotonic()
+
+    def _acquire_sync(self, tokens, priority):
+        ticket = self._enqueue(priority)
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                time.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        return time.monotonic()
+
+    def _release(self, started, error=None, completed=True):
+        """
+        호출이 끝나면 슬롯을 돌려주고 결과에 따라 동시 실행 수를 조절합니다.
+        completed=False는 호출이 취소되었다는 뜻으로, 동시 실행 수를 바꾸지 않습니다.
+        """
+        throttled = error is not None and get_status_code(error) in THROTTLE_STATUS_CODES
+        retry_after = get_retry_after(error) if error is not None else None
+        with self._lock:
+            self.in_flight -= 1
+            if throttled:
+                self.stats["throttled"] += 1
+                # 같은 시기에 보낸 요청들이 한꺼번에 429를 받아도 한 번만 줄입니다.
+                if started >= self.last_decrease:
+                    self.window = max(
+                        self.min_concurrency, self.window * DECREASE_FACTOR
+                    )
+                    self.last_decrease = time.monotonic()
+            elif error is None and completed:
+                # 창 크기만큼 성공하면 1이 늘어나도록 조금씩 키웁니다.
+                self.window = min(self.max_concurrency, self.window + 1 / self.window)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def _retry_delay(self, attempt, error):
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _should_retry(self, attempt, error):
+        if attempt >= self.retries:
+            return False
+        status = get_status_code(error)
+        if status in RETRY_STATUS_CODES or isinstance(error, TimeoutError):
+            self.stats["retries"] += 1
+            return True
+        return False
+
+    async def run(self, call, tokens=0, priority=BATCH):
+        """
+        call()이 반환하는 코루틴을 실행합니다. 실패하면 새 코루틴으로 다시 시도합니다.
+        예) await scheduler.run(lambda: chain.ainvoke(inputs), tokens=500)
+        """
+        for attempt in itertools.count():
+            started = await self._acquire(tokens, priority)
+            try:
+                result = await call()
+            except Exception as error:
+                self._release(started, error)
+                if not self._should_retry(attempt, error):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, error))
+                continue
+            except BaseException:
+                self._release(started, completed=False)
+                raise
+            self._release(started)
+            return result
+
+    def run_sync(self, call, tokens=0, priority=BATCH):
+        """
+        run의 동기 버전입니다.
+        예) scheduler.run_sync(lambda: chain.invoke(inputs), tokens=500)
+        """
+        for attempt in itertools.count():
+            started = self._acquire_sync(tokens, priority)
+            try:
+                result = call()
+            except Exception as error:
+                self._release(started, error)
+                if not self._should_retry(attempt, error):
+                    raise
+                time.sleep(self._retry_delay(attempt, error))
+                continue
+            except BaseException:
+                self._release(started, completed=False)
+                raise
+            self._release(started)
+            return result
+
+    async def stream(self, call, tokens=0, priority=BATCH):
+        """
+        call()이 반환하는 비동기 이터레이터의 조각을 그대로 돌려줍니다.
+        이미 조각을 내보낸 뒤의 오류는 재시도하지 않습니다. (중복 출력 방지)
+        """
+        for attempt in itertools.count():
+            started = await self._acquire(tokens, priority)
+            sent = False
+            try:
+                async for chunk in call():
+                    sent = True
+                    yield chunk
+            except Exception as error:
+                self._release(started, error)
+                if sent or not self._should_retry(attempt, error):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, error))
+                continue
+            except BaseException:
+                self._release(started, completed=False)
+                raise
+            self._release(started)
+            return
+
+
+# 프로세스 전체에서 프로바이더별로 하나씩 공유하는 스케줄러
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(provider=None, **kwargs):
+    """
+    프로바이더의 공유 스케줄러를 반환합니다. 처음 호출할 때 만들어집니다.
+    """
+    with _schedulers_lock:
+        if provider not in _schedulers:
+            _schedulers[provider] = LLMScheduler.for_provider(provider, **kwargs)
+        return _schedulers[provider]
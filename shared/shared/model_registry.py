@@ -0,0 +1,43 @@
+import threading
+
+# 프로세스 전체에서 설정별로 하나씩 공유하는 채팅 모델과 임베딩 모델
+# 모델 객체가 API 클라이언트와 연결 풀을 들고 있으므로, 매번 새로 만들지 않고 재사용합니다.
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _get_or_create(key, create):
+    with _models_lock:
+        if key not in _models:
+            _models[key] = create()
+        return _models[key]
+
+
+def get_chat_model(model, model_provider, **kwargs):
+    """
+    (model, model_provider, kwargs)가 같으면 같은 모델 객체를 반환합니다.
+    처음 호출할 때 만들어지며, langchain과 프로바이더 패키지도 이때 import합니다.
+    """
+
+    def create():
+        # import 비용이 커서(1초 안팎) 실제로 모델이 필요할 때 불러옵니다.
+        from langchain.chat_models import init_chat_model
+
+        return init_chat_model(model, model_provider=model_provider, **kwargs)
+
+    key = ("chat", model, model_provider, repr(sorted(kwargs.items())))
+    return _get_or_create(key, create)
+
+
+def get_embeddings(model, provider, **kwargs):
+    """
+    get_chat_model과 같은 방식으로 공유하는 임베딩 모델을 반환합니다.
+    """
+
+    def create():
+        from langchain.embeddings import init_embeddings
+
+        return init_embeddings(model, provider=provider, **kwargs)
+
+    key = ("embeddings", model, provider, repr(sorted(kwargs.items())))
+    return _get_or_create(key, create)
@@ -0,0 +1,256 @@
+import gzip
+import json
+import os
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 압축 파일에서는 append 한 번에 최대 이 개수만큼 묶어서 하나의 압축 블록으로 씁니다.
+BLOCK_SIZE = 1000
+
+
+def get_compression(path):
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstd 압축을 사용하려면 zstandard 패키지를 설치하세요.")
+        return "zstd"
+    return None
+
+
+class NewsStore:
+    """
+    뉴스 데이터를 JSON Lines 파일로 저장하는 저장소입니다.
+
+    - 기록은 항상 파일 끝에 추가(append)만 합니다.
+    - 같은 id를 다시 추가하면 마지막에 추가한 기사가 최신 값이 됩니다.
+    - 경로가 .gz/.zst로 끝나면 압축해서 저장합니다.
+    - `<경로>.idx` 파일에 id별 위치를 기록해 get(id)로 바로 읽을 수 있습니다.
+    """
+
+    def __init__(self, path, id_field="id"):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.id_field = id_field
+        self.compression = get_compression(path)
+        self._index = None
+
+    @property
+    def index(self):
+        """
+        id -> (블록 시작 위치, 블록 안에서의 줄 번호)
+        압축하지 않은 파일은 줄 하나가 하나의 블록입니다.
+        """
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.index_path):
+                self._index, torn = self._read_index()
+                if torn:
+                    # 색인을 추가하다 끊긴 줄이 있으면, 색인을 다시 만들어 저장합니다.
+                    # 압축하지 않은 파일은 데이터 파일에서 빠진 색인까지 되살립니다.
+                    if os.path.exists(self.path) and self.compression is None:
+                        self._index = self._scan_index()
+                    self._write_index(self._index)
+            elif os.path.exists(self.path) and self.compression is None:
+                self._index = self._scan_index()
+        return self._index
+
+    def _read_index(self):
+        """
+        색인 파일을 읽어 (색인, 읽지 못한 줄이 있었는지)를 반환합니다.
+        """
+        index, torn = {}, False
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    index[entry["id"]] = (entry["offset"], entry["line"])
+                except (ValueError, KeyError):
+                    torn = True
+        return index, torn
+
+    def _write_index(self, index):
+        temp_path = f"{self.index_path}.tmp.{os.getpid()}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for article_id, (offset, line) in index.items():
+                f.write(
+                    json.dumps(
+                        {"id": article_id, "offset": offset, "line": line},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        os.replace(temp_path, self.index_path)
+
+    def _scan_index(self):
+        """
+        색인 파일이 없을 때 데이터 파일을 처음부터 읽어 색인을 다시 만듭니다.
+        (압축하지 않은 파일만 가능합니다)
+        """
+        index = {}
+        offset = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                try:
+                    index[json.loads(raw)[self.id_field]] = (offset, 0)
+                except (ValueError, KeyError):
+                    # 중간에 끊긴 줄은 건너뜁니다.
+                    pass
+                offset += len(raw)
+        return index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, article_id):
+        return article_id in self.index
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def ids(self):
+        return self.index.keys()
+
+    def _compress(self, data):
+        if self.compression == "gzip":
+            return gzip.compress(data)
+        return zstandard.ZstdCompressor().compress(data)
+
+    def _read_block(self, f, offset):
+        f.seek(offset)
+        if self.compression == "gzip":
+            decompressor = zlib.decompressobj(wbits=31)
+            chunks = []
+            while not decompressor.eof:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                chunks.append(decompressor.decompress(chunk))
+            return b"".join(chunks).splitlines()
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            f, read_across_frames=False
+        )
+        return reader.read().splitlines()
+
+    def append(self, records):
+        """
+        기사들을 파일 끝에 추가하고, 추가한 개수를 반환합니다.
+        """
+        records = list(records)
+        if not records:
+            return 0
+        for record in records:
+            if record.get(self.id_field) is None:
+                raise ValueError(f"'{self.id_field}' 필드가 없는 기사는 저장할 수 없습니다.")
+
+        # 색인을 먼저 읽어 둡니다. 끊긴 색인 줄이 있으면 새 줄을 붙이기 전에 고쳐집니다.
+        self.index
+        entries = []
+        with open(self.path, "a+b") as f:
+            offset = f.seek(0, os.SEEK_END)
+            if self.compression is None and offset > 0:
+                # 이전 쓰기가 중간에 끊겨 줄바꿈 없이 끝났으면 새 줄에서 시작합니다.
+                f.seek(offset - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+                    offset += 1
+            if self.compression is None:
+                for record in records:
+                    line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                    f.write(line)
+                    entries.append((record[self.id_field], offset, 0))
+                    offset += len(line)
+            else:
+                for start in range(0, len(records), BLOCK_SIZE):
+                    block = records[start : start + BLOCK_SIZE]
+                    data = b"".join(
+                        json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                        for record in block
+                    )
+                    compressed = self._compress(data)
+                    f.write(compressed)
+                    entries.extend(
+                        (record[self.id_field], offset, i)
+                        for i, record in enumerate(block)
+                    )
+                    offset += len(compressed)
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for article_id, offset, line in entries:
+                f.write(
+                    json.dumps(
+                        {"id": article_id, "offset": offset, "line": line},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        for article_id, offset, line in entries:
+            self._index[article_id] = (offset, line)
+        return len(records)
+
+    def get(self, article_id):
+        """
+        id로 기사 하나를 읽습니다. 없으면 None을 반환합니다.
+        """
+        position = self.index.get(article_id)
+        if position is None:
+            return None
+        offset, line = position
+        with open(self.path, "rb") as f:
+            if self.compression is None:
+                f.seek(offset)
+                return json.loads(f.readline())
+            return json.loads(self._read_block(f, offset)[line])
+
+    def iter_records(self):
+        """
+        저장된 기사를 하나씩 읽는 제너레이터입니다.
+        같은 id가 여러 번 추가된 경우 최신 기사만 돌려줍니다.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        live = {}
+        for offset, line in self.index.values():
+            live.setdefault(offset, set()).add(line)
+
+        with open(self.path, "rb") as f:
+            if self.compression is None:
+                offset = 0
+                for raw in f:
+                    if offset in live:
+                        yield json.loads(raw)
+                    offset += len(raw)
+                return
+
+            for offset in sorted(live):
+                lines = self._read_block(f, offset)
+                for i in sorted(live[offset]):
+                    yield json.loads(lines[i])
+
+    def rewrite(self, records):
+        """
+        주어진 기사들로 파일을 새로 만듭니다.
+        임시 파일에 모두 쓴 뒤 교체하므로, 중간에 중단되어도 기존 파일이 그대로 남습니다.
+        """
+        directory, name = os.path.split(self.path)
+        temp = NewsStore(os.path.join(directory, f".tmp.{name}"), self.id_field)
+        for path in (temp.path, temp.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        count = temp.append(records)
+
+        # 데이터 파일을 바꾸는 동안 예전 색인을 쓰지 않도록 색인부터 지웁니다.
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        if count:
+            os.replace(temp.path, self.path)
+            os.replace(temp.index_path, self.index_path)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        self._index = None
+        return count
@@ -0,0 +1,171 @@
+import functools
+import json
+import statistics
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+@functools.cache
+def get_callback_handler_class():
+    """
+    langchain_core import에 시간이 걸리므로, 콜백이 처음 필요할 때 클래스를 만듭니다.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class LLMCallbackHandler(BaseCallbackHandler):
+        """
+        LLM 호출마다 지연 시간과 입력/출력 토큰 수를 Tracer에 기록합니다.
+        체인에 with_config(tags=[...])로 붙인 첫 번째 태그를 호출 이름으로 사용합니다.
+        """
+
+        def __init__(self, tracer):
+            self.tracer = tracer
+            self._runs = {}
+
+        def _start(self, run_id, tags):
+            # LCEL이 자동으로 붙이는 seq:step:N 태그는 제외합니다.
+            names = [tag for tag in tags or [] if not tag.startswith("seq:")]
+            self._runs[run_id] = ((names or ["llm"])[0], time.perf_counter())
+
+        def on_chat_model_start(
+            self, serialized, messages, *, run_id, tags=None, **kwargs
+        ):
+            self._start(run_id, tags)
+
+        def on_llm_start(self, serialized, prompts, *, run_id, tags=None, **kwargs):
+            self._start(run_id, tags)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            name, started = self._runs.pop(run_id, ("llm", None))
+            if started is None:
+                return
+            input_tokens, output_tokens = 0, 0
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None)
+                    if usage:
+                        input_tokens += usage.get("input_tokens", 0)
+                        output_tokens += usage.get("output_tokens", 0)
+            self.tracer.add_llm_call(
+                name, time.perf_counter() - started, input_tokens, output_tokens
+            )
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            name, started = self._runs.pop(run_id, ("llm", None))
+            if started is not None:
+                self.tracer.add_llm_call(
+                    name, time.perf_counter() - started, error=True
+                )
+
+    return LLMCallbackHandler
+
+
+class Tracer:
+    """
+    파이프라인 단계별 실행 시간(span), LLM 호출 기록, 각종 카운터를 모읍니다.
+    실행이 끝나면 JSON 파일로 내보내거나 요약 표를 출력할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.llm_calls = []
+        self.counters = Counter()
+        self._callback = None
+
+    @property
+    def callback(self):
+        """
+        LLM 호출을 기록하는 langchain 콜백 핸들러입니다. 처음 사용할 때 만듭니다.
+        """
+        if self._callback is None:
+            self._callback = get_callback_handler_class()(self)
+        return self._callback
+
+    def add_span(self, name, start, end, **attrs):
+        self.spans.append(
+            {
+                "name": name,
+                "start": start - self.origin,
+                "duration": end - start,
+                **attrs,
+            }
+        )
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        with tracer.span("summarize_news"): 형태로 단계 실행 시간을 기록합니다.
+        """
+        start = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.add_span(name, start, time.perf_counter(), **attrs)
+
+    def add_llm_call(self, name, latency, input_tokens=0, output_tokens=0, error=False):
+        self.llm_calls.append(
+            {
+                "name": name,
+                "latency": latency,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "error": error,
+            }
+        )
+
+    def incr(self, name, amount=1):
+        self.counters[name] += amount
+
+    def to_dict(self):
+        return {
+            "total_time": time.perf_counter() - self.origin,
+            "spans": self.spans,
+            "llm_calls": self.llm_calls,
+            "counters": dict(self.counters),
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self):
+        print(f"\n{'단계':<24}{'횟수':>6}{'합계(s)':>10}{'최대(s)':>10}")
+        span_groups = defaultdict(list)
+        for span in self.spans:
+            span_groups[span["name"]].append(span["duration"])
+        for name, durations in span_groups.items():
+            print(
+                f"{name:<24}{len(durations):>6}{sum(durations):>10.2f}{max(durations):>10.2f}"
+            )
+
+        if self.llm_calls:
+            print(
+                f"\n{'LLM 호출':<24}{'횟수':>6}{'p50(s)':>10}{'p95(s)':>10}"
+                f"{'입력토큰':>10}{'출력토큰':>10}{'오류':>6}"
+            )
+            call_groups = defaultdict(list)
+            for call in self.llm_calls:
+                call_groups[call["name"]].append(call)
+            for name, calls in call_groups.items():
+                latencies = sorted(call["latency"] for call in calls)
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(
+                    f"{name:<24}{len(calls):>6}{statistics.median(latencies):>10.2f}"
+                    f"{p95:>10.2f}"
+                    f"{sum(call['input_tokens'] for call in calls):>10}"
+                    f"{sum(call['output_tokens'] for call in calls):>10}"
+                    f"{sum(call['error'] for call in calls):>6}"
+                )
+
+        if self.counters:
+            print()
+            for name, value in sorted(self.counters.items()):
+                print(f"{name:<24}{value:>10}")
+        print(f"\n전체 실행 시간: {time.perf_counter() - self.origin:.2f}s")
+
+
+# 프로세스 전체에서 공유하는 Tracer
+tracer = Tracer()